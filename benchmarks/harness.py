@@ -0,0 +1,133 @@
+# benchmarks/harness.py
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+RESULTS_SCHEMA_VERSION = 1
+DEFAULT_REGRESSION_THRESHOLD = 0.25 # Fail when a median gets 25% slower than the baseline
+
+
+class Benchmark:
+    """A single timed case. `func` is called `number` times per round, `setup` (untimed) once before each round."""
+    def __init__(self, name, group, func, setup=None, number=100, rounds=15):
+        self.name = name
+        self.group = group
+        self.func = func
+        self.setup = setup
+        self.number = number
+        self.rounds = rounds
+
+
+def time_benchmark(benchmark, rounds=None, warmup_rounds=1):
+    """
+    Runs a benchmark and returns a dict of per-call timings in seconds.
+    Warm-up rounds are run first and thrown away so caches and lazy imports don't skew the result.
+    """
+    rounds = rounds or benchmark.rounds
+    func = benchmark.func
+    number = benchmark.number
+    per_call = []
+
+    for round_index in range(warmup_rounds + rounds):
+        if benchmark.setup:
+            benchmark.setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if round_index >= warmup_rounds:
+            per_call.append(elapsed / number)
+
+    return {
+        "group": benchmark.group,
+        "unit": "seconds",
+        "number": number,
+        "rounds": rounds,
+        "min": min(per_call),
+        "max": max(per_call),
+        "mean": statistics.fmean(per_call),
+        "median": statistics.median(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def build_report(results):
+    """Wraps benchmark results with enough environment info to tell runs apart."""
+    try:
+        import pygame
+        pygame_version = pygame.version.ver
+    except ImportError:
+        pygame_version = None
+
+    return {
+        "schema": RESULTS_SCHEMA_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame_version,
+        "platform": platform.platform(),
+        "sdl_videodriver": os.environ.get("SDL_VIDEODRIVER"),
+        "benchmarks": results,
+    }
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    if report.get("schema") != RESULTS_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported benchmark report schema in {path}: {report.get('schema')}")
+    return report
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+        report_file.write("\n")
+
+
+def compare_to_baseline(results, baseline_report, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compares medians against a baseline report.
+    Returns a list of (name, baseline_median, current_median, ratio, status) rows,
+    where status is "regression", "improvement", "ok" or "new".
+    """
+    baseline = baseline_report.get("benchmarks", {})
+    rows = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            rows.append((name, None, result["median"], None, "new"))
+            continue
+        baseline_median = baseline[name]["median"]
+        ratio = result["median"] / baseline_median if baseline_median > 0 else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, baseline_median, result["median"], ratio, status))
+    return rows
+
+
+def _format_seconds(value):
+    if value is None:
+        return "-"
+    if value >= 1e-3:
+        return f"{value * 1e3:.3f} ms"
+    return f"{value * 1e6:.1f} us"
+
+
+def print_results(results, comparison=None, stream=sys.stderr):
+    """Human readable summary. The JSON report is the machine readable one."""
+    if comparison is None:
+        for name, result in sorted(results.items()):
+            print(f"{name:<40} median {_format_seconds(result['median']):>12}   "
+                  f"min {_format_seconds(result['min']):>12}", file=stream)
+        return
+
+    for name, baseline_median, current_median, ratio, status in comparison:
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f"{name:<40} {_format_seconds(baseline_median):>12} -> {_format_seconds(current_median):>12}"
+              f"  {ratio_text:>7}  {status.upper() if status == 'regression' else status}", file=stream)
@@ -0,0 +1,310 @@
+# benchmarks/render_harness.py
+"""
+Headless render regression and throughput harness.
+
+Drives GameRoomUI and the three managers through scripted sessions covering every
+game-room sub-state, renders them off-screen as fast as possible and reports
+frames/second, each frame's Python heap high-water mark, surfaces created per frame (count and pixel
+bytes, per state and per subsystem), peak RSS and per-state frame cost.
+
+    python -m benchmarks.render_harness --output render.json
+    python -m benchmarks.render_harness --baseline render.json     # exit 1 if a state got slower
+    python -m benchmarks.render_harness --dump-golden golden/      # write reference frames
+    python -m benchmarks.render_harness --compare-golden golden/   # exit 1 if a frame changed
+    python -m benchmarks.render_harness --max-surfaces-per-frame 12 --max-surface-bytes-per-frame 2000000
+                                                                   # exit 1 if a frame allocates more
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # The JSON report may go to stdout
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pygame
+
+from benchmarks.harness import (build_report, save_report, load_report, compare_to_baseline, print_results,
+                                DEFAULT_REGRESSION_THRESHOLD)
+from benchmarks.run_benchmarks import BenchContext, equipped_hero
+from objects.deck_ob import Card
+from objects.memory_ob import SURFACES, describe_bytes
+from objects.timeline_ob import ManualClock
+from objects.trace_ob import configure_tracing
+
+FRAME_MS = 1000 / 30 # Scripted time advances one 30 FPS frame per rendered frame
+GOLDEN_FRAME_INDICES = (0, 15, 45) # Which frames of each session are dumped/compared
+
+
+# --- Scripted Sessions ---
+# Each session puts the managers into one sub-state, then renders `frames` frames.
+def _session_combat_start(ctx, hero):
+    enemy = Card("Cave", "enemy", 5, 1, 1, name="Ogre")
+    return enemy, ctx.battle_manager.start_combat(enemy)
+
+def _session_shake(ctx, hero):
+    enemy = Card("Cave", "enemy", 5, 1, 1, name="Ogre")
+    ctx.battle_manager.current_enemy = enemy
+    ctx.battle_manager.handle_player_attack(hero) # Enemy card shakes, damage number floats
+    return enemy, ctx.battle_manager.handle_enemy_attack(hero) # Hero health shakes
+
+def _session_victory(ctx, hero):
+    enemy = Card("Cave", "enemy", 0, 1, 0, xp_gain=20, name="Goblin")
+    ctx.battle_manager.current_enemy = enemy
+    return enemy, ctx.battle_manager.start_victory_animation()
+
+def _session_treasure(ctx, hero):
+    card = Card("Cave", "equipment", 0, 2, 0, xp_gain=10, name="Sword")
+    ctx.inventory_manager.start_inventory(card)
+    return card, ctx.inventory_manager.handle_player_buff(hero)
+
+def _session_level_up(ctx, hero):
+    card = Card("Cave", "level up", 5, 1, 0, name="Rage")
+    hero.experience = 40
+    ctx.level_manager.start_level_up(card)
+    return card, ctx.level_manager.handle_level_up(hero)
+
+def _session_dungeon_exit(ctx, hero):
+    card = Card("General", "dungeon exit", name="None")
+    return card, ctx.battle_manager.start_dungeon_exit_animation()
+
+SESSIONS = (
+    ("combat_start", _session_combat_start, 75),
+    ("shake", _session_shake, 45),
+    ("victory", _session_victory, 75),
+    ("treasure", _session_treasure, 75),
+    ("level_up", _session_level_up, 90),
+    ("dungeon_exit", _session_dungeon_exit, 75),
+)
+
+
+def render_game_room_frame(ctx, hero, card, sub_state):
+    """One frame of the GAME_ROOM branch of main.py, minus display.flip and event handling."""
+    ctx.timeline.tick()
+    ui = ctx.game_room_ui
+    battle_manager = ctx.battle_manager
+    shake_offsets = battle_manager.get_shaken_rects()
+    original_deck_rect, original_health_rect = ui.deck_rect, ui.health_rect
+    ui.deck_rect = original_deck_rect.move(shake_offsets['deck_rect'])
+    ui.health_rect = original_health_rect.move(shake_offsets['health_rect'])
+    ui.draw_game_room(ctx.screen, hero, battle_manager.current_enemy if battle_manager.current_enemy else card)
+    ui.deck_rect, ui.health_rect = original_deck_rect, original_health_rect
+
+    sub_state = battle_manager.update_animations(sub_state)
+    ctx.inventory_manager.update_popups()
+    ctx.level_manager.update_popups()
+    battle_manager.draw_combat_elements(ctx.screen)
+    ctx.inventory_manager.draw_popups(ctx.screen)
+    ctx.level_manager.draw_popups(ctx.screen)
+    return sub_state
+
+
+def _reset_managers(ctx):
+    ctx.battle_manager.current_enemy = None
+    ctx.timeline.clear()
+    ctx.floating_texts.clear()
+
+
+def run_session(ctx, clock, name, start_session, frame_count, measure_allocations=False, frame_callback=None):
+    """
+    Plays one scripted session. Returns per-frame wall times (ms) and, with `measure_allocations`,
+    per-frame (heap peak bytes, surfaces created, surface pixel bytes). The heap peak is how far
+    traced Python memory rose above its level at the start of the frame: the frame's high-water
+    mark, not the volume it allocated (short-lived objects freed along the way barely show).
+    """
+    _reset_managers(ctx)
+    ctx.timeline.tick() # Session animations start at the current scripted time
+    random.seed(1234) # Shake offsets are random
+    hero = equipped_hero()
+    card, sub_state = start_session(ctx, hero)
+
+    frame_times = []
+    frame_allocations = []
+    for frame_index in range(frame_count):
+        if measure_allocations:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            SURFACES.begin_frame()
+
+        start = time.perf_counter()
+        sub_state = render_game_room_frame(ctx, hero, card, sub_state)
+        frame_times.append((time.perf_counter() - start) * 1000.0)
+
+        if measure_allocations:
+            _, peak = tracemalloc.get_traced_memory()
+            surfaces, surface_bytes = SURFACES.end_frame(f"{name}[{frame_index}]")
+            frame_allocations.append((peak - before, surfaces, surface_bytes)) # High-water mark above the start
+        if frame_callback:
+            frame_callback(name, frame_index, ctx.screen)
+        clock.advance(FRAME_MS)
+
+    return frame_times, frame_allocations
+
+
+# --- Golden Frames ---
+def _golden_path(directory, session_name, frame_index):
+    return os.path.join(directory, f"{session_name}_{frame_index:03d}.png")
+
+
+def count_pixel_differences(surface_a, surface_b, tolerance=0):
+    """Number of pixels whose RGB channels differ by more than `tolerance`."""
+    if surface_a.get_size() != surface_b.get_size():
+        return surface_a.get_width() * surface_a.get_height()
+    bytes_a = pygame.image.tobytes(surface_a, "RGB")
+    bytes_b = pygame.image.tobytes(surface_b, "RGB")
+    if bytes_a == bytes_b:
+        return 0
+    differences = 0
+    for i in range(0, len(bytes_a), 3):
+        if (abs(bytes_a[i] - bytes_b[i]) > tolerance or abs(bytes_a[i + 1] - bytes_b[i + 1]) > tolerance
+                or abs(bytes_a[i + 2] - bytes_b[i + 2]) > tolerance):
+            differences += 1
+    return differences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless render regression and throughput harness")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over all sessions")
+    parser.add_argument("--dump-golden", metavar="DIR", help="Save reference frames as PNGs")
+    parser.add_argument("--compare-golden", metavar="DIR", help="Compare frames against saved PNGs; exit 1 on mismatch")
+    parser.add_argument("--pixel-tolerance", type=int, default=0, help="Per-channel difference still counted as equal")
+    parser.add_argument("--max-different-pixels", type=int, default=0, help="Allowed differing pixels per golden frame")
+    parser.add_argument("--min-fps", type=float, help="Exit 1 if overall off-screen FPS falls below this")
+    parser.add_argument("--max-surfaces-per-frame", type=int, help="Exit 1 if any frame creates more surfaces than this")
+    parser.add_argument("--max-surface-bytes-per-frame", type=int, help="Exit 1 if any frame creates more surface pixel bytes than this")
+    parser.add_argument("--baseline", "-b", help="Compare per-state frame cost against a previous report")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed slowdown of a median frame cost before it counts as a regression")
+    args = parser.parse_args(argv)
+    configure_tracing("off")
+
+    clock = ManualClock(10000) # Animations advance by exactly one frame per render
+    golden_failures = []
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ctx = BenchContext(clock)
+        # Pass 1: golden frames (deterministic clock and shake seed)
+        if args.dump_golden or args.compare_golden:
+            directory = args.dump_golden or args.compare_golden
+            if args.dump_golden:
+                os.makedirs(directory, exist_ok=True)
+
+            def golden_callback(session_name, frame_index, screen):
+                if frame_index not in GOLDEN_FRAME_INDICES:
+                    return
+                path = _golden_path(directory, session_name, frame_index)
+                if args.dump_golden:
+                    pygame.image.save(screen, path)
+                    return
+                if not os.path.exists(path):
+                    golden_failures.append((path, "missing"))
+                    return
+                different = count_pixel_differences(screen, pygame.image.load(path), args.pixel_tolerance)
+                if different > args.max_different_pixels:
+                    golden_failures.append((path, f"{different} pixels differ"))
+
+            for name, start_session, frame_count in SESSIONS:
+                run_session(ctx, clock, name, start_session, frame_count, frame_callback=golden_callback)
+
+        # Pass 2: allocations and surfaces per frame (tracemalloc slows frames down, so it is not timed)
+        allocations = {}
+        SURFACES.set_budget(args.max_surfaces_per_frame, args.max_surface_bytes_per_frame)
+        SURFACES.set_enabled(True)
+        tracemalloc.start()
+        for name, start_session, frame_count in SESSIONS:
+            _, allocations[name] = run_session(ctx, clock, name, start_session, frame_count, measure_allocations=True)
+        tracemalloc.stop()
+        SURFACES.set_enabled(False)
+        surface_report = SURFACES.report()
+
+        # Pass 3: throughput
+        frame_times = {name: [] for name, _, _ in SESSIONS}
+        wall_start = time.perf_counter()
+        for _ in range(args.repeat):
+            for name, start_session, frame_count in SESSIONS:
+                times, _ = run_session(ctx, clock, name, start_session, frame_count)
+                frame_times[name].extend(times)
+        wall_seconds = time.perf_counter() - wall_start
+
+    total_frames = sum(len(times) for times in frame_times.values())
+    results = {}
+    for name, times in frame_times.items():
+        ordered = sorted(times)
+        # Same shape as run_benchmarks results (seconds), so baselines compare the same way
+        results[f"frame.{name}"] = {
+            "group": "render_state",
+            "unit": "seconds",
+            "frames": len(times),
+            "mean": statistics.fmean(times) / 1000.0,
+            "median": statistics.median(times) / 1000.0,
+            "min": ordered[0] / 1000.0,
+            "max": ordered[-1] / 1000.0,
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] / 1000.0,
+            "heap_peak_bytes_per_frame_mean": statistics.fmean(heap for heap, _, _ in allocations[name]),
+            "heap_peak_bytes_per_frame_max": max(heap for heap, _, _ in allocations[name]),
+            "surfaces_per_frame_mean": statistics.fmean(surfaces for _, surfaces, _ in allocations[name]),
+            "surfaces_per_frame_max": max(surfaces for _, surfaces, _ in allocations[name]),
+            "surface_bytes_per_frame_mean": statistics.fmean(pixels for _, _, pixels in allocations[name]),
+            "surface_bytes_per_frame_max": max(pixels for _, _, pixels in allocations[name]),
+        }
+    report = build_report(results)
+    report["render"] = {
+        "frames": total_frames,
+        "fps": total_frames / wall_seconds,
+        "golden_failures": [f"{path}: {reason}" for path, reason in golden_failures],
+        "surfaces": surface_report,
+        "surface_budget_failures": [f"{label}: {surfaces} surfaces, {pixels} bytes"
+                                    for _, surfaces, pixels, label in SURFACES.over_budget],
+    }
+
+    if args.output:
+        save_report(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+
+    print(f"{total_frames} frames at {report['render']['fps']:.0f} FPS off-screen", file=sys.stderr)
+    for name, result in results.items():
+        print(f"{name:<20} {result['mean'] * 1000:6.2f} ms/frame  p95 {result['p95'] * 1000:6.2f} ms  "
+              f"{result['heap_peak_bytes_per_frame_mean'] / 1024:7.1f} KiB heap peak/frame  "
+              f"{result['surfaces_per_frame_mean']:5.1f} surfaces "
+              f"({result['surface_bytes_per_frame_mean'] / 1024:7.1f} KiB)/frame", file=sys.stderr)
+    for subsystem, stats in surface_report["subsystems"].items():
+        print(f"  {subsystem:<18} {stats['surfaces_per_frame']:5.2f} surfaces "
+              f"({stats['surface_bytes_per_frame'] / 1024:7.1f} KiB) {stats['rects_per_frame']:5.2f} rects per frame",
+              file=sys.stderr)
+    print(f"peak RSS {describe_bytes(surface_report['peak_rss_bytes'])}", file=sys.stderr)
+
+    exit_code = 0
+    if args.baseline:
+        comparison = compare_to_baseline(results, load_report(args.baseline), args.threshold)
+        print_results(results, comparison)
+        if any(row[4] == "regression" for row in comparison):
+            exit_code = 1
+    for path, reason in golden_failures:
+        print(f"GOLDEN MISMATCH {path}: {reason}", file=sys.stderr)
+        exit_code = 1
+    if SURFACES.over_budget_count:
+        for failure in report["render"]["surface_budget_failures"][:10]:
+            print(f"OVER SURFACE BUDGET {failure}", file=sys.stderr)
+        print(f"FAILED: {SURFACES.over_budget_count} frame(s) over the per-frame surface budget", file=sys.stderr)
+        exit_code = 1
+    if args.min_fps and report["render"]["fps"] < args.min_fps:
+        print(f"FAILED: {report['render']['fps']:.0f} FPS is below --min-fps {args.min_fps:.0f}", file=sys.stderr)
+        exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
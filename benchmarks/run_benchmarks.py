@@ -0,0 +1,257 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark suite for the rules, loading and rendering hot paths.
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json   # exits 1 on a regression
+
+Render cases use SDL's dummy video driver, so this runs on a headless box.
+"""
+import argparse
+import json
+import contextlib
+import os
+import sys
+
+# --- Headless SDL (must be set before pygame is imported) ---
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # The JSON report goes to stdout by default
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pygame
+
+from benchmarks.harness import (Benchmark, time_benchmark, build_report, save_report, load_report,
+                                compare_to_baseline, print_results, DEFAULT_REGRESSION_THRESHOLD)
+from objects.deck_ob import Hero, Card, CARDS_CSV_PATH, setup_new_game, _load_raw_card_data_from_csv
+from objects.battle_ob import BattleManager, FightMemo, resolve_fight
+from objects.catalog_ob import CardCatalog, generate_decks
+from objects.inventory_ob import InventoryManager
+from objects.level_ob import LevelManager
+from objects.simulation_ob import simulate_seed
+from objects.game_room_ob import GameRoomUI
+from objects.particle_ob import FloatingTextPool
+from objects.timeline_ob import Timeline
+from objects.trace_ob import configure_tracing
+
+WIDTH, HEIGHT = 480, 720 # Same as main.py
+
+
+# --- Shared Fixtures ---
+class BenchContext:
+    """Boots pygame headlessly and holds the UI/manager instances every case draws or fights with."""
+    def __init__(self, clock=None):
+        os.chdir(REPO_ROOT) # Sprite and sound paths are relative to the repo root
+        pygame.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.game_room_ui = GameRoomUI(WIDTH, HEIGHT)
+        self.timeline = Timeline(clock) # Real time unless a ManualClock is passed in
+        self.floating_texts = FloatingTextPool()
+        self.battle_manager = BattleManager(WIDTH, HEIGHT, self.game_room_ui, self.floating_texts, self.timeline)
+        self.inventory_manager = InventoryManager(WIDTH, HEIGHT, self.game_room_ui, self.floating_texts, self.timeline)
+        self.level_manager = LevelManager(WIDTH, HEIGHT, self.game_room_ui, self.floating_texts, self.timeline)
+
+
+def equipped_hero(health=5):
+    """A hero carrying one weapon, one armor and one mixed item, stats applied like InventoryManager does."""
+    hero = Hero()
+    hero.health = hero.max_health = health
+    for card in (Card("Cave", "equipment", 0, 2, 0, name="Sword"),
+                 Card("Cave", "equipment", 0, 0, 2, name="Shield"),
+                 Card("Forest", "equipment", 0, 2, 2, name="Bear Form")):
+        hero.current_equipment.add(card)
+        hero.attack += card.attack
+        hero.defense += card.defense
+    return hero
+
+
+def fight_until_done(battle_manager, hero, enemy):
+    """Alternates player/enemy turns until the fight ends, like the turn timer does in main.py."""
+    battle_manager.current_enemy = enemy
+    sub_state = "PLAYER_TURN"
+    while sub_state in ("PLAYER_TURN", "ENEMY_TURN"):
+        if sub_state == "PLAYER_TURN":
+            sub_state = battle_manager.handle_player_attack(hero)
+        else:
+            sub_state = battle_manager.handle_enemy_attack(hero)
+    battle_manager.current_enemy = None
+    return sub_state
+
+
+# --- Rules Cases ---
+def rules_benchmarks(ctx):
+    battle_manager = ctx.battle_manager
+    inventory_manager = ctx.inventory_manager
+    level_manager = ctx.level_manager
+
+    def short_fight():
+        fight_until_done(battle_manager, equipped_hero(), Card("Cave", "enemy", 5, 1, 1, name="Ogre"))
+
+    def long_fight():
+        # Enough enemy HP that weapons and armor wear down and break mid-fight
+        fight_until_done(battle_manager, equipped_hero(health=60), Card("Cave", "enemy", 40, 2, 1, name="Ogre"))
+
+    buff_cards = (
+        Card("Cave", "equipment", 3, 0, 0, name="Healing Salve"),
+        Card("Cave", "equipment", 0, 0, 0, inventory_boost=1, name="Belt"),
+        Card("Cave", "equipment", 0, 2, 0, name="Sword"),
+        Card("Cave", "equipment", 0, 0, 3, name="Breastplate"),
+        Card("Cave", "equipment", 0, 0, 2, name="Shield"),
+        Card("Forest", "equipment", 0, 2, 2, name="Bear Form"),
+        Card("Cave", "equipment", 0, 2, 0, name="Sword"), # No space left: sold
+        Card("Cave", "equipment", 3, 0, 0, name="Healing Salve"), # Max HP: sold
+    )
+
+    def player_buff_sequence():
+        hero = Hero()
+        hero.health = 2
+        for card in buff_cards:
+            inventory_manager.current_equipment = card
+            inventory_manager.handle_player_buff(hero)
+
+    level_up_card = Card("Cave", "level up", 5, 1, 1, name="Rage")
+
+    def level_up():
+        hero = Hero()
+        hero.experience = 50
+        level_manager.current_level_up_card = level_up_card
+        level_manager.handle_level_up(hero) # Enough XP
+        level_manager.current_level_up_card = level_up_card
+        level_manager.handle_level_up(hero) # Not enough XP
+
+    catalog = CardCatalog()
+
+    def batch_decks():
+        generate_decks(catalog, 1000, seed=1) # Vectorized when numpy is installed
+
+    def simulate_seeds():
+        for seed in range(200):
+            simulate_seed(catalog, seed, resolve_fight)
+
+    fight_memo = FightMemo()
+
+    def simulate_seeds_memo():
+        for seed in range(200):
+            simulate_seed(catalog, seed, fight_memo.resolve) # Warm after the first round
+
+    return [
+        Benchmark("load.raw_card_data_from_csv", "load", lambda: _load_raw_card_data_from_csv(CARDS_CSV_PATH), number=20),
+        Benchmark("load.setup_new_game", "load", setup_new_game, number=20),
+        Benchmark("load.generate_decks_1000", "load", batch_decks, number=5),
+        Benchmark("rules.fight_short", "rules", short_fight, number=200),
+        Benchmark("rules.fight_long", "rules", long_fight, number=50),
+        Benchmark("rules.handle_player_buff", "rules", player_buff_sequence, number=200),
+        Benchmark("rules.handle_level_up", "rules", level_up, number=500),
+        Benchmark("rules.simulate_200_seeds", "rules", simulate_seeds, number=5),
+        Benchmark("rules.simulate_200_seeds_memo", "rules", simulate_seeds_memo, number=5),
+    ]
+
+
+# --- Render Cases ---
+def render_benchmarks(ctx):
+    screen = ctx.screen
+    ui = ctx.game_room_ui
+    battle_manager = ctx.battle_manager
+    inventory_manager = ctx.inventory_manager
+    level_manager = ctx.level_manager
+
+    hero = equipped_hero()
+    enemy = Card("Cave", "enemy", 5, 1, 1, name="Ogre")
+
+    def arm_animations():
+        # Re-trigger every pop-up before each round so they are mid-animation while timed
+        ctx.timeline.tick()
+        battle_manager.current_enemy = enemy
+        battle_manager.start_combat(enemy)
+        for _ in range(3):
+            battle_manager._display_damage_text(2, battle_manager.RED, ui.get_card_health_rect().center)
+        inventory_manager._trigger_main_inventory_popup("Equipped Sword", inventory_manager.GREEN)
+        inventory_manager._display_buff_text("+10XP", inventory_manager.BLUE, ui.get_deck_rect().center)
+        level_manager._trigger_main_level_up_popup("Level Up Complete!\n+5 Max HP", level_manager.GREEN)
+        level_manager._display_floating_buff_text("+5 Max HP", level_manager.GREEN, ui.get_health_rect().center)
+
+    def draw_room():
+        ui.draw_game_room(screen, hero, enemy)
+
+    def draw_combat():
+        battle_manager.draw_combat_elements(screen)
+
+    def draw_popups():
+        inventory_manager.draw_popups(screen)
+        level_manager.draw_popups(screen)
+
+    def full_frame():
+        # Mirrors the GAME_ROOM branch of the main loop
+        ctx.timeline.tick()
+        battle_manager.get_shaken_rects()
+        ui.draw_game_room(screen, hero, enemy)
+        battle_manager.update_animations("PLAYER_TURN")
+        inventory_manager.update_popups()
+        level_manager.update_popups()
+        battle_manager.draw_combat_elements(screen)
+        inventory_manager.draw_popups(screen)
+        level_manager.draw_popups(screen)
+        pygame.display.flip()
+
+    return [
+        Benchmark("render.draw_game_room", "render", draw_room, number=50),
+        Benchmark("render.draw_combat_elements", "render", draw_combat, setup=arm_animations, number=50),
+        Benchmark("render.draw_popups", "render", draw_popups, setup=arm_animations, number=50),
+        Benchmark("render.full_frame", "render", full_frame, setup=arm_animations, number=30),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dungeon's Gambit benchmark suite")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", "-b", help="Compare against a previous JSON report; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed slowdown of a median before it counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--rounds", type=int, help="Override the number of timed rounds per case")
+    parser.add_argument("--filter", "-k", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--skip-render", action="store_true", help="Only run the rules and loading cases")
+    parser.add_argument("--trace", default="off", choices=("off", "counters", "ring", "console"),
+                        help="Trace sink while timing (default: off, like the simulator)")
+    args = parser.parse_args(argv)
+    configure_tracing(args.trace)
+
+    results = {}
+    # With --trace console the game logs every action; keep that out of the JSON report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ctx = BenchContext()
+        benchmarks = rules_benchmarks(ctx)
+        if not args.skip_render:
+            benchmarks += render_benchmarks(ctx)
+
+        for benchmark in benchmarks:
+            if args.filter and args.filter not in benchmark.name:
+                continue
+            print(f"Running {benchmark.name}...", file=sys.stderr)
+            results[benchmark.name] = time_benchmark(benchmark, rounds=args.rounds)
+
+    report = build_report(results)
+    if args.output:
+        save_report(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+
+    if not args.baseline:
+        print_results(results)
+        return 0
+
+    comparison = compare_to_baseline(results, load_report(args.baseline), args.threshold)
+    print_results(results, comparison)
+    regressions = [row[0] for row in comparison if row[4] == "regression"]
+    if regressions:
+        print(f"FAILED: {len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
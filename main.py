@@ -4,11 +4,25 @@ import math
 import time
 import random
 import os
+import uuid
 
-from objects.deck_ob import Hero, Card, setup_new_game
-from objects.battle_ob import BattleManager 
+from objects.deck_ob import Hero, Card
+from objects.battle_ob import BattleManager, guard_against_endless_fight
 from objects.inventory_ob import InventoryManager
 from objects.level_ob import LevelManager
+from objects.game_room_ob import GameRoomUI, build_ui_atlas
+from objects.ledger_ob import CardLedger, pick_reward_cards
+from objects.leaderboard_ob import LeaderboardSet, RunResult
+from objects.metrics_ob import METRICS, FRAME_TIME_BUCKETS, LATENCY_BUCKETS, start_metrics_export
+from objects.particle_ob import FloatingTextPool
+from objects.profiler_ob import FrameProfiler
+from objects.session_ob import SessionLoader
+from objects.sound_ob import SoundBank
+from objects.memory_ob import SURFACES, SUBSYSTEM_TITLE
+from objects.catalog_watch_ob import CatalogVersions, CatalogWatcher
+from objects.timeline_ob import (Timeline, ScaledClock, StepTimer, FixedStepper, TIME_SCALE_INSTANT,
+                                 parse_time_scale, describe_time_scale)
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_INFO, TRACE_WARNING, TRACE_ERROR
 
 # --- Game Constants ---
 os.environ['SDL_VIDEO_WINDOW_POS'] = "%d,%d" % (0, 0)
@@ -46,8 +60,72 @@ GAME_ROOM_SUB_STATE_LEVEL_UP_ADDED = "LEVEL_UP_ADDED"
 GAME_ROOM_SUB_STATE_DUNGEON_EXIT_ANIMATION = "DUNGEON_EXIT_ANIMATION"
 GAME_ROOM_SUB_STATE_REWARD_SCREEN = "REWARD_SCREEN"
 
-# --- Custom Pygame Events ---
-NEXT_TURN_EVENT = pygame.USEREVENT + 1
+# --- Frame Profiler Phases (F3 toggles the overlay, F4 exports a Chrome trace) ---
+PROFILE_PHASES = (
+    "timeline_tick",
+    "events",
+    "draw_screen", # Title / shuffling screens
+    "draw_game_room",
+    "update_popups",
+    "draw_combat",
+    "draw_popups_inv",
+    "draw_popups_level",
+    "profiler_overlay",
+    "display_flip",
+    "clock_tick_idle",
+)
+(PHASE_TIMELINE_TICK, PHASE_EVENTS, PHASE_DRAW_SCREEN, PHASE_DRAW_GAME_ROOM, PHASE_UPDATE_POPUPS,
+ PHASE_DRAW_COMBAT, PHASE_DRAW_POPUPS_INVENTORY, PHASE_DRAW_POPUPS_LEVEL, PHASE_OVERLAY,
+ PHASE_DISPLAY_FLIP, PHASE_CLOCK_TICK) = range(len(PROFILE_PHASES))
+PROFILE_TOGGLE_KEY = pygame.K_F3
+PROFILE_EXPORT_KEY = pygame.K_F4
+
+# --- Time Scale (DG_TIME_SCALE=10, 100 or instant; F5 cycles while playing) ---
+TIME_SCALE_KEY = pygame.K_F5
+TIME_SCALE_STEPS = (1.0, 10.0, 100.0, TIME_SCALE_INSTANT)
+TIME_SCALE = parse_time_scale(os.environ.get("DG_TIME_SCALE"))
+# --- Surface Churn (DG_SURFACE_STATS=1 counts surfaces created per frame and subsystem; summary on quit) ---
+SURFACE_STATS = os.environ.get("DG_SURFACE_STATS") == "1"
+SURF_TITLE = SURFACES.subsystem(SUBSYSTEM_TITLE)
+SURFACES.set_enabled(SURFACE_STATS)
+# --- Logic Rate (DG_LOGIC_HZ; timers and animations step at this rate whatever the frame rate) ---
+LOGIC_HZ = float(os.environ.get("DG_LOGIC_HZ") or 120)
+
+# --- Fixed Seed (DG_SEED=<seed> replays one deal every run, e.g. a daily challenge from tools/seed_index.py) ---
+GAME_SEED = int(os.environ["DG_SEED"]) if os.environ.get("DG_SEED", "").strip().lstrip("-").isdigit() else None
+
+# --- Metrics (DG_METRICS_PORT=9464 serves Prometheus text on 127.0.0.1; DG_METRICS_FILE=<path> dumps every DG_METRICS_INTERVAL s) ---
+METRICS_PORT = int(os.environ["DG_METRICS_PORT"]) if os.environ.get("DG_METRICS_PORT", "").strip().isdigit() else None
+METRICS_FILE = os.environ.get("DG_METRICS_FILE") or None
+METRICS_INTERVAL = float(os.environ.get("DG_METRICS_INTERVAL") or 15)
+
+# --- Card Data Hot Reload (DG_CATALOG_WATCH=0 turns the watcher off; DG_CATALOG_POLL sets its poll interval in s) ---
+CATALOG_WATCH = os.environ.get("DG_CATALOG_WATCH", "1").strip() != "0"
+CATALOG_POLL = float(os.environ.get("DG_CATALOG_POLL") or 1)
+M_CARDS_DRAWN = METRICS.counter("dg_cards_drawn_total", "Cards drawn, by card type", ("type",))
+M_XP_FROM_ENEMIES = METRICS.counter("dg_xp_gained_total", "XP gained in the game, by source", ("source",)).labels("enemy")
+M_RUNS = METRICS.counter("dg_runs_total", "Runs finished, by result", ("result",))
+M_RUNS_EXITED = M_RUNS.labels("exit")
+M_RUNS_DEFEATED = M_RUNS.labels("defeat")
+M_LOGIC_STEPS = METRICS.counter("dg_logic_steps_total", "Fixed logic steps run").labels()
+M_FRAME_TIME = METRICS.histogram("dg_frame_time_seconds", "Wall time per frame, including the wait for the frame cap", FRAME_TIME_BUCKETS).labels()
+M_ACTION_LATENCY = METRICS.histogram("dg_action_latency_seconds", "From handling a click to the end of the display flip that shows it", LATENCY_BUCKETS).labels()
+
+# --- Trace Events ---
+EV_MUSIC_STARTED = TRACE.define("main.music_started", TRACE_DEBUG, "Background music '{0}' started at {1}% volume, looping.")
+EV_MUSIC_FAILED = TRACE.define("main.music_failed", TRACE_WARNING, "Error loading or playing music: {0}\nPlease ensure '{1}' exists and is a valid audio file.")
+EV_PROFILE_EXPORTED = TRACE.define("main.profile_exported", TRACE_INFO, "Exported {0} profiler events to '{1}'.")
+EV_TIME_SCALE = TRACE.define("main.time_scale", TRACE_INFO, "Time scale: {0}")
+EV_CARD_DRAWN = TRACE.define("main.card_drawn", TRACE_INFO, "Drew card: {0}")
+EV_UNKNOWN_CARD_DRAWN = TRACE.define("main.unknown_card_drawn", TRACE_WARNING, "Drew {0}: {1}")
+EV_DECK_EMPTY = TRACE.define("main.deck_empty", TRACE_INFO, "Deck is empty!")
+EV_XP_GAINED = TRACE.define("main.xp_gained", TRACE_INFO, "Gained {0} XP. Total XP: {1}")
+EV_COMBAT_ENDED = TRACE.define("main.combat_ended", TRACE_DEBUG, "Combat ended. Ready to draw next card.")
+EV_GAME_OVER = TRACE.define("main.game_over", TRACE_INFO, "Game Over. Returning to title screen. This Game's Seed was: {0}")
+EV_TURN_TRANSITION = TRACE.define("main.turn_transition", TRACE_DEBUG, "Turn timer ran out in {0} state. {1}")
+EV_EQUIPMENT_DONE = TRACE.define("main.equipment_done", TRACE_DEBUG, "Equipment Added. Ready to draw next card.")
+EV_REWARD_DONE = TRACE.define("main.reward_done", TRACE_INFO, "Returning to title screen from reward.")
+EV_TURN_MISSING_ACTOR = TRACE.define("main.turn_missing_actor", TRACE_ERROR, "Error: Player or enemy missing during {0} turn.")
 
 # --- Pygame Initialization ---
 pygame.init()
@@ -60,23 +138,12 @@ clock = pygame.time.Clock()
 # Define music file path
 BACKGROUND_MUSIC_PATH = './sounds/2019-02-25_-_Poisonous_-_David_Fesliyan.mp3'
 
-# --- Preaload SFX ---
-SOUND_EFFECTS = {} 
-
-try:
-    SOUND_EFFECTS['card_draw'] = pygame.mixer.Sound('./sounds/card_draw_so.mp3')
-    SOUND_EFFECTS['card_draw'].set_volume(0.3) # Adjust volume if needed, 0.0 to 1.0
-
-    SOUND_EFFECTS['hit'] = pygame.mixer.Sound('./sounds/trap_so.wav')
-    SOUND_EFFECTS['hit'].set_volume(0.5) # Adjust volume if needed
-
-    SOUND_EFFECTS['tap'] = pygame.mixer.Sound('./sounds/tap_so.mp3')
-    SOUND_EFFECTS['tap'].set_volume(0.4) # Adjust volume if needed
-
-    print("Sound effects loaded successfully.")
-except pygame.error as e:
-    print(f"Error loading sound effect: {e}")
-    print("Please ensure sound files exist and are valid audio files.")
+# --- Preaload SFX (converted to the mixer format once, cached under .cache/sounds, played on reserved channels) ---
+SOUND_EFFECTS = SoundBank()
+SOUND_EFFECTS.load('card_draw', './sounds/card_draw_so.mp3', volume=0.3, max_voices=2) # Adjust volume if needed, 0.0 to 1.0
+SOUND_EFFECTS.load('hit', './sounds/trap_so.wav', volume=0.5, max_voices=2)
+SOUND_EFFECTS.load('tap', './sounds/tap_so.mp3', volume=0.4, max_voices=3)
+SOUND_EFFECTS.report_loaded()
 
 # --- Set the volume (0.0 to 1.0) Because no one likes popping their eardrum---
 MUSIC_VOLUME = 0.1 # 10% volume
@@ -86,24 +153,37 @@ try:
     pygame.mixer.music.set_volume(MUSIC_VOLUME)
     # Play indefinitely (-1 means loop forever)
     pygame.mixer.music.play(-1) 
-    print(f"Background music '{BACKGROUND_MUSIC_PATH}' started at {MUSIC_VOLUME*100}% volume, looping.")
+    if EV_MUSIC_STARTED.on:
+        TRACE.emit(EV_MUSIC_STARTED, BACKGROUND_MUSIC_PATH, MUSIC_VOLUME * 100)
 except pygame.error as e:
-    print(f"Error loading or playing music: {e}")
-    print(f"Please ensure '{BACKGROUND_MUSIC_PATH}' exists and is a valid audio file.")
+    if EV_MUSIC_FAILED.on:
+        TRACE.emit(EV_MUSIC_FAILED, e, BACKGROUND_MUSIC_PATH)
 
 # --- Load Sprites ---
-BACKGROUND_SPRITE_PATH = './sprites/background.png'
-
-# --- NEW: Load Background Sprite ---
-BACKGROUND_SPRITE = None # Initialize as None
-try:
-    BACKGROUND_SPRITE = pygame.image.load(BACKGROUND_SPRITE_PATH).convert()
-    # .convert() is usually faster for non-transparent backgrounds.
-    # Use .convert_alpha() if your background has transparent parts.
-    print(f"Background sprite '{BACKGROUND_SPRITE_PATH}' loaded successfully.")
-except pygame.error as e:
-    print(f"Error loading background sprite: {e}")
-    print(f"Please ensure '{BACKGROUND_SPRITE_PATH}' exists and is a valid image file.")
+# Background, card and stat icon sprites are packed into one atlas (see objects/atlas_ob.py)
+UI_ATLAS = build_ui_atlas()
+BACKGROUND_SPRITE = UI_ATLAS.get("background") # Subsurface of the atlas; None if the image failed to load
+
+# --- Game Clock and Animation Timeline ---
+# Every game timer (turn delays, pop-ups, shuffle and title delays) runs on scaled game time
+game_clock = ScaledClock(scale=TIME_SCALE)
+timeline = Timeline(game_clock) # Samples the game clock once per frame for every tween
+logic_stepper = FixedStepper(timeline, 1000 / LOGIC_HZ) # Advances the timeline in fixed logic steps, then samples it for drawing
+next_turn_timer = StepTimer(timeline) # Replaces pygame.time.set_timer(NEXT_TURN_EVENT, ...); polled by run_logic_step()
+if EV_TIME_SCALE.on:
+    TRACE.emit(EV_TIME_SCALE, describe_time_scale(TIME_SCALE))
+
+# --- Game Session Loader (builds the next deck on a worker thread from the live card catalog) ---
+catalog_versions = CatalogVersions()
+catalog_watcher = CatalogWatcher(catalog_versions, CATALOG_POLL) if CATALOG_WATCH else None
+session_loader = SessionLoader(catalogs=catalog_versions)
+
+# --- Card Ledger (collectible reward cards per player, written in the background) ---
+PLAYER_ID = os.environ.get("DG_PLAYER", "local")
+card_ledger = CardLedger()
+
+# --- Leaderboards (per theme, day and seed; snapshotted to disk now and then) ---
+leaderboards = LeaderboardSet.load()
 
 # --- Title Screen Elements ---
 title_font = None
@@ -125,8 +205,9 @@ title_line2_rect = title_line2_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2
 # --- Tap to Start Animation Variables ---
 tap_to_start_text = "Tap to Start"
 tap_to_start_original_surface = tap_to_start_font.render(tap_to_start_text, True, LIGHT_GRAY)
-tap_to_start_start_time = pygame.time.get_ticks()
+tap_to_start_start_time = timeline.now
 animation_duration = 1000
+session_loader.prefetch(GAME_SEED) # Start building the first session while the title screen shows
 initial_delay_end_time = tap_to_start_start_time + 2000
 
 # --- Game State Variables ---
@@ -140,397 +221,157 @@ unlocked_cards_pool = []
 shuffling_start_time = 0
 deck_drawn_card = None  # Holds the currently drawn card for display
 game_session_seed = None # New: Variable to store the game seed
+run_id = None # Unique per run; the ledger grants each run's reward once
+run_theme = None
+run_catalog_version = None # Card catalog version the run was dealt from
+run_cards_drawn = 0 # Cards drawn this run; every one but the last (the exit, or the enemy that won) was cleared
 
 
-# --- Game Room UI Class (Your Original Version) ---
-class GameRoomUI:
-    """Manages the drawing of elements within the GAME_ROOM state."""
-    def __init__(self, screen_width, screen_height):
-        self.WIDTH = screen_width
-        self.HEIGHT = screen_height
-
-        self.GRAY = (50, 50, 50)
-        self.WHITE = (255, 255, 255)
-        self.BLACK = (0, 0, 0)
-        self.NEON_BLUE = (0, 255, 255)
-        self.NEON_YELLOW = (255, 255, 0)
-        self.NEON_CYAN = (0, 255, 255) # Same as NEON_BLUE but used to differentiate placeholder
-        self.RED = (255, 0, 0) # For enemy health
-        self.GREEN = (0, 200, 0) # Added for inventory items (from previous suggestion)
-        self.DARK_GRAY = (30, 30, 30) # Added for empty inventory slots (from previous suggestion)
-
-        # Fonts for game room UI
-        self.stat_font = pygame.font.SysFont("Arial Black", 30)
-        self.card_text_font = pygame.font.SysFont("Arial", 25)
-
-        # Pre-calculate positions for static elements
-        self.deck_x = (self.WIDTH - 360) // 2
-        self.deck_y = 40 # 40px from top
-        self.deck_rect = pygame.Rect(self.deck_x, self.deck_y, 360, 480)
-
-        self.stat_width = 144
-        self.stat_height = 144
-        self.padding = 12
-
-        # Player stats positioning
-        self.health_x = self.padding
-        self.attack_x = self.padding + self.stat_width + self.padding
-        self.defense_x = self.padding + self.stat_width + self.padding + self.stat_width + self.padding
-        self.stat_y = self.HEIGHT - self.stat_height - self.padding # 10px from bottom
-
-        self.health_rect = pygame.Rect(self.health_x, self.stat_y, self.stat_width, self.stat_height)
-        self.attack_rect = pygame.Rect(self.attack_x, self.stat_y, self.stat_width, self.stat_height)
-        self.defense_rect = pygame.Rect(self.defense_x, self.stat_y, self.stat_width, self.stat_height)
-
-        # Card stat placeholder dimensions
-        self.enemy_stat_size = 120
-        self.enemy_stat_padding = 2 
-
-        # Calculate Card stat positions (relative to the drawn card)
-        self.enemy_stat_y = self.deck_y + self.deck_rect.height - self.enemy_stat_size - self.padding
-        
-        # Calculate x positions for card stats to be evenly distributed within the card width
-        total_enemy_stat_width = (self.enemy_stat_size * 3) + (self.enemy_stat_padding * 2)
-        start_x_for_enemy_stats = self.deck_x + (self.deck_rect.width - total_enemy_stat_width) // 2
-
-        self.enemy_health_x = start_x_for_enemy_stats
-        self.enemy_attack_x = start_x_for_enemy_stats + self.enemy_stat_size + self.enemy_stat_padding
-        self.enemy_defense_x = start_x_for_enemy_stats + (self.enemy_stat_size + self.enemy_stat_padding) * 2
+# --- Game Room UI Instance ---
+game_room_ui = GameRoomUI(WIDTH, HEIGHT, UI_ATLAS) # Instantiate the UI renderer
+# --- Floating Text Pool (damage/buff numbers, shared by the three managers) ---
+floating_texts = FloatingTextPool()
+# --- Battle Manager Instance ---
+battle_manager = BattleManager(WIDTH, HEIGHT, game_room_ui, floating_texts, timeline) # Pass UI instance to BattleManager
+# --- Inventory Manager Instance ---
+inventory_manager = InventoryManager(WIDTH, HEIGHT, game_room_ui, floating_texts, timeline) # Pass UI instance to EquipmentManager
+# --- Level Manager Instance ---
+level_manager = LevelManager(WIDTH, HEIGHT, game_room_ui, floating_texts, timeline) # Pass UI instance to LevelManager
+
+# --- Frame Profiler Instance ---
+frame_profiler = FrameProfiler(PROFILE_PHASES, frame_budget_ms=1000 / FPS)
+PROFILE_ALWAYS_ON = os.environ.get("DG_PROFILE") == "1" # Record from the first frame, overlay still toggled with F3
+frame_profiler.set_enabled(PROFILE_ALWAYS_ON)
+
+# --- Metrics Export (nothing is started unless configured) ---
+metrics_exporters = start_metrics_export(METRICS_PORT, METRICS_FILE, METRICS_INTERVAL)
+last_frame_started = time.perf_counter()
+action_started = None # Set by the first click of a frame, observed once that frame is on screen
+
+# --- Logic Step (runs inside every fixed logic step, however many a frame takes) ---
+def run_logic_step(now):
+    """
+    The automated turn rules: the turn timer running out plays the next player/enemy attack or
+    applies a found item or level-up, and a finished "Combat Start!" hands the turn to the player.
+    Input and drawing stay at frame rate; these run at the logic rate.
+    """
+    global current_game_room_sub_state
+
+    # --- Timed Actions (Automated Turns) ---
+    if next_turn_timer.take():
+        # --- Handle Combat TEvents ---
+        if current_game_room_sub_state == GAME_ROOM_SUB_STATE_PLAYER_TURN:
+            if hero and battle_manager.current_enemy: # Ensure both exist before attacking
+                new_sub_state = battle_manager.handle_player_attack(hero)
+                current_game_room_sub_state = new_sub_state
+                
+                if new_sub_state == GAME_ROOM_SUB_STATE_ENEMY_TURN:
+                    next_turn_timer.set(2000) # Enemy turn auto-triggers after 1 sec
+            else:
+                if EV_TURN_MISSING_ACTOR.on:
+                    TRACE.emit(EV_TURN_MISSING_ACTOR, "player")
+                current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE 
 
-        self.card_health_rect = pygame.Rect(self.enemy_health_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
-        self.card_attack_rect = pygame.Rect(self.enemy_attack_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
-        self.card_defense_rect = pygame.Rect(self.enemy_defense_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
+        elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_ENEMY_TURN:
+            if hero and battle_manager.current_enemy: # Ensure both exist before attacking
+                new_sub_state = battle_manager.handle_enemy_attack(hero)
+                current_game_room_sub_state = new_sub_state
 
-        #--- Card Back and Card Front Sprites ---
-        self.deck_card_back_sprite = None
-        self.drawn_card_front_sprite = None
+                if new_sub_state == GAME_ROOM_SUB_STATE_PLAYER_TURN:
+                    next_turn_timer.set(2000) 
+            else:
+                if EV_TURN_MISSING_ACTOR.on:
+                    TRACE.emit(EV_TURN_MISSING_ACTOR, "enemy")
+                current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE 
         
-        # --- Load player pos sprites ---
-        self.health_icon_sprite = None
-        self.attack_icon_sprite = None
-        self.defense_icon_sprite = None
-
-        # --- Load card pos sprites ---
-        self.card_health_icon_sprite = None
-        self.card_attack_icon_sprite = None
-        self.card_defense_icon_sprite = None
-
-        try:
-            # --- Load and Scale Card Back (for the Deck) ---
-            card_back_path = './sprites/delver_cardback.png' # VERIFY THIS PATH
-            loaded_card_back = pygame.image.load(card_back_path).convert_alpha()
-            self.deck_card_back_sprite = pygame.transform.scale(loaded_card_back, (360, 480)) # Use your established 360x480
-            print(f"Loaded card back: {card_back_path}")
-
-            # --- Load and Scale Card Front (for the Drawn Card) ---
-            card_front_path = './sprites/delver_cardfront.png' # VERIFY THIS PATH
-            loaded_card_front = pygame.image.load(card_front_path).convert_alpha()
-            self.drawn_card_front_sprite = pygame.transform.scale(loaded_card_front, (360, 480)) # Use your established 360x480
-            print(f"Loaded card front: {card_front_path}")
-
-        except pygame.error as e:
-            print(f"Error loading card sprites: {e}. Placeholder rectangles will be used.")
-            # Set to None so drawing logic can use fallback if images fail
-            self.deck_card_back_sprite = None
-            self.drawn_card_front_sprite = None
-
-
-        try:
-            # Load health icon
-            health_path = './sprites/health_icon.png' # <--- REPLACE with your actual filename!
-            self.health_icon_sprite = pygame.image.load(health_path).convert_alpha()
-            # Scale it to fit the existing placeholder rect size (stat_width x stat_height)
-            self.health_icon_sprite = pygame.transform.scale(self.health_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded health icon: {health_path}")
-
-            # Load attack icon
-            attack_path = './sprites/attack_icon.png' # <--- REPLACE with your actual filename!
-            self.attack_icon_sprite = pygame.image.load(attack_path).convert_alpha()
-            self.attack_icon_sprite = pygame.transform.scale(self.attack_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded attack icon: {attack_path}")
-
-            # Load defense icon
-            defense_path = './sprites/defense_icon.png' # <--- REPLACE with your actual filename!
-            self.defense_icon_sprite = pygame.image.load(defense_path).convert_alpha()
-            self.defense_icon_sprite = pygame.transform.scale(self.defense_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded defense icon: {defense_path}")
-
-        except pygame.error as e:
-            print(f"Error loading hero stat icon: {e}. Placeholder rectangle will be used.")
-            # Set to None if loading fails, so the drawing logic falls back to rect
-
-        try:
-            # --- Load 144px versions (for Hero stats) ---
-            health_path = './sprites/health_icon.png' # Replace with your actual filename!
-            self.health_icon_sprite = pygame.image.load(health_path).convert_alpha()
-            self.health_icon_sprite = pygame.transform.scale(self.health_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded hero health icon: {health_path}")
-
-            attack_path = './sprites/attack_icon.png' # Replace with your actual filename!
-            self.attack_icon_sprite = pygame.image.load(attack_path).convert_alpha()
-            self.attack_icon_sprite = pygame.transform.scale(self.attack_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded hero attack icon: {attack_path}")
-
-            defense_path = './sprites/defense_icon.png' # Replace with your actual filename!
-            self.defense_icon_sprite = pygame.image.load(defense_path).convert_alpha()
-            self.defense_icon_sprite = pygame.transform.scale(self.defense_icon_sprite, (self.stat_width, self.stat_height))
-            print(f"Loaded hero defense icon: {defense_path}")
-
-            # --- Load and Scale 120px versions (for Card stats) ---
-            self.card_health_icon_sprite = pygame.image.load(health_path).convert_alpha()
-            self.card_health_icon_sprite = pygame.transform.scale(self.card_health_icon_sprite, (self.enemy_stat_size, self.enemy_stat_size))
-            print(f"Loaded card health icon (scaled to {self.enemy_stat_size}): {health_path}")
-
-            self.card_attack_icon_sprite = pygame.image.load(attack_path).convert_alpha()
-            self.card_attack_icon_sprite = pygame.transform.scale(self.card_attack_icon_sprite, (self.enemy_stat_size, self.enemy_stat_size))
-            print(f"Loaded card attack icon (scaled to {self.enemy_stat_size}): {attack_path}")
-
-            self.card_defense_icon_sprite = pygame.image.load(defense_path).convert_alpha()
-            self.card_defense_icon_sprite = pygame.transform.scale(self.card_defense_icon_sprite, (self.enemy_stat_size, self.enemy_stat_size))
-            print(f"Loaded card defense icon (scaled to {self.enemy_stat_size}): {defense_path}")
-
-        except pygame.error as e:
-            print(f"Error loading ALL stat icons: {e}. Placeholder rectangles will be used for all stat displays.")
-            # Set all to None if a single load fails, forcing fallback for everything.
-            self.health_icon_sprite = self.attack_icon_sprite = self.defense_icon_sprite = None
-            self.card_health_icon_sprite = self.card_attack_icon_sprite = self.card_defense_icon_sprite = None
-            
-
-        #--- Inventory Icon management ---
-        self.icon_size = 60
-        self.icon_padding = 2 # Padding between icons
-
-        self.inventory_start_x = self.padding # Start from left edge, with padding
-        self.inventory_start_y = self.deck_y # Align with the top of the deck
-
-        self.xp_display_area_width = 100 # Approx. width needed for XP text
-        self.xp_display_area_height = 80 # Approx. height needed for two lines of text
-        self.xp_padding_right = 20 # Padding from the right edge of the screen
-
-        # Calculate the top-left corner of this conceptual area
-        self.xp_display_x = self.WIDTH - self.xp_display_area_width - self.xp_padding_right
-        self.xp_display_y = self.deck_y # Align with the top of the deck
-
-
-    def draw_game_room(self, screen, hero_instance, deck_drawn_card): 
-        """Draws all game room elements to the screen."""
-        screen.fill(self.GRAY) # A distinct color for the game room
-        #Draw background to screen
-        if BACKGROUND_SPRITE: # Always check if the sprite was loaded successfully
-            screen.blit(BACKGROUND_SPRITE, (0, 0))
-
-        # --- Draw Deck Placeholder ---
-        if self.deck_card_back_sprite: # Check if the sprite was loaded
-            screen.blit(self.deck_card_back_sprite, self.deck_rect.topleft)
-        else:
-            pygame.draw.rect(screen, self.NEON_BLUE, self.deck_rect, 5)
+        elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_START:
+            if EV_TURN_TRANSITION.on:
+                TRACE.emit(EV_TURN_TRANSITION, "EQUIPMENT_START", "Transitioning to applying buffs.")
+            current_game_room_sub_state = inventory_manager.handle_player_buff(hero)
+            next_turn_timer.set(2000) 
+
+        elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_ADDED:
+            if EV_TURN_TRANSITION.on:
+                TRACE.emit(EV_TURN_TRANSITION, "EQUIPMENT_ADDED", "Returning to IDLE.")
+            current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
+
+        elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_START:
+            if EV_TURN_TRANSITION.on:
+                TRACE.emit(EV_TURN_TRANSITION, "LEVEL_UP_START", "Transitioning to applying buffs.")
+            current_game_room_sub_state = level_manager.handle_level_up(hero) 
+            next_turn_timer.set(2000) 
+
+        elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_ADDED:
+            if EV_TURN_TRANSITION.on:
+                TRACE.emit(EV_TURN_TRANSITION, "LEVEL_UP_ADDED", "Returning to IDLE.")
+            # Buff animation is done, go back to IDLE
+            current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
+
+    # --- Animation-End Transitions ---
+    if current_game_state == GAME_STATE_GAME_ROOM:
+        new_sub_state_after_anim = battle_manager.update_animations(current_game_room_sub_state)
 
-        # --- Draw Drawn Card Placeholder (if a card is drawn) ---
-        if deck_drawn_card:
-            drawn_card_x = self.deck_x # Same position as deck for now
-            drawn_card_y = self.deck_y
-            drawn_card_rect = pygame.Rect(drawn_card_x, drawn_card_y, 360, 480)
+        if new_sub_state_after_anim == GAME_ROOM_SUB_STATE_PLAYER_TURN and current_game_room_sub_state != GAME_ROOM_SUB_STATE_PLAYER_TURN:
+            next_turn_timer.set(1000) # Player's first turn delay
 
-            # Replace: pygame.draw.rect(screen, self.NEON_CYAN, drawn_card_rect)
-            if self.drawn_card_front_sprite: # Check if the sprite was loaded
-                screen.blit(self.drawn_card_front_sprite, drawn_card_rect.topleft)
-            else:
-                pygame.draw.rect(screen, self.NEON_CYAN, drawn_card_rect) # Drawn card is NEON_CYAN (fallback)
-
-            card_name_surface = self.card_text_font.render(
-                f"{deck_drawn_card.name}", True, self.BLACK
-            )
-            card_name_rect = card_name_surface.get_rect(center=(drawn_card_x + 360 // 2, drawn_card_y + 290))
-            screen.blit(card_name_surface, card_name_rect)
-
-            card_type_surface = self.card_text_font.render(
-                f"Type: {deck_drawn_card.card_type.replace('_', ' ').title()}", True, self.BLACK # Or self.WHITE
-            )
-            card_type_rect = card_type_surface.get_rect(center=(drawn_card_x + 360 // 2, drawn_card_y + 320))
-            screen.blit(card_type_surface, card_type_rect)
-
-           # --- Draw Card Stat Placeholders ---
-            if deck_drawn_card.card_type == "enemy" or "equipment" or "level up":
-                # card Health Placeholder
-                if self.card_health_icon_sprite: # Check if the scaled sprite was loaded
-                    screen.blit(self.card_health_icon_sprite, self.card_health_rect.topleft)
-                else: # Fallback
-                    pygame.draw.rect(screen, self.RED, self.card_health_rect, 3) # Outline
-                card_health_text_surface = self.stat_font.render(f"HP: {deck_drawn_card.current_health}", True, self.WHITE)
-                card_health_text_rect = card_health_text_surface.get_rect(center=self.card_health_rect.center)
-                screen.blit(card_health_text_surface, card_health_text_rect)
-
-                # card Attack Placeholder
-                if self.card_attack_icon_sprite:
-                    screen.blit(self.card_attack_icon_sprite, self.card_attack_rect.topleft)
-                else:
-                    pygame.draw.rect(screen, self.NEON_YELLOW, self.card_attack_rect, 3) # Outline
-                card_attack_text_surface = self.stat_font.render(f"ATK: {deck_drawn_card.attack}", True, self.WHITE)
-                card_attack_text_rect = card_attack_text_surface.get_rect(center=self.card_attack_rect.center)
-                screen.blit(card_attack_text_surface, card_attack_text_rect)
-
-                # card Defense Placeholder
-                if self.card_defense_icon_sprite:
-                    screen.blit(self.card_defense_icon_sprite, self.card_defense_rect.topleft)
-                else:
-                    pygame.draw.rect(screen, self.NEON_YELLOW, self.card_defense_rect, 3) # Outline
-                card_defense_text_surface = self.stat_font.render(f"DEF: {deck_drawn_card.current_defense}", True, self.WHITE)
-                card_defense_text_rect = card_defense_text_surface.get_rect(center=self.card_defense_rect.center)
-                screen.blit(card_defense_text_surface, card_defense_text_rect)
-
-            else: # For Dungeon Exit
-                card_info_surface = self.card_text_font.render(
-                    "No info has been added yet", True, self.BLACK
-                )
-                card_info_rect = card_info_surface.get_rect(center=(drawn_card_x + 360 // 2, drawn_card_y + 480 // 2 + 20))
-                screen.blit(card_info_surface, card_info_rect)
-
-       # Health Placeholder
-        if self.health_icon_sprite: # Check if the sprite was loaded
-            screen.blit(self.health_icon_sprite, self.health_rect.topleft) # Draw sprite at rect's position
-        else: # Fallback to drawing the rectangle if sprite not loaded
-            pygame.draw.rect(screen, self.NEON_YELLOW, self.health_rect, 5) # Outline
-        health_text_surface = self.stat_font.render(f"HP: {hero_instance.health}", True, self.WHITE)
-        health_text_rect = health_text_surface.get_rect(center=self.health_rect.center)
-        screen.blit(health_text_surface, health_text_rect)
-
-        # Attack Placeholder
-        if self.attack_icon_sprite: # Check if the sprite was loaded
-            screen.blit(self.attack_icon_sprite, self.attack_rect.topleft) # Draw sprite at rect's position
-        else: # Fallback to drawing the rectangle if sprite not loaded
-            pygame.draw.rect(screen, self.NEON_YELLOW, self.attack_rect, 5) # Outline
-        attack_text_surface = self.stat_font.render(f"ATK: {hero_instance.attack}", True, self.WHITE)
-        attack_text_rect = attack_text_surface.get_rect(center=self.attack_rect.center)
-        screen.blit(attack_text_surface, attack_text_rect)
-
-        # Defense Placeholder
-        if self.defense_icon_sprite: # Check if the sprite was loaded
-            screen.blit(self.defense_icon_sprite, self.defense_rect.topleft) # Draw sprite at rect's position
-        else: # Fallback to drawing the rectangle if sprite not loaded
-            pygame.draw.rect(screen, self.NEON_YELLOW, self.defense_rect, 5) # Outline
-        defense_text_surface = self.stat_font.render(f"DEF: {hero_instance.defense}", True, self.WHITE)
-        defense_text_rect = defense_text_surface.get_rect(center=self.defense_rect.center)
-        screen.blit(defense_text_surface, defense_text_rect)
-
-        # --- CALL THE INVENTORY ICON DRAWING ---
-        self.draw_inventory_icons(screen, hero_instance) 
-
-        #--- CALL XP DRAWING ---
-        self.draw_xp_display(screen, hero_instance)
-
-    #--- Inventory icon function (this method is correct as is, but needed to be called) ---
-    def draw_inventory_icons(self, screen, hero_instance):
-        current_x = self.inventory_start_x
-        current_y = self.inventory_start_y
-
-        #Quick adjust, code it properly later
-        current_x = current_x - 12
-        
-        # Draw placeholder slots up to hero.equipment_slots
-        for i in range(hero_instance.equipment_slots):
-            slot_rect = pygame.Rect(current_x, current_y + (self.icon_size + self.icon_padding) * i, self.icon_size, self.icon_size)
-            pygame.draw.rect(screen, self.DARK_GRAY, slot_rect, 0) # Draw empty slot background
-            pygame.draw.rect(screen, self.GRAY, slot_rect, 1) # Draw slot border
-
-        # Draw actual equipped items
-        for i, item_card in enumerate(hero_instance.current_equipment):
-            # Calculate position for this item
-            item_x = self.inventory_start_x
-            item_y = self.inventory_start_y + (self.icon_size + self.icon_padding) * i
-            
-            #Quick adjust, code it properly later
-            item_x = item_x - 12
-
-            item_rect = pygame.Rect(item_x, item_y, self.icon_size, self.icon_size)
-
-            color = (0, 150, 0) if item_card.card_type == "equipment" else (150, 0, 150) # Example colors
-            
-            # Draw background square
-            pygame.draw.rect(screen, color, item_rect)
-            # Draw border
-            pygame.draw.rect(screen, self.WHITE, item_rect, 2) # White border for equipped item
-
-            text_surface = self.card_text_font.render(item_card.name[0].upper(), True, self.BLACK) # Just first letter
-            text_rect = text_surface.get_rect(center=item_rect.center)
-            screen.blit(text_surface, text_rect)
-    
-    def draw_xp_display(self, screen, hero_instance):
-        """Draws the hero's current XP as text on the screen, right-aligned."""
-        text_right_anchor_x = self.WIDTH - self.xp_padding_right # Use the screen width minus your right padding
-        #Quick fix, update properly later
-        text_right_anchor_x = text_right_anchor_x + 10
-
-        xp_label_surface = self.stat_font.render("XP", True, self.WHITE) 
-        xp_label_rect = xp_label_surface.get_rect(
-            topright=(text_right_anchor_x, self.xp_display_y + 10) # 10px down from top, right-aligned
-        ) 
-        screen.blit(xp_label_surface, xp_label_rect)
-
-        xp_value_surface = self.stat_font.render(f"{hero_instance.experience}", True, self.WHITE)
-        xp_value_rect = xp_value_surface.get_rect(
-            topright=(text_right_anchor_x, self.xp_display_y + 40) 
-        ) 
-        screen.blit(xp_value_surface, xp_value_rect)
-
-
-    def get_deck_rect(self):
-        return self.deck_rect
-    def get_health_rect(self):
-        return self.health_rect
-    def get_attack_rect(self):
-        return self.attack_rect
-    def get_defense_rect(self):
-        return self.defense_rect
-    def get_card_health_rect(self):
-        return self.card_health_rect
-    def get_card_attack_rect(self):
-        return self.card_attack_rect
-    def get_card_defense_rect(self):
-        return self.card_defense_rect
-    
-        
+        current_game_room_sub_state = new_sub_state_after_anim # Update the main state variable
 
 
-# --- Game Room UI Instance ---
-game_room_ui = GameRoomUI(WIDTH, HEIGHT) # Instantiate the UI renderer
-# --- Battle Manager Instance ---
-battle_manager = BattleManager(WIDTH, HEIGHT, game_room_ui) # Pass UI instance to BattleManager
-# --- Inventory Manager Instance ---
-inventory_manager = InventoryManager(WIDTH, HEIGHT, game_room_ui) # Pass UI instance to EquipmentManager
-# --- Level Manager Instance ---
-level_manager = LevelManager(WIDTH, HEIGHT, game_room_ui) # Pass UI instance to LevelManager
+logic_stepper.add_step_callback(run_logic_step)
 
 # --- Main Game Loop ---
 running = True
 while running:
+    frame_started = time.perf_counter()
+    M_FRAME_TIME.observe(frame_started - last_frame_started)
+    last_frame_started = frame_started
+    frame_profiler.begin_frame()
+    logic_stepper.advance() # Fixed logic steps fire timers, finish tweens and run the turn rules; visuals are sampled once, between steps
+    M_LOGIC_STEPS.inc(logic_stepper.steps)
+    frame_profiler.mark(PHASE_TIMELINE_TICK)
+
     # --- Event Handling ---
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == PROFILE_TOGGLE_KEY:
+                frame_profiler.overlay_visible = not frame_profiler.overlay_visible
+                frame_profiler.set_enabled(frame_profiler.overlay_visible or PROFILE_ALWAYS_ON)
+            elif event.key == TIME_SCALE_KEY:
+                next_steps = [step for step in TIME_SCALE_STEPS if step > game_clock.scale]
+                game_clock.set_scale(next_steps[0] if next_steps else TIME_SCALE_STEPS[0])
+                if EV_TIME_SCALE.on:
+                    TRACE.emit(EV_TIME_SCALE, describe_time_scale(game_clock.scale))
+            elif event.key == PROFILE_EXPORT_KEY and frame_profiler.enabled:
+                trace_path = f"profile_trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+                event_count = frame_profiler.export_chrome_trace(trace_path)
+                if EV_PROFILE_EXPORTED.on:
+                    TRACE.emit(EV_PROFILE_EXPORTED, event_count, trace_path)
         if event.type == pygame.MOUSEBUTTONDOWN:
-            if current_game_state == GAME_STATE_TITLE and pygame.time.get_ticks() > initial_delay_end_time:
+            if action_started is None:
+                action_started = time.perf_counter()
+            if current_game_state == GAME_STATE_TITLE and timeline.now > initial_delay_end_time:
                 current_game_state = GAME_STATE_SHUFFLING # Transition to shuffling state
 
-                hero, main_deck, unlocked_cards_pool, game_session_seed = setup_new_game() 
-                shuffling_start_time = pygame.time.get_ticks() # Start timer for shuffling animation
+                # The session is being built on a worker thread; the shuffling screen picks it up when ready
+                shuffling_start_time = timeline.now # Start timer for shuffling animation
                 current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE # Reset sub-state
             elif current_game_state == GAME_STATE_GAME_ROOM:
                 if current_game_room_sub_state == GAME_ROOM_SUB_STATE_IDLE:
                     if game_room_ui.get_deck_rect().collidepoint(event.pos): # Use getter
                         if main_deck:
                             deck_drawn_card = main_deck.pop(0)
-                            print(f"Drew card: {deck_drawn_card.name}")
+                            run_cards_drawn += 1
+                            M_CARDS_DRAWN.labels(deck_drawn_card.card_type).inc()
+                            if EV_CARD_DRAWN.on:
+                                TRACE.emit(EV_CARD_DRAWN, deck_drawn_card.name)
 
                             if deck_drawn_card.card_type == "enemy":
-                                # Added bug correction to prevent infinite combat
-                                if deck_drawn_card.defense > 0:
-                                    damage_potentail = deck_drawn_card.defense - (hero.attack - hero.min_attack) # this gives us how much defense will be destroyed
-                                    if damage_potentail == hero.min_attack:
-                                        if deck_drawn_card.attack == hero.min_defense:
-                                            deck_drawn_card.defense = hero.min_attack - 1
+                                guard_against_endless_fight(hero, deck_drawn_card) # Added bug correction to prevent infinite combat
 
                                 current_game_room_sub_state = battle_manager.start_combat(deck_drawn_card)
-                                SOUND_EFFECTS['hit'].play()
+                                SOUND_EFFECTS.play('hit')
                                 
                             elif deck_drawn_card.card_type == "dungeon exit":
                                 current_game_room_sub_state = battle_manager.start_dungeon_exit_animation()
@@ -538,18 +379,20 @@ while running:
                             
                             elif deck_drawn_card.card_type == "equipment":
                                 current_game_room_sub_state = inventory_manager.start_inventory(deck_drawn_card)
-                                SOUND_EFFECTS['tap'].play()
-                                pygame.time.set_timer(NEXT_TURN_EVENT, 2000)
+                                SOUND_EFFECTS.play('tap')
+                                next_turn_timer.set(2000)
 
                             elif deck_drawn_card.card_type == "level up": 
                                 current_game_room_sub_state = level_manager.start_level_up(deck_drawn_card)
-                                SOUND_EFFECTS['tap'].play()
-                                pygame.time.set_timer(NEXT_TURN_EVENT, 2000) # Short timer to allow "Level Up!" pop-up to show
+                                SOUND_EFFECTS.play('tap')
+                                next_turn_timer.set(2000) # Short timer to allow "Level Up!" pop-up to show
 
                             else:
-                                print(f"Drew {deck_drawn_card.card_type}: {deck_drawn_card.name}")
+                                if EV_UNKNOWN_CARD_DRAWN.on:
+                                    TRACE.emit(EV_UNKNOWN_CARD_DRAWN, deck_drawn_card.card_type, deck_drawn_card.name)
                         else:
-                            print("Deck is empty!")
+                            if EV_DECK_EMPTY.on:
+                                TRACE.emit(EV_DECK_EMPTY)
                             deck_drawn_card = Card("Empty", "message", name="Deck Empty!")
                 
                 # --- Combat End Interaction Clicks (only to dismiss messages) ---
@@ -558,14 +401,22 @@ while running:
                         current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE # Back to idle to draw next card
                         deck_drawn_card = None # Clear the defeated enemy card
                         hero.experience += battle_manager.current_enemy.xp_gain # Gain XP from defeated enemy
-                        print(f"Gained {battle_manager.current_enemy.xp_gain} XP. Total XP: {hero.experience}")
+                        M_XP_FROM_ENEMIES.inc(battle_manager.current_enemy.xp_gain)
+                        if EV_XP_GAINED.on:
+                            TRACE.emit(EV_XP_GAINED, battle_manager.current_enemy.xp_gain, hero.experience)
                         battle_manager.current_enemy = None # Clear current enemy in BattleManager
-                        SOUND_EFFECTS['card_draw'].play()
-                        print("Combat ended. Ready to draw next card.")
+                        SOUND_EFFECTS.play('card_draw')
+                        if EV_COMBAT_ENDED.on:
+                            TRACE.emit(EV_COMBAT_ENDED)
 
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_COMBAT_END_DEFEAT:
                     if not battle_manager.combat_text_active: # Only allow click if animation finished
-                        print(f"Game Over. Returning to title screen. This Game's Seed was: {game_session_seed}") # Modified line
+                        if EV_GAME_OVER.on:
+                            TRACE.emit(EV_GAME_OVER, game_session_seed)
+                        leaderboards.submit(RunResult(PLAYER_ID, run_id, game_session_seed, run_theme,
+                                                      hero.experience + hero.experience_spent, run_cards_drawn - 1, survived=False))
+                        leaderboards.maybe_save()
+                        M_RUNS_DEFEATED.inc()
                         current_game_state = GAME_STATE_TITLE
                         hero = None # Reset hero
                         main_deck = [] # Clear deck
@@ -573,37 +424,50 @@ while running:
                         deck_drawn_card = None
                         battle_manager.current_enemy = None # Clear current enemy in BattleManager
                         current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE # Reset sub-state
-                        SOUND_EFFECTS['card_draw'].play()
-                        tap_to_start_start_time = pygame.time.get_ticks() # Reset title screen animation timer
+                        SOUND_EFFECTS.play('card_draw')
+                        tap_to_start_start_time = timeline.now # Reset title screen animation timer
+                        session_loader.prefetch(GAME_SEED) # Build the next session while the title screen shows
 
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_START: # This is the state where "Treasure!" has animated
-                    print("NEXT_TURN_EVENT triggered for EQUIPMENT_FOUND state. Transitioning to applying buffs.")
+                    if EV_TURN_TRANSITION.on:
+                        TRACE.emit(EV_TURN_TRANSITION, "EQUIPMENT_FOUND", "Transitioning to applying buffs.")
                     current_game_room_sub_state = inventory_manager.handle_player_buff(hero) 
-                    pygame.time.set_timer(NEXT_TURN_EVENT, 2000)
+                    next_turn_timer.set(2000)
 
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_START:
-                    print("NEXT_TURN_EVENT triggered for LEVEL_UP_FOUND state. Transitioning to applying boosts.")
+                    if EV_TURN_TRANSITION.on:
+                        TRACE.emit(EV_TURN_TRANSITION, "LEVEL_UP_FOUND", "Transitioning to applying boosts.")
                     current_game_room_sub_state = level_manager.handle_level_up(hero)
-                    pygame.time.set_timer(NEXT_TURN_EVENT, 2000) # Give time for boost pop-ups
+                    next_turn_timer.set(2000) # Give time for boost pop-ups
                 
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_ADDED:
-                    print("Equipment Added. Ready to draw next card.")
+                    if EV_EQUIPMENT_DONE.on:
+                        TRACE.emit(EV_EQUIPMENT_DONE)
                     current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
-                    SOUND_EFFECTS['card_draw'].play()
-                    pygame.time.set_timer(NEXT_TURN_EVENT, 0) # Stop any lingering timers for this state
+                    SOUND_EFFECTS.play('card_draw')
+                    next_turn_timer.set(0) # Stop any lingering timers for this state
                     deck_drawn_card = None
 
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_ADDED: # --- NEW ---
-                    print("NEXT_TURN_EVENT triggered for LEVEL_UP_ADDED state. Transitioning to IDLE.")
-                    SOUND_EFFECTS['card_draw'].play()
+                    if EV_TURN_TRANSITION.on:
+                        TRACE.emit(EV_TURN_TRANSITION, "LEVEL_UP_ADDED", "Transitioning to IDLE.")
+                    SOUND_EFFECTS.play('card_draw')
                     current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
-                    pygame.time.set_timer(NEXT_TURN_EVENT, 0) # Turn off timer
+                    next_turn_timer.set(0) # Turn off timer
                         
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_DUNGEON_EXIT_ANIMATION:
                     if not battle_manager.combat_text_active: # Only allow click if animation finished
                         current_game_room_sub_state = GAME_ROOM_SUB_STATE_REWARD_SCREEN
+                        # Reward cards come from the other themes' pool; grant() only queues the write
+                        card_ledger.grant(PLAYER_ID, run_id, pick_reward_cards(unlocked_cards_pool, game_session_seed),
+                                          game_session_seed, run_theme)
+                        leaderboards.submit(RunResult(PLAYER_ID, run_id, game_session_seed, run_theme,
+                                                      hero.experience + hero.experience_spent, run_cards_drawn - 1, survived=True))
+                        leaderboards.maybe_save()
+                        M_RUNS_EXITED.inc()
                 elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_REWARD_SCREEN:
-                    print("Returning to title screen from reward.")
+                    if EV_REWARD_DONE.on:
+                        TRACE.emit(EV_REWARD_DONE)
                     current_game_state = GAME_STATE_TITLE
                     hero = None # Reset hero
                     main_deck = [] # Clear deck
@@ -611,56 +475,11 @@ while running:
                     deck_drawn_card = None
                     battle_manager.current_enemy = None # Clear current enemy in BattleManager
                     current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE # Reset sub-state
-                    SOUND_EFFECTS['card_draw'].play()
-                    tap_to_start_start_time = pygame.time.get_ticks() # Reset title screen animation timer
-                
-
-        # --- Custom Events for Timed Actions (Automated Turns) ---
-        if event.type == NEXT_TURN_EVENT:
-            pygame.time.set_timer(NEXT_TURN_EVENT, 0) # Stop the timer
-
-            # --- Handle Combat TEvents ---
-            if current_game_room_sub_state == GAME_ROOM_SUB_STATE_PLAYER_TURN:
-                if hero and battle_manager.current_enemy: # Ensure both exist before attacking
-                    new_sub_state = battle_manager.handle_player_attack(hero)
-                    current_game_room_sub_state = new_sub_state
-                    
-                    if new_sub_state == GAME_ROOM_SUB_STATE_ENEMY_TURN:
-                        pygame.time.set_timer(NEXT_TURN_EVENT, 2000) # Enemy turn auto-triggers after 1 sec
-                else:
-                    print("Error: Player or enemy missing during player turn.")
-                    current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE 
-
-            elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_ENEMY_TURN:
-                if hero and battle_manager.current_enemy: # Ensure both exist before attacking
-                    new_sub_state = battle_manager.handle_enemy_attack(hero)
-                    current_game_room_sub_state = new_sub_state
-
-                    if new_sub_state == GAME_ROOM_SUB_STATE_PLAYER_TURN:
-                        pygame.time.set_timer(NEXT_TURN_EVENT, 2000) 
-                else:
-                    print("Error: Player or enemy missing during enemy turn.")
-                    current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE 
-            
-            elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_START:
-                print("NEXT_TURN_EVENT triggered for EQUIPMENT_START state. Transitioning to applying buffs.")
-                current_game_room_sub_state = inventory_manager.handle_player_buff(hero)
-                pygame.time.set_timer(NEXT_TURN_EVENT, 2000) 
-
-            elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_EQUIPMENT_ADDED:
-                print("NEXT_TURN_EVENT triggered for EQUIPMENT_ADDED state. Returning to IDLE.")
-                current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
-
-            elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_START:
-                print("NEXT_TURN_EVENT triggered for LEVEL_UP_START state. Transitioning to applying buffs.")
-                current_game_room_sub_state = level_manager.handle_level_up(hero) 
-                pygame.time.set_timer(NEXT_TURN_EVENT, 2000) 
-
-            elif current_game_room_sub_state == GAME_ROOM_SUB_STATE_LEVEL_UP_ADDED:
-                print("NEXT_TURN_EVENT triggered for LEVEL_UP_ADDED state. Returning to IDLE.")
-                # Buff animation is done, go back to IDLE
-                current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE
+                    SOUND_EFFECTS.play('card_draw')
+                    tap_to_start_start_time = timeline.now # Reset title screen animation timer
+                    session_loader.prefetch(GAME_SEED) # Build the next session while the title screen shows
 
+    frame_profiler.mark(PHASE_EVENTS)
 
     # --- Game State Logic & Drawing ---
     if current_game_state == GAME_STATE_TITLE:
@@ -671,7 +490,7 @@ while running:
         screen.blit(title_line1_surface, title_line1_rect)
         screen.blit(title_line2_surface, title_line2_rect)
 
-        elapsed_time = pygame.time.get_ticks() - tap_to_start_start_time
+        elapsed_time = timeline.render_now - tap_to_start_start_time
         animation_phase_time = (elapsed_time % (animation_duration * 2))
 
         scale_factor = 1.0
@@ -687,14 +506,15 @@ while running:
         scaled_width = max(1, scaled_width)
         scaled_height = max(1, scaled_height)
 
-        tap_to_start_scaled_surface = pygame.transform.scale(
+        tap_to_start_scaled_surface = SURF_TITLE.add(pygame.transform.scale(
             tap_to_start_original_surface, (scaled_width, scaled_height)
-        )
+        ))
 
         tap_to_start_y_pos = (title_line2_rect.bottom + HEIGHT) // 2
         tap_to_start_rect = tap_to_start_scaled_surface.get_rect(center=(WIDTH // 2, tap_to_start_y_pos))
 
         screen.blit(tap_to_start_scaled_surface, tap_to_start_rect)
+        frame_profiler.mark(PHASE_DRAW_SCREEN)
 
     elif current_game_state == GAME_STATE_SHUFFLING:
         screen.fill(BLACK) # Clear screen for shuffling
@@ -702,20 +522,27 @@ while running:
         if BACKGROUND_SPRITE: # Always check if the sprite was loaded successfully
             screen.blit(BACKGROUND_SPRITE, (0, 0))
 
-        # Draw shuffling placeholder
+        # Draw shuffling placeholder (slides side to side while the session is built)
         placeholder_size = 200
+        shuffle_offset_x = int(40 * math.sin((timeline.render_now - shuffling_start_time) / 150))
         placeholder_rect = pygame.Rect(
-            WIDTH // 2 - placeholder_size // 2,
+            WIDTH // 2 - placeholder_size // 2 + shuffle_offset_x,
             HEIGHT // 2 - placeholder_size // 2,
             placeholder_size,
             placeholder_size
         )
         pygame.draw.rect(screen, NEON_PINK, placeholder_rect)
 
-        # Check if 2 seconds have passed
-        if pygame.time.get_ticks() - shuffling_start_time > 2000:
+        # Check if 2 seconds have passed and the background session build is done
+        if timeline.now - shuffling_start_time > 2000 and session_loader.ready():
+            hero, main_deck, unlocked_cards_pool, game_session_seed = session_loader.take()
+            run_catalog_version = session_loader.taken_version.number # This run keeps its cards even if the CSV changes
+            run_id = uuid.uuid4().hex
+            run_cards_drawn = 0
+            run_theme = next((card.theme for card in main_deck if card.card_type != "dungeon exit"), None)
             current_game_state = GAME_STATE_GAME_ROOM # Transition to game room
             current_game_room_sub_state = GAME_ROOM_SUB_STATE_IDLE # Enter IDLE state
+        frame_profiler.mark(PHASE_DRAW_SCREEN)
 
     elif current_game_state == GAME_STATE_GAME_ROOM:
         # Get shake offsets from BattleManager
@@ -735,28 +562,48 @@ while running:
         # Restore original rects after drawing to avoid permanent offset for next frame's logic
         game_room_ui.deck_rect = original_deck_rect_ui
         game_room_ui.health_rect = original_health_rect_ui
-
-        # Update and draw combat animations (text, damage numbers)
-        new_sub_state_after_anim = battle_manager.update_animations(current_game_room_sub_state)
-        
-        if new_sub_state_after_anim == GAME_ROOM_SUB_STATE_PLAYER_TURN and current_game_room_sub_state != GAME_ROOM_SUB_STATE_PLAYER_TURN:
-            pygame.time.set_timer(NEXT_TURN_EVENT, 1000) # Player's first turn delay
-        
-        current_game_room_sub_state = new_sub_state_after_anim # Update the main state variable
+        frame_profiler.mark(PHASE_DRAW_GAME_ROOM)
 
         inventory_manager.update_popups()
         level_manager.update_popups()
+        frame_profiler.mark(PHASE_UPDATE_POPUPS)
 
         battle_manager.draw_combat_elements(screen)
+        frame_profiler.mark(PHASE_DRAW_COMBAT)
 
         inventory_manager.draw_popups(screen)
+        frame_profiler.mark(PHASE_DRAW_POPUPS_INVENTORY)
         level_manager.draw_popups(screen)
+        frame_profiler.mark(PHASE_DRAW_POPUPS_LEVEL)
+
+        # Compose the next card's face while this card's animations play, so the draw click never pays for it
+        if main_deck:
+            game_room_ui.prefetch_card_face(main_deck[0])
+
+    frame_profiler.draw_overlay(screen, PHASE_CLOCK_TICK)
+    frame_profiler.mark(PHASE_OVERLAY)
 
     # --- Update Display ---
     pygame.display.flip()
+    if action_started is not None:
+        M_ACTION_LATENCY.observe(time.perf_counter() - action_started)
+        action_started = None
+    frame_profiler.mark(PHASE_DISPLAY_FLIP)
 
     # --- Cap Frame Rate ---
-    clock.tick(FPS)
-
+    clock.tick(0 if game_clock.scale == TIME_SCALE_INSTANT else FPS) # Instant mode runs uncapped
+    frame_profiler.mark(PHASE_CLOCK_TICK)
+    frame_profiler.end_frame()
+    SURFACES.end_frame()
+
+SURFACES.emit_summary()
+if catalog_watcher is not None:
+    catalog_watcher.close()
+session_loader.shutdown()
+card_ledger.close() # Writes any queued grants
+if leaderboards.dirty:
+    leaderboards.save()
+for exporter in metrics_exporters:
+    exporter.close() # The file writer dumps one last time
 pygame.quit()
 sys.exit()
\ No newline at end of file
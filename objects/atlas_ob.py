@@ -0,0 +1,160 @@
+# objects/atlas_ob.py
+import json
+
+import pygame
+
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_WARNING
+
+# --- Trace Events ---
+EV_ATLAS_SPRITE_FAILED = TRACE.define("atlas.sprite_failed", TRACE_WARNING, "Error loading sprite '{0}' from {1}: {2}. Placeholder will be used.")
+EV_ATLAS_BUILT = TRACE.define("atlas.built", TRACE_DEBUG, "Sprite atlas built: {0} sprites on {1} page(s), {2} KB")
+
+
+class AtlasPage:
+    """One packed surface. Sprites are placed on shelves: rows filled left to right, each as tall as its tallest sprite."""
+    def __init__(self, width, height, alpha):
+        self.width = width
+        self.height = height
+        self.alpha = alpha
+        self.surface = None
+        self.used_width = 0
+        self.used_height = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+        self.cursor_x = 0
+
+    def place(self, width, height, padding):
+        """Returns the top-left for a width x height sprite, or None if this page is full."""
+        if width > self.width or height > self.height:
+            return None
+        if self.cursor_x + width > self.width: # Row is full: open a new shelf below it
+            self.shelf_y += self.shelf_height + padding
+            self.shelf_height = 0
+            self.cursor_x = 0
+        if self.shelf_y + height > self.height:
+            return None
+        position = (self.cursor_x, self.shelf_y)
+        self.cursor_x += width + padding
+        self.shelf_height = max(self.shelf_height, height)
+        self.used_width = max(self.used_width, position[0] + width)
+        self.used_height = max(self.used_height, self.shelf_y + height)
+        return position
+
+
+class SpriteAtlas:
+    """
+    Packs every UI sprite into as few converted surfaces as possible.
+    Register sprites with add(), call build() once after pygame.display.set_mode(), then draw with
+    blit() (area blit from the page) or get() (a cached subsurface sharing the page's pixels).
+    Opaque sprites (the background, full-card art) go on convert() pages, everything else on
+    convert_alpha() pages, so opaque blits stay on the fast path.
+    """
+    def __init__(self, page_size=(2048, 2048), padding=1):
+        self.page_width, self.page_height = page_size
+        self.padding = padding
+        self.pages = []
+        self.manifest = {} # key -> (page index, pygame.Rect inside that page)
+        self._pending = []
+        self._subsurfaces = {}
+
+    def add(self, key, path, size=None, alpha=True):
+        """Queues `path` to be loaded (and scaled to `size`) under `key`. Returns self for chaining."""
+        self._pending.append((key, path, size, alpha))
+        return self
+
+    def build(self):
+        """Loads, scales and packs every queued sprite. Sprites that fail to load are left out of the manifest."""
+        loaded = []
+        for key, path, size, alpha in self._pending:
+            try:
+                image = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                if EV_ATLAS_SPRITE_FAILED.on:
+                    TRACE.emit(EV_ATLAS_SPRITE_FAILED, key, path, e)
+                continue
+            image = image.convert_alpha() if alpha else image.convert()
+            if size and image.get_size() != tuple(size):
+                image = pygame.transform.scale(image, size)
+            loaded.append((key, image, alpha))
+        self._pending = []
+
+        # Tallest first keeps shelves tight
+        loaded.sort(key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+        placements = []
+        for key, image, alpha in loaded:
+            page_index, position = self._place(image.get_width(), image.get_height(), alpha)
+            placements.append((key, image, page_index, position))
+
+        self._allocate_pages()
+        for key, image, page_index, position in placements:
+            page = self.pages[page_index]
+            if page.alpha:
+                # MAX against the cleared page copies RGBA as-is instead of alpha-blending it
+                page.surface.blit(image, position, special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                page.surface.blit(image, position)
+            self.manifest[key] = (page_index, pygame.Rect(position, image.get_size()))
+
+        if EV_ATLAS_BUILT.on:
+            TRACE.emit(EV_ATLAS_BUILT, len(self.manifest), len(self.pages), self.memory_bytes() // 1024)
+        return self
+
+    def _place(self, width, height, alpha):
+        for page_index, page in enumerate(self.pages):
+            if page.alpha == alpha and page.surface is None:
+                position = page.place(width, height, self.padding)
+                if position is not None:
+                    return page_index, position
+        # Oversized sprites get a page of their own size
+        page = AtlasPage(max(width, self.page_width), max(height, self.page_height), alpha)
+        self.pages.append(page)
+        return len(self.pages) - 1, page.place(width, height, self.padding)
+
+    def _allocate_pages(self):
+        """Creates surfaces for new pages, trimmed to the area actually used."""
+        for page in self.pages:
+            if page.surface is not None:
+                continue
+            page.width = max(page.used_width, 1)
+            page.height = max(page.used_height, 1)
+            if page.alpha:
+                page.surface = pygame.Surface((page.width, page.height), pygame.SRCALPHA).convert_alpha()
+                page.surface.fill((0, 0, 0, 0))
+            else:
+                page.surface = pygame.Surface((page.width, page.height)).convert()
+
+    # --- Lookup ---
+    def has(self, key):
+        return key in self.manifest
+
+    def get(self, key):
+        """Subsurface for `key` (no pixel copy), or None if the sprite is not in the atlas."""
+        subsurface = self._subsurfaces.get(key)
+        if subsurface is None and key in self.manifest:
+            page_index, rect = self.manifest[key]
+            subsurface = self.pages[page_index].surface.subsurface(rect)
+            self._subsurfaces[key] = subsurface
+        return subsurface
+
+    def blit(self, screen, key, dest):
+        """Area blit of `key` onto `screen`. Returns False (and draws nothing) if the sprite is missing."""
+        entry = self.manifest.get(key)
+        if entry is None:
+            return False
+        page_index, rect = entry
+        screen.blit(self.pages[page_index].surface, dest, rect)
+        return True
+
+    # --- Introspection ---
+    def memory_bytes(self):
+        return sum(page.surface.get_bytesize() * page.width * page.height
+                   for page in self.pages if page.surface is not None)
+
+    def manifest_dict(self):
+        """{key: [page, x, y, w, h]}, for saving next to the art or checking in tests."""
+        return {key: [page_index, rect.x, rect.y, rect.width, rect.height]
+                for key, (page_index, rect) in self.manifest.items()}
+
+    def save_manifest(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(self.manifest_dict(), manifest_file, indent=2, sort_keys=True)
@@ -0,0 +1,337 @@
+# objects/balance_ob.py
+import math
+import random
+
+from objects.catalog_ob import EXIT_JITTER, theme_for_seed
+from objects.deck_ob import Hero
+from objects.simulation_ob import FIGHT_MEMO, run_events, summarize_run, simulate_seed
+
+Z_95 = 1.959963984540054 # Two-sided 95% normal quantile
+
+
+class RunningStats:
+    """
+    Count, mean and variance of a stream in O(1) memory (Welford's update). Two partial results,
+    e.g. from worker processes, combine exactly with merge().
+    """
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0 # Sum of squared deviations from the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Folds `other` into this one (Chan et al.'s pairwise update)."""
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1); 0 until there are two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stderr(self):
+        return math.sqrt(self.variance / self.count) if self.count else math.inf
+
+    def interval(self, z=Z_95):
+        """Normal-approximation confidence interval for the mean, as (low, high)."""
+        half_width = z * self.stderr
+        return self.mean - half_width, self.mean + half_width
+
+    def state(self):
+        return (self.count, self.mean, self._m2)
+
+    @classmethod
+    def from_state(cls, state):
+        stats = cls()
+        stats.count, stats.mean, stats._m2 = state
+        return stats
+
+
+# --- Common Random Numbers ---
+def _deal(catalog, theme_deck, positions, jitter):
+    card_ids = [theme_deck[position] for position in positions if position < len(theme_deck)]
+    if card_ids and catalog.exit_id is not None:
+        card_ids.insert(max(0, min(len(card_ids) // 2 + jitter, len(card_ids))), catalog.exit_id)
+    return card_ids
+
+
+def paired_decks(catalog_a, catalog_b, seed):
+    """
+    What `seed` deals from two versions of cards.csv with the same random numbers, as
+    (theme, ids from A, ids from B); the id lists are None if B has no such theme.
+    The theme is picked from A's themes and the shuffle is a permutation of deck *positions*
+    (the rows of the theme in CSV order, with Quantity copies), applied to both versions, so
+    position p holds "the same card" before and after a stat change. The exit uses the same
+    jitter in both. If A's and B's theme decks are the same size, A's deck is exactly the one
+    setup_new_game(game_seed=seed) deals; if a Quantity changed, both take their positions
+    from one permutation of the larger deck, which keeps every shared card in the same order.
+    """
+    rng = random.Random(seed)
+    if not catalog_a.themes:
+        return None, None, None
+    theme = rng.choice(catalog_a.themes)
+    if theme not in catalog_b.themes:
+        return theme, None, None
+    theme_deck_a = catalog_a.theme_decks[catalog_a.themes.index(theme)]
+    theme_deck_b = catalog_b.theme_decks[catalog_b.themes.index(theme)]
+    positions = list(range(max(len(theme_deck_a), len(theme_deck_b))))
+    jitter = 0
+    if positions:
+        rng.shuffle(positions) # Same calls as setup_new_game: shuffle, then the exit's randint
+        jitter = rng.randint(-EXIT_JITTER, EXIT_JITTER)
+    return (theme, _deal(catalog_a, theme_deck_a, positions, jitter),
+            _deal(catalog_b, theme_deck_b, positions, jitter))
+
+
+def play_ids(catalog, card_ids, theme=None, seed=None, fight=FIGHT_MEMO.resolve):
+    """RunSummary of a fresh hero playing the deck `card_ids` from `catalog`."""
+    return summarize_run(run_events(Hero(), (catalog.card(card_id) for card_id in card_ids), theme, seed, fight))
+
+
+# --- Paired Comparison ---
+class PairedStats:
+    """Survival and XP of A, of B and of the per-seed difference B - A, for one group of seeds."""
+    __slots__ = ("survived_a", "survived_b", "survived_diff", "xp_a", "xp_b", "xp_diff")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, RunningStats())
+
+    def add(self, summary_a, summary_b):
+        survived_a, survived_b = int(summary_a.survived), int(summary_b.survived)
+        self.survived_a.add(survived_a)
+        self.survived_b.add(survived_b)
+        self.survived_diff.add(survived_b - survived_a)
+        self.xp_a.add(summary_a.xp)
+        self.xp_b.add(summary_b.xp)
+        self.xp_diff.add(summary_b.xp - summary_a.xp)
+
+    def merge(self, other):
+        for name in self.__slots__:
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def report(self, z=Z_95):
+        """
+        Means, the paired CI of each difference, and the CI two independent samples of the same size
+        would give. Values that would be infinite (no seeds, or no seed played differently) are None,
+        so the report stays valid JSON.
+        """
+        report = {"seeds": self.survived_diff.count}
+        for metric in ("survived", "xp"):
+            a, b, diff = getattr(self, metric + "_a"), getattr(self, metric + "_b"), getattr(self, metric + "_diff")
+            independent_half_width = z * math.sqrt((a.variance + b.variance) / diff.count) if diff.count else None
+            report[metric] = {
+                "a": a.mean,
+                "b": b.mean,
+                "diff": diff.mean,
+                "ci": diff.interval(z) if diff.count else None,
+                "independent_ci": ((diff.mean - independent_half_width, diff.mean + independent_half_width)
+                                   if independent_half_width is not None else None),
+                # How many times fewer seeds the paired estimate needs for the same precision (None: every seed matched)
+                "variance_reduction": (a.variance + b.variance) / diff.variance if diff.variance else None,
+            }
+        return report
+
+
+class PairedComparison:
+    """
+    Per-theme and overall PairedStats for two catalog versions played on the same seeds
+    (see paired_decks). Seeds whose theme B does not have are counted in `unpaired`.
+    """
+    def __init__(self):
+        self.overall = PairedStats()
+        self.themes = {} # theme -> PairedStats
+        self.unpaired = 0
+
+    def add(self, theme, summary_a, summary_b):
+        self.overall.add(summary_a, summary_b)
+        stats = self.themes.get(theme)
+        if stats is None:
+            stats = self.themes[theme] = PairedStats()
+        stats.add(summary_a, summary_b)
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        for theme, stats in other.themes.items():
+            self.themes.setdefault(theme, PairedStats()).merge(stats)
+        self.unpaired += other.unpaired
+        return self
+
+    def report(self, z=Z_95):
+        return {
+            "overall": self.overall.report(z),
+            "themes": {theme: self.themes[theme].report(z) for theme in sorted(self.themes)},
+            "unpaired": self.unpaired,
+        }
+
+
+def compare_seeds(catalog_a, catalog_b, seeds, fight=FIGHT_MEMO.resolve, on_pair=None):
+    """
+    Plays every seed on both catalogs with common random numbers and returns the PairedComparison.
+    `on_pair(seed, theme, summary_a, summary_b)` sees each pair as it is played (per-seed output).
+    """
+    comparison = PairedComparison()
+    for seed in seeds:
+        theme, ids_a, ids_b = paired_decks(catalog_a, catalog_b, seed)
+        if ids_a is None:
+            comparison.unpaired += 1
+            continue
+        summary_a = play_ids(catalog_a, ids_a, theme, seed, fight)
+        summary_b = play_ids(catalog_b, ids_b, theme, seed, fight)
+        comparison.add(theme, summary_a, summary_b)
+        if on_pair is not None:
+            on_pair(seed, theme, summary_a, summary_b)
+    return comparison
+
+
+# --- Adaptive Sampling ---
+def wilson_interval(successes, count, z=Z_95):
+    """Wilson score interval for a rate; stays inside [0, 1] and sensible at 0 or `count` successes."""
+    if not count:
+        return 0.0, 1.0
+    rate = successes / count
+    z2 = z * z
+    centre = (rate + z2 / (2 * count)) / (1 + z2 / count)
+    half_width = z * math.sqrt(rate * (1 - rate) / count + z2 / (4 * count * count)) / (1 + z2 / count)
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+class ThemeEstimate:
+    """Running survival and XP estimates for one theme, and where its seed scan has got to."""
+    __slots__ = ("theme", "theme_index", "survived", "xp", "next_seed")
+
+    def __init__(self, theme, theme_index, start):
+        self.theme = theme
+        self.theme_index = theme_index
+        self.survived = 0
+        self.xp = RunningStats()
+        self.next_seed = start
+
+    @property
+    def count(self):
+        return self.xp.count
+
+    def add(self, summary):
+        self.survived += summary.survived
+        self.xp.add(summary.xp)
+
+    def survival_interval(self, z=Z_95):
+        return wilson_interval(self.survived, self.count, z)
+
+
+class AdaptiveSampler:
+    """
+    Estimates survival rate and mean XP per theme to a target precision with as few seeds as it can.
+    Works in rounds of up to `batch_size` seeds: themes whose 95% intervals are already narrower
+    than `survival_precision` / `xp_precision` (half-widths) get no more seeds, and each round is
+    split between the others by how many more seeds their current variance says they still need.
+    Stops when every theme has converged or `budget` seeds have been played.
+    Seeds are real game seeds (each theme takes the next seeds, from `start` on, that deal it),
+    so any run can be replayed with DG_SEED.
+    """
+    def __init__(self, catalog, survival_precision=0.01, xp_precision=1.0, budget=200000, batch_size=2000,
+                 min_seeds=200, start=0, z=Z_95):
+        self.catalog = catalog
+        self.survival_precision = survival_precision
+        self.xp_precision = xp_precision
+        self.budget = budget
+        self.batch_size = batch_size
+        self.min_seeds = min_seeds
+        self.z = z
+        self.used = 0
+        self.rounds = 0
+        self.estimates = {theme: ThemeEstimate(theme, index, start) for index, theme in enumerate(catalog.themes)}
+
+    def _half_widths(self, estimate):
+        low, high = estimate.survival_interval(self.z)
+        return (high - low) / 2, self.z * estimate.xp.stderr
+
+    def converged(self, estimate):
+        if estimate.count < self.min_seeds:
+            return False
+        survival_half_width, xp_half_width = self._half_widths(estimate)
+        return survival_half_width <= self.survival_precision and xp_half_width <= self.xp_precision
+
+    def seeds_needed(self, estimate):
+        """Rough number of further seeds until `estimate` converges (intervals shrink like 1/sqrt(n))."""
+        if estimate.count < self.min_seeds:
+            return self.min_seeds - estimate.count
+        survival_half_width, xp_half_width = self._half_widths(estimate)
+        ratio = max(survival_half_width / self.survival_precision, xp_half_width / self.xp_precision)
+        return max(1, math.ceil(estimate.count * (ratio * ratio - 1)))
+
+    def _take_seeds(self, estimate, count):
+        seeds = []
+        while len(seeds) < count:
+            seed = estimate.next_seed
+            estimate.next_seed += 1
+            if theme_for_seed(self.catalog, seed) == estimate.theme_index:
+                seeds.append(seed)
+        return seeds
+
+    def plan(self):
+        """The next round as {theme: [seeds]}; empty when every theme has converged or the budget is spent."""
+        round_size = min(self.batch_size, self.budget - self.used)
+        needs = {theme: self.seeds_needed(estimate) for theme, estimate in self.estimates.items()
+                 if not self.converged(estimate)}
+        if round_size <= 0 or not needs:
+            return {}
+        total_need = sum(needs.values())
+        plan = {}
+        for theme, need in sorted(needs.items(), key=lambda item: item[1]):
+            count = min(need, max(1, round_size * need // total_need), self.budget - self.used)
+            if count > 0:
+                plan[theme] = self._take_seeds(self.estimates[theme], count)
+                self.used += count
+        self.rounds += 1
+        return plan
+
+    def record(self, theme, summaries):
+        estimate = self.estimates[theme]
+        for summary in summaries:
+            estimate.add(summary)
+
+    def run(self, play_round=None):
+        """
+        Plans and plays rounds until done and returns report(). `play_round({theme: [seeds]})` must
+        return {theme: [RunSummary]}; the default plays them here with simulate_seed.
+        """
+        play_round = play_round or self._play_round
+        while True:
+            plan = self.plan()
+            if not plan:
+                return self.report()
+            for theme, summaries in play_round(plan).items():
+                self.record(theme, summaries)
+
+    def _play_round(self, plan):
+        return {theme: [simulate_seed(self.catalog, seed) for seed in seeds] for theme, seeds in plan.items()}
+
+    def report(self):
+        themes = {}
+        for theme, estimate in self.estimates.items():
+            themes[theme] = {
+                "seeds": estimate.count,
+                "survival": estimate.survived / estimate.count if estimate.count else None,
+                "survival_ci": estimate.survival_interval(self.z),
+                "xp": estimate.xp.mean,
+                "xp_ci": estimate.xp.interval(self.z) if estimate.count else None, # Not (-inf, inf): keep it valid JSON
+                "converged": self.converged(estimate),
+            }
+        return {"seeds": self.used, "budget": self.budget, "rounds": self.rounds, "themes": themes}
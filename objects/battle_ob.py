@@ -1,10 +1,268 @@
 # objects/battle_ob.py
 import pygame
-import random
 import math
+from collections import OrderedDict
+
+from objects.equipment_ob import EQUIPMENT_WEAPON, EQUIPMENT_ARMOR, equipment_category
+from objects.memory_ob import SURFACES, SUBSYSTEM_BATTLE
+from objects.metrics_ob import METRICS
+from objects.particle_ob import FloatingTextPool, OWNER_BATTLE
+from objects.timeline_ob import Timeline, ZoomFadeTween, ShakeTween
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_INFO, TRACE_ERROR
+
+# --- Trace Events ---
+EV_BATTLE_NO_ENEMY = TRACE.define("battle.no_enemy", TRACE_ERROR, "Error: No enemy to attack.")
+EV_PLAYER_ATTACK = TRACE.define("battle.player_attack", TRACE_INFO, "Player attacks!")
+EV_ATTACK_DEGRADING = TRACE.define("battle.attack_degrading", TRACE_DEBUG, "Attack of {0} dropping by 1")
+EV_ATTACK_DEGRADED = TRACE.define("battle.attack_degraded", TRACE_DEBUG, "Hero's attack degraded to {0}.")
+EV_ATTACK_AT_MINIMUM = TRACE.define("battle.attack_at_minimum", TRACE_DEBUG, "Hero's attack reached minimum. Checking for weapon to break...")
+EV_WEAPON_BROKE = TRACE.define("battle.weapon_broke", TRACE_INFO, "Weapon piece '{0}' broke! Removed from inventory.")
+EV_ATTACK_AFTER_BREAK = TRACE.define("battle.attack_after_break", TRACE_DEBUG, "Hero's new current Attack: {0}")
+EV_NO_WEAPON_TO_BREAK = TRACE.define("battle.no_weapon_to_break", TRACE_DEBUG, "No degradable weapon found to remove, despite attack hitting threshold.")
+EV_ENEMY_DAMAGED = TRACE.define("battle.enemy_damaged", TRACE_INFO, "Enemy {0} took {1} damage. Remaining HP: {2}")
+EV_ENEMY_DEFEATED = TRACE.define("battle.enemy_defeated", TRACE_INFO, "Enemy {0} defeated!")
+EV_ENEMY_TURN = TRACE.define("battle.enemy_turn", TRACE_DEBUG, "It's enemy's turn.")
+EV_BATTLE_NO_ENEMY_TO_ATTACK_HERO = TRACE.define("battle.no_enemy_to_attack_hero", TRACE_ERROR, "Error: No enemy to attack hero.")
+EV_ENEMY_ATTACK = TRACE.define("battle.enemy_attack", TRACE_INFO, "Enemy attacks!")
+EV_DEFENSE_DEGRADING = TRACE.define("battle.defense_degrading", TRACE_DEBUG, "Defense of {0} dropping by 1")
+EV_DEFENSE_DEGRADED = TRACE.define("battle.defense_degraded", TRACE_DEBUG, "Hero's defense degraded to {0}.")
+EV_DEFENSE_AT_MINIMUM = TRACE.define("battle.defense_at_minimum", TRACE_DEBUG, "Hero's defense reached minimum. Checking for armor to break...")
+EV_ARMOR_BROKE = TRACE.define("battle.armor_broke", TRACE_INFO, "Armor piece '{0}' broke! Removed from inventory.")
+EV_DEFENSE_AFTER_BREAK = TRACE.define("battle.defense_after_break", TRACE_DEBUG, "Hero's new current Defense: {0}")
+EV_NO_ARMOR_TO_BREAK = TRACE.define("battle.no_armor_to_break", TRACE_DEBUG, "No degradable armor found to remove, despite defense hitting threshold.")
+EV_HERO_DAMAGED = TRACE.define("battle.hero_damaged", TRACE_INFO, "Hero took {0} damage. Remaining HP: {1}")
+EV_HERO_DEFEATED = TRACE.define("battle.hero_defeated", TRACE_INFO, "Hero defeated! Game Over.")
+EV_PLAYER_TURN = TRACE.define("battle.player_turn", TRACE_DEBUG, "It's player's turn.")
+EV_COMBAT_START_DONE = TRACE.define("battle.combat_start_done", TRACE_DEBUG, "Combat Start animation finished. Transitioning to PLAYER_TURN.")
+
+# --- Metrics (game fights only; headless simulations don't count) ---
+M_FIGHTS = METRICS.counter("dg_fights_total", "Fights finished in the game, by outcome", ("outcome",))
+M_ITEMS_BROKEN = METRICS.counter("dg_items_broken_total", "Equipment broken in fights, by category", ("category",))
+
+# --- Fight Outcomes (resolve_fight) ---
+FIGHT_VICTORY = "victory"
+FIGHT_DEFEAT = "defeat"
+FIGHT_STALEMATE = "stalemate" # Neither side can hurt the other; the game itself would loop forever
+FIGHT_ROUND_CAP = 200 # Player + enemy turns before a headless fight is called a stalemate
+
+M_FIGHTS_WON = M_FIGHTS.labels(FIGHT_VICTORY)
+M_FIGHTS_LOST = M_FIGHTS.labels(FIGHT_DEFEAT)
+M_WEAPONS_BROKEN = M_ITEMS_BROKEN.labels(EQUIPMENT_WEAPON)
+M_ARMOR_BROKEN = M_ITEMS_BROKEN.labels(EQUIPMENT_ARMOR)
+SURF_BATTLE = SURFACES.subsystem(SUBSYSTEM_BATTLE)
+
+
+# --- Combat Rules (no drawing; BattleManager adds the animations, the simulation uses them headless) ---
+def guard_against_endless_fight(hero_instance, enemy_card):
+    """Added bug correction to prevent infinite combat, applied when an enemy card is drawn."""
+    if enemy_card.defense > 0:
+        damage_potentail = enemy_card.defense - (hero_instance.attack - hero_instance.min_attack) # this gives us how much defense will be destroyed
+        if damage_potentail == hero_instance.min_attack:
+            if enemy_card.attack == hero_instance.min_defense:
+                enemy_card.defense = hero_instance.min_attack - 1
+
+
+def player_attack(hero_instance, enemy):
+    """
+    One player hit: damages `enemy`, wears the hero's attack down by 1 and breaks the oldest
+    weapon when attack reaches its minimum.
+    Returns (damage dealt, broken weapon card or None).
+    """
+    if EV_PLAYER_ATTACK.on:
+        TRACE.emit(EV_PLAYER_ATTACK)
+    damage_dealt = hero_instance.attack
+    
+    effective_damage_to_enemy = max(0, damage_dealt - enemy.current_defense)
+    removed_card = None
+    
+    if hero_instance.attack > hero_instance.min_attack:
+        if enemy.current_defense > 0:
+            enemy.current_defense = enemy.current_defense - 1
+        if EV_ATTACK_DEGRADING.on:
+            TRACE.emit(EV_ATTACK_DEGRADING, hero_instance.attack)
+        # Reduce hero's aggregate attack by 1 for this hit, but not below min_attack
+        hero_instance.attack = max(hero_instance.min_attack, hero_instance.attack - 1)
+        if EV_ATTACK_DEGRADED.on:
+            TRACE.emit(EV_ATTACK_DEGRADED, hero_instance.attack)
+
+        # Now, check if this degradation means an equipment piece should break and be removed.
+        # This triggers if the hero's aggregate attack has dropped to their base 'fist' attack.
+        if hero_instance.attack <= hero_instance.min_attack:
+            if EV_ATTACK_AT_MINIMUM.on:
+                TRACE.emit(EV_ATTACK_AT_MINIMUM)
+            
+            # Take the oldest weapon piece out of the inventory, if there is one to break
+            removed_card = hero_instance.current_equipment.pop_oldest(EQUIPMENT_WEAPON)
+
+            if removed_card is not None:
+                # Revert the stats that this specific broken card *originally provided*
+                # This ensures the hero's total attack accurately reflects remaining items.
+                hero_instance.attack -= removed_card.attack 
+                hero_instance.attack = max(hero_instance.attack, hero_instance.min_attack) # Ensure attack doesn't go below actual min
+
+                if EV_WEAPON_BROKE.on:
+                    TRACE.emit(EV_WEAPON_BROKE, removed_card.name)
+                if EV_ATTACK_AFTER_BREAK.on:
+                    TRACE.emit(EV_ATTACK_AFTER_BREAK, hero_instance.attack)
+            else:
+                if EV_NO_WEAPON_TO_BREAK.on:
+                    TRACE.emit(EV_NO_WEAPON_TO_BREAK)
+
+    enemy.current_health -= effective_damage_to_enemy
+
+    if EV_ENEMY_DAMAGED.on:
+        TRACE.emit(EV_ENEMY_DAMAGED, enemy.name, effective_damage_to_enemy, enemy.current_health)
+    return effective_damage_to_enemy, removed_card
+
+
+def enemy_attack(hero_instance, enemy):
+    """
+    One enemy hit: damages the hero through defense, wears defense down by 1 and breaks the
+    oldest armor when defense reaches its minimum.
+    Returns (damage taken, broken armor card or None).
+    """
+    if EV_ENEMY_ATTACK.on:
+        TRACE.emit(EV_ENEMY_ATTACK)
+    damage_taken = max(0, enemy.attack - hero_instance.defense) # Defense reduces damage
+    removed_card = None
+    
+    # First, apply the per-hit degradation to the hero's overall defense stat
+    if hero_instance.defense > hero_instance.min_defense:
+        if EV_DEFENSE_DEGRADING.on:
+            TRACE.emit(EV_DEFENSE_DEGRADING, hero_instance.defense)
+        # Reduce hero's aggregate defense by 1 for this hit, but not below min_defense
+        hero_instance.defense = max(hero_instance.min_defense, hero_instance.defense - 1)
+        if EV_DEFENSE_DEGRADED.on:
+            TRACE.emit(EV_DEFENSE_DEGRADED, hero_instance.defense)
+
+        # Now, check if this degradation means an equipment piece should break and be removed.
+        # This triggers if the hero's aggregate defense has dropped to their base 'fist' defense.
+        if hero_instance.defense <= hero_instance.min_defense:
+            if EV_DEFENSE_AT_MINIMUM.on:
+                TRACE.emit(EV_DEFENSE_AT_MINIMUM)
+            
+            # Take the oldest armor piece out of the inventory, if there is one to break
+            removed_card = hero_instance.current_equipment.pop_oldest(EQUIPMENT_ARMOR)
+
+            if removed_card is not None:
+                # Revert the stats that this specific broken card *originally provided*
+                # This ensures the hero's total defense accurately reflects remaining items.
+                hero_instance.defense -= removed_card.defense 
+                hero_instance.defense = max(hero_instance.defense, hero_instance.min_defense) # Ensure defense doesn't go below actual min
+
+                if EV_ARMOR_BROKE.on:
+                    TRACE.emit(EV_ARMOR_BROKE, removed_card.name)
+                if EV_DEFENSE_AFTER_BREAK.on:
+                    TRACE.emit(EV_DEFENSE_AFTER_BREAK, hero_instance.defense)
+            else:
+                if EV_NO_ARMOR_TO_BREAK.on:
+                    TRACE.emit(EV_NO_ARMOR_TO_BREAK)
+
+    hero_instance.health -= damage_taken
+
+    if EV_HERO_DAMAGED.on:
+        TRACE.emit(EV_HERO_DAMAGED, damage_taken, hero_instance.health)
+    return damage_taken, removed_card
+
+
+class FightResult:
+    """What resolve_fight() did: outcome, turns played, damage each way and the equipment that broke (in order)."""
+    __slots__ = ("outcome", "rounds", "damage_dealt", "damage_taken", "broken")
+
+    def __init__(self, outcome, rounds, damage_dealt, damage_taken, broken):
+        self.outcome = outcome
+        self.rounds = rounds
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+        self.broken = broken
+
+
+def resolve_fight(hero_instance, enemy, max_rounds=FIGHT_ROUND_CAP):
+    """
+    Plays the whole fight without animations: player turn, enemy turn, ... as the turn timer
+    does in main.py, until the enemy or the hero drops or `max_rounds` rounds pass (a stalemate).
+    Changes `hero_instance` and `enemy` exactly like the turn-by-turn game does.
+    """
+    damage_dealt = damage_taken = 0
+    broken = []
+    for rounds in range(1, max_rounds + 1):
+        damage, removed_card = player_attack(hero_instance, enemy)
+        damage_dealt += damage
+        if removed_card is not None:
+            broken.append(removed_card)
+        if enemy.current_health <= 0:
+            return FightResult(FIGHT_VICTORY, rounds, damage_dealt, damage_taken, broken)
+
+        damage, removed_card = enemy_attack(hero_instance, enemy)
+        damage_taken += damage
+        if removed_card is not None:
+            broken.append(removed_card)
+        if hero_instance.health <= 0:
+            return FightResult(FIGHT_DEFEAT, rounds, damage_dealt, damage_taken, broken)
+    return FightResult(FIGHT_STALEMATE, max_rounds, damage_dealt, damage_taken, broken)
+
+
+class FightMemo:
+    """
+    Bounded LRU of resolve_fight() outcomes for headless runs. The same matchups come up over and
+    over (four Rats per Cave deck against a handful of hero builds), so a fight is keyed by
+    everything resolve_fight() reads: hero health, attack, defense and minimums, the attack of
+    each weapon and the defense of each armor in breaking order, and the enemy's current health,
+    attack and defense. A hit replays the stored end state onto the hero and enemy (and breaks
+    the same equipment) instead of playing the rounds; it emits none of the per-hit trace events.
+    """
+    def __init__(self, max_entries=65536, max_rounds=FIGHT_ROUND_CAP):
+        self.max_entries = max_entries
+        self.max_rounds = max_rounds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> (outcome, rounds, dealt, taken, broken categories, end state)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def key(self, hero_instance, enemy):
+        equipment = hero_instance.current_equipment
+        return (hero_instance.health, hero_instance.attack, hero_instance.defense,
+                hero_instance.min_attack, hero_instance.min_defense,
+                equipment.weapon_attacks, equipment.armor_defenses, # Kept current by the store: no walk
+                enemy.current_health, enemy.attack, enemy.current_defense)
+
+    def resolve(self, hero_instance, enemy):
+        """resolve_fight(hero_instance, enemy), from the table when this matchup has been seen."""
+        key = self.key(hero_instance, enemy)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            result = resolve_fight(hero_instance, enemy, self.max_rounds)
+            self._entries[key] = (result.outcome, result.rounds, result.damage_dealt, result.damage_taken,
+                                  tuple(equipment_category(card) for card in result.broken),
+                                  (hero_instance.health, hero_instance.attack, hero_instance.defense,
+                                   enemy.current_health, enemy.current_defense))
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return result
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        outcome, rounds, damage_dealt, damage_taken, broken_categories, end_state = entry
+        broken = [hero_instance.current_equipment.pop_oldest(category) for category in broken_categories]
+        (hero_instance.health, hero_instance.attack, hero_instance.defense,
+         enemy.current_health, enemy.current_defense) = end_state
+        return FightResult(outcome, rounds, damage_dealt, damage_taken, broken)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
 
 class BattleManager:
-    def __init__(self, screen_width, screen_height, game_room_ui_instance):
+    def __init__(self, screen_width, screen_height, game_room_ui_instance, floating_texts=None, timeline=None):
         self.WIDTH = screen_width
         self.HEIGHT = screen_height
         self.game_room_ui = game_room_ui_instance # Reference to the UI object to get rects
@@ -18,123 +276,63 @@ class BattleManager:
         self.combat_text_font = pygame.font.SysFont("Arial Black", 50, bold=True)
         self.damage_text_font = pygame.font.SysFont("Arial", 25, bold=True) # For floating damage numbers
 
+        # Animation timeline (shared with the other managers in main.py, which ticks it once per frame)
+        self.timeline = timeline if timeline is not None else Timeline()
+        self._owns_timeline = timeline is None # A private timeline is ticked from update_animations
+
         # Combat Animation Variables (for "Battle Start!", "Victory!", "Defeat!" text)
-        self.combat_text_start_time = 0
         self.combat_text_message = ""
-        self.combat_text_alpha = 255 # For fading
-        self.combat_text_scale = 0.1 # For zooming
-        self.combat_text_active = False # Flag to know if combat text animation is running
+        self.combat_text_tween = ZoomFadeTween(2000) # Zoom in for 1 second, fade out for 1 second
 
         # Shaking Animation Variables
-        self.shake_target_rect_name = None # 'enemy_card' or 'hero_health'
-        self.shake_start_time = 0
         self.shake_duration = 200 # milliseconds
         self.shake_intensity = 5 # pixels
+        self.shake_tween = ShakeTween(self.shake_duration, self.shake_intensity) # target: 'enemy_card' or 'hero_health'
 
         # UI Feedback Variables (for floating damage numbers etc.)
-        self.damage_display_list = [] # List of {'value': int, 'color': (R,G,B), 'pos': (x,y), 'start_time': ticks}
+        self.floating_texts = floating_texts if floating_texts is not None else FloatingTextPool() # Shared with the other managers in main.py
+        self.timeline.add_ticker(self.floating_texts)
 
         # Current combat state information
         self.current_enemy = None # The actual enemy Card object
         self.current_game_room_sub_state = "IDLE" # Managed externally, but useful for internal logic
 
-    def _find_oldest_degradable_armor(self, hero_instance):
-        """
-        Finds the index of the oldest equipped item that contributes defense
-        and is not primarily an attack weapon. Assumes FIFO order.
-        """
-        for i, item_card in enumerate(hero_instance.current_equipment):
-            # Define what constitutes "degradable armor" for your game
-            # Example: card_type is "equipment", it provides defense, and no attack.
-            # Adjust these conditions as needed for your specific item types.
-            if item_card.card_type == "equipment" and item_card.defense > 0 and item_card.attack == 0:
-                return i # Return the index of the oldest found
-        return -1 # No suitable armor found
-    
-    def _find_oldest_degradable_weapon(self, hero_instance):
-        """
-        Finds the index of the oldest equipped item that contributes attack
-        and is not primarily a defense item. Assumes FIFO order.
-        """
-        for i, item_card in enumerate(hero_instance.current_equipment):
-            # Define what constitutes a "degradable weapon" for your game
-            # Example: card_type is "equipment", it provides attack, and no defense.
-            # Adjust these conditions as needed for your specific item types.
-            if item_card.card_type == "equipment" and item_card.attack > 0 and item_card.defense == 0:
-                return i # Return the index of the oldest found
-        return -1 # No suitable weapon found
-
-    def _shake_rect_offset(self, rect, current_time):
-        """
-        Calculates a shaking offset for a rect based on time if shaking is active for this rect.
-        Returns the offset (dx, dy).
-        """
-        if self.shake_target_rect_name == 'enemy_card' and rect == self.game_room_ui.get_deck_rect():
-            elapsed = current_time - self.shake_start_time
-            if elapsed < self.shake_duration:
-                offset_x = random.randint(-self.shake_intensity, self.shake_intensity)
-                offset_y = random.randint(-self.shake_intensity, self.shake_intensity)
-                return offset_x, offset_y
-            else:
-                self.shake_target_rect_name = None # Stop shaking
-        elif self.shake_target_rect_name == 'hero_health' and rect == self.game_room_ui.get_health_rect():
-            elapsed = current_time - self.shake_start_time
-            if elapsed < self.shake_duration:
-                offset_x = random.randint(-self.shake_intensity, self.shake_intensity)
-                offset_y = random.randint(-self.shake_intensity, self.shake_intensity)
-                return offset_x, offset_y
-            else:
-                self.shake_target_rect_name = None # Stop shaking
-        
-        return 0, 0 # No shake offset
+    @property
+    def combat_text_active(self):
+        """True while "Battle Start!"/"Victory!"/... is still animating."""
+        return self.combat_text_tween.active
+
+    def _start_combat_text(self, message):
+        self.combat_text_message = message
+        self.timeline.play(self.combat_text_tween)
+
+    def _start_shake(self, target_rect_name):
+        self.shake_tween.target = target_rect_name
+        self.timeline.play(self.shake_tween)
 
     def _display_damage_text(self, value, color, target_rect_center):
         """Adds a damage/healing text element to be displayed."""
-        # Position the text slightly above the center of the target rect
-        pos_x = target_rect_center[0]
-        pos_y = target_rect_center[1] - 30 # 30 pixels above the center
-        self.damage_display_list.append({
-            'value': value,
-            'color': color,
-            'pos': (pos_x, pos_y),
-            'start_time': pygame.time.get_ticks()
-        })
+        self.floating_texts.spawn(OWNER_BATTLE, self.damage_text_font, value, color, target_rect_center, self.timeline.now)
 
     def start_combat(self, enemy_card):
         """Initializes combat with a new enemy and starts the 'Battle Start!' animation."""
         self.current_enemy = enemy_card
-        self.combat_text_message = "Battle\nStart!"
-        self.combat_text_start_time = pygame.time.get_ticks()
-        self.combat_text_alpha = 255
-        self.combat_text_scale = 0.1
-        self.combat_text_active = True
+        self._start_combat_text("Battle\nStart!")
         return "COMBAT_START" # Return the sub-state to transition to
 
     def start_victory_animation(self):
         """Starts the 'Victory!' animation."""
-        self.combat_text_message = f"Victory!\n+{self.current_enemy.xp_gain}XP"
-        self.combat_text_start_time = pygame.time.get_ticks()
-        self.combat_text_alpha = 255
-        self.combat_text_scale = 0.1
-        self.combat_text_active = True
+        self._start_combat_text(f"Victory!\n+{self.current_enemy.xp_gain}XP")
         return "COMBAT_END_VICTORY"
 
     def start_defeat_animation(self):
         """Starts the 'Defeat!' animation."""
-        self.combat_text_message = "Defeat!"
-        self.combat_text_start_time = pygame.time.get_ticks()
-        self.combat_text_alpha = 255
-        self.combat_text_scale = 0.1
-        self.combat_text_active = True
+        self._start_combat_text("Defeat!")
         return "COMBAT_END_DEFEAT"
 
     def start_dungeon_exit_animation(self):
         """Starts the 'You Survived!' animation for dungeon exit."""
-        self.combat_text_message = "You Survived!\nClaim Your Reward!"
-        self.combat_text_start_time = pygame.time.get_ticks()
-        self.combat_text_alpha = 255
-        self.combat_text_scale = 0.1
-        self.combat_text_active = True
+        self._start_combat_text("You Survived!\nClaim Your Reward!")
         return "DUNGEON_EXIT_ANIMATION"
 
 
@@ -144,57 +342,26 @@ class BattleManager:
         Returns the new sub_state.
         """
         if not self.current_enemy:
-            print("Error: No enemy to attack.")
+            if EV_BATTLE_NO_ENEMY.on:
+                TRACE.emit(EV_BATTLE_NO_ENEMY)
             return "IDLE" # Should not happen in combat state
 
-        print("Player attacks!")
-        damage_dealt = hero_instance.attack
-        
-        effective_damage_to_enemy = max(0, damage_dealt - self.current_enemy.current_defense)
-        
-        if hero_instance.attack > hero_instance.min_attack:
-            if self.current_enemy.current_defense > 0:
-                self.current_enemy.current_defense = self.current_enemy.current_defense - 1
-            print(f"Attack of {hero_instance.attack} dropping by 1")
-            # Reduce hero's aggregate attack by 1 for this hit, but not below min_attack
-            hero_instance.attack = max(hero_instance.min_attack, hero_instance.attack - 1)
-            print(f"Hero's attack degraded to {hero_instance.attack}.")
-
-            # Now, check if this degradation means an equipment piece should break and be removed.
-            # This triggers if the hero's aggregate attack has dropped to their base 'fist' attack.
-            if hero_instance.attack <= hero_instance.min_attack:
-                print("Hero's attack reached minimum. Checking for weapon to break...")
-                
-                # Find the oldest weapon piece in the inventory that can break
-                weapon_to_remove_index = self._find_oldest_degradable_weapon(hero_instance)
-
-                if weapon_to_remove_index != -1:
-                    removed_card = hero_instance.current_equipment.pop(weapon_to_remove_index)
-                    
-                    # Revert the stats that this specific broken card *originally provided*
-                    # This ensures the hero's total attack accurately reflects remaining items.
-                    hero_instance.attack -= removed_card.attack 
-                    hero_instance.attack = max(hero_instance.attack, hero_instance.min_attack) # Ensure attack doesn't go below actual min
-
-                    print(f"Weapon piece '{removed_card.name}' broke! Removed from inventory.")
-                    print(f"Hero's new current Attack: {hero_instance.attack}")
-                else:
-                    print("No degradable weapon found to remove, despite attack hitting threshold.")
-
-        self.current_enemy.current_health -= effective_damage_to_enemy
-        self._display_damage_text(effective_damage_to_enemy, self.RED, self.game_room_ui.get_card_health_rect().center) # Show damage on enemy
+        damage, removed_card = player_attack(hero_instance, self.current_enemy)
+        if removed_card is not None:
+            M_WEAPONS_BROKEN.inc()
+        self._display_damage_text(damage, self.RED, self.game_room_ui.get_card_health_rect().center) # Show damage on enemy
 
-        self.shake_target_rect_name = 'enemy_card'
-        self.shake_start_time = pygame.time.get_ticks()
-
-        print(f"Enemy {self.current_enemy.name} took {effective_damage_to_enemy} damage. Remaining HP: {self.current_enemy.current_health}")
+        self._start_shake('enemy_card')
 
         if self.current_enemy.current_health <= 0:
-            print(f"Enemy {self.current_enemy.name} defeated!")
+            M_FIGHTS_WON.inc()
+            if EV_ENEMY_DEFEATED.on:
+                TRACE.emit(EV_ENEMY_DEFEATED, self.current_enemy.name)
             # Trigger victory animation
             return self.start_victory_animation()
         else:
-            print("It's enemy's turn.")
+            if EV_ENEMY_TURN.on:
+                TRACE.emit(EV_ENEMY_TURN)
             return "ENEMY_TURN" # Indicate transition to enemy turn
 
     def handle_enemy_attack(self, hero_instance):
@@ -203,54 +370,26 @@ class BattleManager:
         Returns the new sub_state.
         """
         if not self.current_enemy:
-            print("Error: No enemy to attack hero.")
+            if EV_BATTLE_NO_ENEMY_TO_ATTACK_HERO.on:
+                TRACE.emit(EV_BATTLE_NO_ENEMY_TO_ATTACK_HERO)
             return "IDLE"
 
-        print("Enemy attacks!")
-        damage_taken = max(0, self.current_enemy.attack - hero_instance.defense) # Defense reduces damage
-        
-        # First, apply the per-hit degradation to the hero's overall defense stat
-        if hero_instance.defense > hero_instance.min_defense:
-            print(f"Defense of {hero_instance.defense} dropping by 1")
-            # Reduce hero's aggregate defense by 1 for this hit, but not below min_defense
-            hero_instance.defense = max(hero_instance.min_defense, hero_instance.defense - 1)
-            print(f"Hero's defense degraded to {hero_instance.defense}.")
-
-            # Now, check if this degradation means an equipment piece should break and be removed.
-            # This triggers if the hero's aggregate defense has dropped to their base 'fist' defense.
-            if hero_instance.defense <= hero_instance.min_defense:
-                print("Hero's defense reached minimum. Checking for armor to break...")
-                
-                # Find the oldest armor piece in the inventory that can break
-                armor_to_remove_index = self._find_oldest_degradable_armor(hero_instance)
-
-                if armor_to_remove_index != -1:
-                    removed_card = hero_instance.current_equipment.pop(armor_to_remove_index)
-                    
-                    # Revert the stats that this specific broken card *originally provided*
-                    # This ensures the hero's total defense accurately reflects remaining items.
-                    hero_instance.defense -= removed_card.defense 
-                    hero_instance.defense = max(hero_instance.defense, hero_instance.min_defense) # Ensure defense doesn't go below actual min
-
-                    print(f"Armor piece '{removed_card.name}' broke! Removed from inventory.")
-                    print(f"Hero's new current Defense: {hero_instance.defense}")
-                else:
-                    print("No degradable armor found to remove, despite defense hitting threshold.")
-
-        hero_instance.health -= damage_taken
-        self._display_damage_text(damage_taken, self.RED, self.game_room_ui.get_health_rect().center) # Show damage on player
+        damage, removed_card = enemy_attack(hero_instance, self.current_enemy)
+        if removed_card is not None:
+            M_ARMOR_BROKEN.inc()
+        self._display_damage_text(damage, self.RED, self.game_room_ui.get_health_rect().center) # Show damage on player
         
-        self.shake_target_rect_name = 'hero_health'
-        self.shake_start_time = pygame.time.get_ticks()
-
-        print(f"Hero took {damage_taken} damage. Remaining HP: {hero_instance.health}")
+        self._start_shake('hero_health')
 
         if hero_instance.health <= 0:
-            print("Hero defeated! Game Over.")
+            M_FIGHTS_LOST.inc()
+            if EV_HERO_DEFEATED.on:
+                TRACE.emit(EV_HERO_DEFEATED)
             # Trigger defeat animation
             return self.start_defeat_animation()
         else:
-            print("It's player's turn.")
+            if EV_PLAYER_TURN.on:
+                TRACE.emit(EV_PLAYER_TURN)
             return "PLAYER_TURN" # Indicate transition back to player turn
 
     def update_animations(self, current_game_room_sub_state):
@@ -260,35 +399,15 @@ class BattleManager:
         """
         self.current_game_room_sub_state = current_game_room_sub_state # Keep internal state synced
 
-        current_time = pygame.time.get_ticks()
-
-        # Update combat text animation
-        if self.combat_text_active:
-            elapsed_combat_time = current_time - self.combat_text_start_time
-            if elapsed_combat_time < 1000: # Phase 1: Zoom in (first 1 second)
-                progress = elapsed_combat_time / 1000.0
-                self.combat_text_scale = 0.1 + (1.0 - 0.1) * progress
-                self.combat_text_alpha = 255
-            elif elapsed_combat_time < 2000: # Phase 2: Fade out (next 1 second)
-                progress = (elapsed_combat_time - 1000) / 1000.0
-                self.combat_text_scale = 1.0
-                self.combat_text_alpha = int(255 * (1.0 - progress))
-            else: # Animation complete
-                self.combat_text_active = False
-                self.combat_text_alpha = 0 # Ensure it's fully transparent
-                self.combat_text_scale = 0 # Ensure it's fully shrunk
-                
-                # Handle sub-state transitions after animation completion
-                if current_game_room_sub_state == "COMBAT_START":
-                    print("Combat Start animation finished. Transitioning to PLAYER_TURN.")
-                    return "PLAYER_TURN" # Auto transition
-                # For victory/defeat/dungeon exit, stay in the state until clicked
-                
-        # Update damage text display list (fading and floating)
-        self.damage_display_list = [
-            text_info for text_info in self.damage_display_list
-            if current_time - text_info['start_time'] < 1000 # Keep for 1 second
-        ]
+        if self._owns_timeline:
+            self.timeline.tick()
+
+        # Combat text and shakes are advanced by the timeline; only the sub-state transition is handled here
+        if self.combat_text_tween.finished and current_game_room_sub_state == "COMBAT_START":
+            if EV_COMBAT_START_DONE.on:
+                TRACE.emit(EV_COMBAT_START_DONE)
+            return "PLAYER_TURN" # Auto transition
+        # For victory/defeat/dungeon exit, stay in the state until clicked
         return current_game_room_sub_state # No state change if combat text not active or animation incomplete
 
     def draw_combat_elements(self, screen):
@@ -296,23 +415,22 @@ class BattleManager:
         Draws combat-specific UI elements like combat text and floating damage numbers.
         It also handles applying shake offsets before drawing.
         """
-        current_time = pygame.time.get_ticks()
-
         # Draw combat text animation if active
-        if self.combat_text_active and self.combat_text_alpha > 0 and self.combat_text_scale > 0:
+        combat_text = self.combat_text_tween
+        if combat_text.active and combat_text.alpha > 0 and combat_text.scale > 0:
             lines = self.combat_text_message.split('\n')
             
             scaled_surfaces = []
             for line in lines:
-                original_line_surface = self.combat_text_font.render(line, True, self.WHITE)
+                original_line_surface = SURF_BATTLE.add(self.combat_text_font.render(line, True, self.WHITE))
                 
-                scaled_line_width = int(original_line_surface.get_width() * self.combat_text_scale)
-                scaled_line_height = int(original_line_surface.get_height() * self.combat_text_scale)
+                scaled_line_width = int(original_line_surface.get_width() * combat_text.scale)
+                scaled_line_height = int(original_line_surface.get_height() * combat_text.scale)
                 scaled_line_width = max(1, scaled_line_width)
                 scaled_line_height = max(1, scaled_line_height)
                 
-                scaled_line_surface = pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height))
-                scaled_line_surface.set_alpha(self.combat_text_alpha)
+                scaled_line_surface = SURF_BATTLE.add(pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height)))
+                scaled_line_surface.set_alpha(combat_text.alpha)
                 scaled_surfaces.append(scaled_line_surface)
 
             scaled_total_height = sum(s.get_height() for s in scaled_surfaces)
@@ -324,22 +442,7 @@ class BattleManager:
                 current_y += s_surface.get_height()
         
         # Draw damage text feedback
-        text_fade_duration = 1000 # Damage text fades out over 1 second
-        text_float_speed = 0.05 # Pixels per millisecond
-
-        for text_info in self.damage_display_list:
-            elapsed_time = current_time - text_info['start_time']
-            if elapsed_time < text_fade_duration:
-                alpha = int(255 * (1 - (elapsed_time / text_fade_duration)))
-                alpha = max(0, alpha)
-
-                float_offset_y = elapsed_time * text_float_speed
-
-                text_surface = self.damage_text_font.render(str(text_info['value']), True, text_info['color'])
-                text_surface.set_alpha(alpha)
-
-                text_rect = text_surface.get_rect(center=(text_info['pos'][0], text_info['pos'][1] - float_offset_y))
-                screen.blit(text_surface, text_rect)
+        self.floating_texts.draw(screen, OWNER_BATTLE)
 
     # Apply shake offset to relevant UI elements for drawing
     def get_shaken_rects(self):
@@ -348,11 +451,11 @@ class BattleManager:
         { 'deck_rect': (dx, dy), 'health_rect': (dx, dy) }
         """
         offsets = {'deck_rect': (0,0), 'health_rect': (0,0)}
-        current_time = pygame.time.get_ticks()
 
-        if self.shake_target_rect_name == 'enemy_card':
-            offsets['deck_rect'] = self._shake_rect_offset(self.game_room_ui.get_deck_rect(), current_time)
-        elif self.shake_target_rect_name == 'hero_health':
-            offsets['health_rect'] = self._shake_rect_offset(self.game_room_ui.get_health_rect(), current_time)
+        if self.shake_tween.active: # Stops by itself when the timeline retires the tween
+            if self.shake_tween.target == 'enemy_card':
+                offsets['deck_rect'] = self.shake_tween.offset()
+            elif self.shake_tween.target == 'hero_health':
+                offsets['health_rect'] = self.shake_tween.offset()
         
-        return offsets
\ No newline at end of file
+        return offsets
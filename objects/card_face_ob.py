@@ -0,0 +1,107 @@
+# objects/card_face_ob.py
+from collections import OrderedDict
+
+import pygame
+
+from objects.memory_ob import SURFACES, SUBSYSTEM_UI
+from objects.trace_ob import TRACE, TRACE_DEBUG
+
+# --- Trace Events ---
+EV_CARD_FACE_COMPOSED = TRACE.define("card_face.composed", TRACE_DEBUG, "Composed card face for {0} ({1} cached)")
+
+SURF_UI = SURFACES.subsystem(SUBSYSTEM_UI)
+
+
+def card_face_key(card):
+    """Everything that changes the static part of a face. Stats are drawn per frame, so they are not part of it."""
+    return (card.theme, card.card_type, card.name)
+
+
+class CardFaceCache:
+    """
+    LRU cache of composed card faces: the card front, name, "Type: ..." line and the three stat icons
+    flattened into one premultiplied surface per card definition. GameRoomUI blits the face and then
+    only overlays the numbers that change during a fight.
+    Faces are composed on the main thread (font rendering is not thread-safe); prefetch() is meant
+    to be called on frames where the next card's face is not cached yet.
+    """
+    def __init__(self, game_room_ui, capacity=24):
+        self.ui = game_room_ui
+        self.capacity = capacity
+        self._faces = OrderedDict() # key -> composed surface
+        self.hits = 0
+        self.misses = 0
+
+        # Everything a face covers; the stat icons stick out 2px on each side of the card
+        card_rect = pygame.Rect(self.ui.deck_x, self.ui.deck_y, 360, 480)
+        self.bounds = card_rect.unionall([self.ui.card_health_rect, self.ui.card_attack_rect, self.ui.card_defense_rect])
+
+    def get(self, card):
+        """Returns the composed face for `card`, composing (and possibly evicting the oldest) on a miss."""
+        key = card_face_key(card)
+        face = self._faces.get(key)
+        if face is not None:
+            self._faces.move_to_end(key)
+            self.hits += 1
+            return face
+        self.misses += 1
+        face = self._compose(card)
+        self._faces[key] = face
+        if len(self._faces) > self.capacity:
+            self._faces.popitem(last=False)
+        if EV_CARD_FACE_COMPOSED.on:
+            TRACE.emit(EV_CARD_FACE_COMPOSED, card.name, len(self._faces))
+        return face
+
+    def prefetch(self, card):
+        """Composes `card`'s face ahead of time. Returns True if it had to be composed."""
+        if card is None or card_face_key(card) in self._faces:
+            return False
+        self.get(card)
+        self.misses -= 1 # A prefetch is not a miss at draw time
+        return True
+
+    def blit(self, screen, card):
+        screen.blit(self.get(card), self.bounds.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def clear(self):
+        self._faces.clear()
+
+    def __len__(self):
+        return len(self._faces)
+
+    # --- Composition ---
+    def _compose(self, card):
+        """Draws the static layers in the same order draw_game_room used to, onto one premultiplied surface."""
+        ui = self.ui
+        face = SURF_UI.add(pygame.Surface(self.bounds.size, pygame.SRCALPHA))
+        origin_x, origin_y = self.bounds.topleft
+
+        def layer(surface, screen_pos):
+            # copy() first: sprites are atlas subsurfaces, and premul_alpha() ignores a subsurface's pitch
+            face.blit(SURF_UI.add(surface.copy()).premul_alpha(), (screen_pos[0] - origin_x, screen_pos[1] - origin_y),
+                      special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        def outline(color, screen_rect, width=0):
+            pygame.draw.rect(face, color, screen_rect.move(-origin_x, -origin_y), width)
+
+        drawn_card_rect = pygame.Rect(ui.deck_x, ui.deck_y, 360, 480)
+        if ui.drawn_card_front_sprite:
+            layer(ui.drawn_card_front_sprite, drawn_card_rect.topleft)
+        else:
+            outline(ui.NEON_CYAN, drawn_card_rect) # Drawn card is NEON_CYAN (fallback)
+
+        card_name_surface = SURF_UI.add(ui.card_text_font.render(f"{card.name}", True, ui.BLACK))
+        layer(card_name_surface, card_name_surface.get_rect(center=(ui.deck_x + 360 // 2, ui.deck_y + 290)).topleft)
+
+        card_type_surface = SURF_UI.add(ui.card_text_font.render(f"Type: {card.card_type.replace('_', ' ').title()}", True, ui.BLACK))
+        layer(card_type_surface, card_type_surface.get_rect(center=(ui.deck_x + 360 // 2, ui.deck_y + 320)).topleft)
+
+        for sprite, rect, fallback_color in ((ui.card_health_icon_sprite, ui.card_health_rect, ui.RED),
+                                             (ui.card_attack_icon_sprite, ui.card_attack_rect, ui.NEON_YELLOW),
+                                             (ui.card_defense_icon_sprite, ui.card_defense_rect, ui.NEON_YELLOW)):
+            if sprite:
+                layer(sprite, rect.topleft)
+            else:
+                outline(fallback_color, rect, 3)
+        return face
@@ -0,0 +1,219 @@
+# objects/catalog_ob.py
+import random
+import time
+
+try:
+    import numpy as np # Optional: only the vectorized batch path needs it
+except ImportError:
+    np = None
+
+from objects.deck_ob import Hero, Card, CARDS_CSV_PATH, _load_raw_card_data_from_csv
+from objects.trace_ob import TRACE, TRACE_DEBUG
+
+# --- Trace Events ---
+EV_CATALOG_LOADED = TRACE.define("catalog.loaded", TRACE_DEBUG, "Card catalog: {0} card definitions, {1} themes")
+EV_DECKS_GENERATED = TRACE.define("catalog.decks_generated", TRACE_DEBUG, "Generated {0} decks ({1})")
+
+EXIT_CARD_TYPE = "dungeon exit"
+EMPTY_SLOT = -1 # Padding after the end of a deck shorter than the widest one
+EXIT_JITTER = 3 # Exit goes at len // 2 + randint(-3, 3), as in setup_new_game
+
+
+class CardCatalog:
+    """
+    Every distinct card definition in cards.csv under a small integer id, plus each theme's deck
+    as a tuple of ids (with Quantity duplicates), so decks can be handled as rows of integers.
+    Themes are kept in sorted order; a theme index always means the same theme.
+    Built from `csv_file_path`, or from already parsed raw card tuples (`rows`) when given.
+    """
+    def __init__(self, csv_file_path=CARDS_CSV_PATH, rows=None):
+        self.definitions = [] # id -> raw card tuple (theme, type, hp, atk, def, cost, xp, inv, name)
+        self.exit_id = None
+        self.card_order = [] # Every non-exit card id in CSV order, with Quantity copies
+        theme_decks = {}
+        ids = {}
+        for card_tuple in (rows if rows is not None else _load_raw_card_data_from_csv(csv_file_path)):
+            card_id = ids.get(card_tuple)
+            if card_id is None:
+                card_id = ids[card_tuple] = len(self.definitions)
+                self.definitions.append(card_tuple)
+            if card_tuple[1] == EXIT_CARD_TYPE:
+                self.exit_id = card_id
+            else:
+                theme_decks.setdefault(card_tuple[0], []).append(card_id)
+                self.card_order.append(card_id)
+
+        self.themes = sorted(theme_decks)
+        self.theme_decks = [tuple(theme_decks[theme]) for theme in self.themes]
+        self.max_deck_size = max((len(deck) for deck in self.theme_decks), default=0) + (self.exit_id is not None)
+
+        # Per-id stat columns for batch resolvers (plain lists; see arrays() for NumPy)
+        self.card_types = [definition[1] for definition in self.definitions]
+        self.health = [definition[2] for definition in self.definitions]
+        self.attack = [definition[3] for definition in self.definitions]
+        self.defense = [definition[4] for definition in self.definitions]
+        self.xp_gain = [definition[6] for definition in self.definitions]
+        if EV_CATALOG_LOADED.on:
+            TRACE.emit(EV_CATALOG_LOADED, len(self.definitions), len(self.themes))
+
+    def __len__(self):
+        return len(self.definitions)
+
+    def card(self, card_id):
+        """A fresh Card for `card_id` (cards carry per-fight state, so they are never shared)."""
+        return Card(*self.definitions[card_id])
+
+    def arrays(self):
+        """The stat columns as NumPy arrays indexed by card id: {"health": ..., "attack": ..., ...}."""
+        _require_numpy()
+        return {
+            "health": np.array(self.health, dtype=np.int16),
+            "attack": np.array(self.attack, dtype=np.int16),
+            "defense": np.array(self.defense, dtype=np.int16),
+            "xp_gain": np.array(self.xp_gain, dtype=np.int16),
+            "is_exit": np.array([card_type == EXIT_CARD_TYPE for card_type in self.card_types]),
+        }
+
+
+class DeckBatch:
+    """
+    N decks as rows of card ids. `ids` is an N x catalog.max_deck_size matrix padded with EMPTY_SLOT
+    (a NumPy int16 array, or a list of lists from the pure-Python path); `themes`, `lengths` and
+    `exit_positions` hold the theme index, deck size and exit index (-1 for none) of every row.
+    """
+    def __init__(self, catalog, ids, themes, lengths, exit_positions, seed):
+        self.catalog = catalog
+        self.ids = ids
+        self.themes = themes
+        self.lengths = lengths
+        self.exit_positions = exit_positions
+        self.seed = seed
+
+    def __len__(self):
+        return len(self.themes)
+
+    def theme_name(self, row):
+        return self.catalog.themes[int(self.themes[row])]
+
+    def deck(self, row):
+        """Row `row` as the list of Card objects setup_new_game would have returned."""
+        return [self.catalog.card(int(card_id)) for card_id in self.ids[row][:int(self.lengths[row])]]
+
+
+def theme_for_seed(catalog, seed):
+    """The theme index setup_new_game(game_seed=seed) picks (the first RNG call of deck_for_seed), or None."""
+    if not catalog.themes:
+        return None
+    return catalog.themes.index(random.Random(seed).choice(catalog.themes))
+
+
+def deck_for_seed(catalog, seed):
+    """
+    The deck setup_new_game(game_seed=seed) deals, as (theme index, list of card ids, exit position),
+    without building Card objects. Makes the same RNG calls in the same order, so it must change
+    whenever setup_new_game's theme pick, shuffle or exit placement does.
+    """
+    rng = random.Random(seed)
+    if not catalog.themes:
+        return 0, [], -1
+    theme_index = catalog.themes.index(rng.choice(catalog.themes))
+    deck = list(catalog.theme_decks[theme_index])
+    exit_position = -1
+    if deck:
+        rng.shuffle(deck)
+        if catalog.exit_id is not None:
+            exit_position = max(0, min(len(deck) // 2 + rng.randint(-EXIT_JITTER, EXIT_JITTER), len(deck)))
+            deck.insert(exit_position, catalog.exit_id)
+    return theme_index, deck, exit_position
+
+
+def deal_session(catalog, game_seed=None):
+    """
+    setup_new_game() from a compiled catalog instead of the CSV: the same
+    (Hero, main deck, unlocked cards pool, game_seed) for the same seed, without touching the disk.
+    """
+    if game_seed is None:
+        game_seed = int(time.time() * 1000)
+    theme_index, card_ids, _ = deck_for_seed(catalog, game_seed)
+    main_deck = [catalog.card(card_id) for card_id in card_ids]
+    theme = catalog.themes[theme_index] if catalog.themes else None
+    definitions = catalog.definitions
+    unlocked_cards_pool = [catalog.card(card_id) for card_id in catalog.card_order if definitions[card_id][0] != theme]
+    return Hero(), main_deck, unlocked_cards_pool, game_seed
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for vectorized deck generation (pip install numpy)")
+
+
+def generate_decks(catalog, count, seed=None, vectorized=None):
+    """
+    Builds `count` shuffled decks at once: a random theme per row, the theme's cards in a random
+    order, and the exit inserted at len // 2 + randint(-3, 3) like setup_new_game.
+    Uses NumPy (one seeded Generator, one permutation call per theme) when it is installed and
+    `vectorized` is not False; otherwise a seeded random.Random per batch with the same distribution.
+    The two paths draw from different generators, so a seed gives different decks on each.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        batch = _generate_decks_numpy(catalog, count, seed)
+    else:
+        batch = _generate_decks_python(catalog, count, seed)
+    if EV_DECKS_GENERATED.on:
+        TRACE.emit(EV_DECKS_GENERATED, count, "numpy" if vectorized else "python")
+    return batch
+
+
+def _generate_decks_numpy(catalog, count, seed):
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    width = catalog.max_deck_size
+    ids = np.full((count, width), EMPTY_SLOT, dtype=np.int16)
+    lengths = np.zeros(count, dtype=np.int16)
+    exit_positions = np.full(count, -1, dtype=np.int16)
+    themes = rng.integers(0, len(catalog.themes), size=count).astype(np.int8) if catalog.themes else np.zeros(count, dtype=np.int8)
+
+    for theme_index, theme_deck in enumerate(catalog.theme_decks):
+        rows = np.flatnonzero(themes == theme_index)
+        if not rows.size or not theme_deck:
+            continue
+        size = len(theme_deck)
+        shuffled = rng.permuted(np.tile(np.asarray(theme_deck, dtype=np.int16), (rows.size, 1)), axis=1)
+        if catalog.exit_id is None:
+            ids[rows, :size] = shuffled
+            lengths[rows] = size
+            continue
+
+        positions = np.clip(size // 2 + rng.integers(-EXIT_JITTER, EXIT_JITTER + 1, size=rows.size), 0, size)
+        # Column c takes shuffled[c] before the exit and shuffled[c - 1] after it
+        columns = np.arange(size + 1)
+        source = columns - (columns > positions[:, None])
+        with_exit = np.take_along_axis(shuffled, np.minimum(source, size - 1), axis=1)
+        with_exit[columns == positions[:, None]] = catalog.exit_id
+        ids[rows, :size + 1] = with_exit
+        lengths[rows] = size + 1
+        exit_positions[rows] = positions
+    return DeckBatch(catalog, ids, themes, lengths, exit_positions, seed)
+
+
+def _generate_decks_python(catalog, count, seed):
+    rng = random.Random(seed)
+    width = catalog.max_deck_size
+    ids, themes, lengths, exit_positions = [], [], [], []
+    for _ in range(count):
+        theme_index = rng.randrange(len(catalog.themes)) if catalog.themes else 0
+        deck = list(catalog.theme_decks[theme_index]) if catalog.themes else []
+        exit_position = -1
+        if deck:
+            rng.shuffle(deck)
+            if catalog.exit_id is not None:
+                exit_position = max(0, min(len(deck) // 2 + rng.randint(-EXIT_JITTER, EXIT_JITTER), len(deck)))
+                deck.insert(exit_position, catalog.exit_id)
+        lengths.append(len(deck))
+        deck.extend([EMPTY_SLOT] * (width - len(deck)))
+        ids.append(deck)
+        themes.append(theme_index)
+        exit_positions.append(exit_position)
+    return DeckBatch(catalog, ids, themes, lengths, exit_positions, seed)
@@ -0,0 +1,144 @@
+# objects/catalog_watch_ob.py
+import hashlib
+import io
+import os
+import threading
+import time
+
+from objects.catalog_ob import CardCatalog, EXIT_CARD_TYPE
+from objects.deck_ob import CARDS_CSV_PATH, _read_raw_card_rows
+from objects.trace_ob import TRACE, TRACE_INFO, TRACE_WARNING
+
+# --- Trace Events ---
+EV_CATALOG_PUBLISHED = TRACE.define("catalog.published", TRACE_INFO, "Card catalog v{0} live ({1}, {2} cards, {3} themes); new sessions use it")
+EV_CATALOG_REJECTED = TRACE.define("catalog.rejected", TRACE_WARNING, "Ignoring changed {0}: {1}. Keeping catalog v{2}.")
+EV_CATALOG_WATCH_FAILED = TRACE.define("catalog.watch_failed", TRACE_WARNING, "Could not read {0}: {1}")
+
+CARD_TYPES = ("enemy", "equipment", "level up", EXIT_CARD_TYPE)
+
+
+class CatalogVersion:
+    """One compiled, validated state of the card data. Never changes once published."""
+    __slots__ = ("number", "digest", "catalog", "loaded_at")
+
+    def __init__(self, number, digest, catalog):
+        self.number = number
+        self.digest = digest # sha1 of the CSV bytes it was compiled from
+        self.catalog = catalog
+        self.loaded_at = time.time()
+
+
+def validate_catalog(catalog, rejected_rows=()):
+    """The reasons `catalog` can't go live (empty when it can)."""
+    problems = [f"row {row} could not be read" for row in rejected_rows[:5]]
+    if len(rejected_rows) > 5:
+        problems.append(f"{len(rejected_rows) - 5} more unreadable row(s)")
+    if catalog.exit_id is None:
+        problems.append("no dungeon exit card")
+    if not catalog.themes:
+        problems.append("no themed cards")
+    for theme, theme_deck in zip(catalog.themes, catalog.theme_decks):
+        if not any(catalog.card_types[card_id] == "enemy" for card_id in theme_deck):
+            problems.append(f"theme {theme} has no enemies")
+    for theme, card_type, health, attack, defense, _, xp_gain, inventory_boost, name in catalog.definitions:
+        if card_type not in CARD_TYPES:
+            problems.append(f"{name} has unknown type '{card_type}'")
+        if min(health, attack, defense, xp_gain, inventory_boost) < 0:
+            problems.append(f"{name} has a negative stat")
+        if card_type == "enemy" and health <= 0:
+            problems.append(f"enemy {name} has no health")
+    return problems
+
+
+def compile_catalog(data):
+    """Parses and validates CSV bytes. Returns (CardCatalog, problems)."""
+    rejected_rows = []
+    rows = _read_raw_card_rows(io.StringIO(data.decode("utf-8-sig"), newline=""), rejected_rows)
+    catalog = CardCatalog(rows=rows)
+    return catalog, validate_catalog(catalog, rejected_rows)
+
+
+class CatalogVersions:
+    """
+    The live card catalog plus its version number. `current` is replaced by one attribute
+    assignment, so a reader on any thread sees either the old version or the new one, whole.
+    Sessions keep the version they were dealt from until they end; only new sessions see a swap.
+    """
+    def __init__(self, csv_file_path=CARDS_CSV_PATH):
+        self.csv_file_path = csv_file_path
+        self.current = None
+        self._lock = threading.Lock() # Serializes publishers; readers never take it
+        self.reload()
+
+    def reload(self):
+        """Reads, compiles and validates the CSV; publishes it if valid and changed. Returns the live version."""
+        try:
+            with open(self.csv_file_path, "rb") as csv_file:
+                data = csv_file.read()
+        except OSError as e:
+            if EV_CATALOG_WATCH_FAILED.on:
+                TRACE.emit(EV_CATALOG_WATCH_FAILED, self.csv_file_path, e)
+            return self._publish_fallback()
+        digest = hashlib.sha1(data).hexdigest()
+        if self.current is not None and digest == self.current.digest:
+            return self.current
+        catalog, problems = compile_catalog(data)
+        if problems and self.current is not None:
+            if EV_CATALOG_REJECTED.on:
+                TRACE.emit(EV_CATALOG_REJECTED, self.csv_file_path, "; ".join(problems), self.current.number)
+            return self.current
+        # The first version goes live even with problems: the game ran on such data before
+        return self.publish(catalog, digest)
+
+    def _publish_fallback(self):
+        if self.current is None:
+            return self.publish(CardCatalog(rows=[]), None)
+        return self.current
+
+    def publish(self, catalog, digest):
+        with self._lock:
+            number = self.current.number + 1 if self.current is not None else 1
+            self.current = CatalogVersion(number, digest, catalog)
+        if EV_CATALOG_PUBLISHED.on:
+            TRACE.emit(EV_CATALOG_PUBLISHED, number, os.path.basename(self.csv_file_path), len(catalog.definitions), len(catalog.themes))
+        return self.current
+
+
+class CatalogWatcher:
+    """
+    Polls the card CSV's size and mtime from a daemon thread and, once a change has settled
+    (the same stat twice in a row, so a half-written save is never read), reloads `versions`
+    on that thread. The game loop never parses, compiles or validates anything.
+    """
+    def __init__(self, versions, interval=1.0):
+        self.versions = versions
+        self.interval = interval
+        self._stop = threading.Event()
+        self._last_stat = self._stat()
+        self._thread = threading.Thread(target=self._run, name="catalog-watch", daemon=True)
+        self._thread.start()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.versions.csv_file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            stat = self._stat()
+            if stat is None or stat == self._last_stat:
+                pending = None
+                continue
+            if stat != pending:
+                pending = stat # Changed since the last poll; wait for it to settle
+                continue
+            self._last_stat = stat
+            pending = None
+            self.versions.reload()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
@@ -3,6 +3,37 @@ import pygame
 import random
 import csv # Import the csv module
 import time # Import time for seed generation
+import os
+
+from objects.equipment_ob import EquipmentStore
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_INFO, TRACE_WARNING, TRACE_ERROR
+
+# --- Card Data Location ---
+# Resolved relative to this file so the game (and the benchmarks) work from any checkout
+CARDS_CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cards.csv")
+
+# --- Trace Events ---
+EV_CSV_LOAD_START = TRACE.define("deck.csv_load_start", TRACE_INFO, "Attempting to load CSV from: {0}")
+EV_CSV_HEADERS = TRACE.define("deck.csv_headers", TRACE_DEBUG, "CSV Headers: {0}")
+EV_CSV_EMPTY_ROW = TRACE.define("deck.csv_empty_row", TRACE_WARNING, "Warning: Skipping empty or malformed row {0}. Content: {1}")
+EV_CSV_MISSING_FIELDS = TRACE.define("deck.csv_missing_fields", TRACE_WARNING, "Warning: Skipping row {0} due to empty Theme, Type, or Name (after stripping): {1}")
+EV_CSV_BAD_NUMBER = TRACE.define("deck.csv_bad_number", TRACE_WARNING, "Warning: Could not parse numeric value for row {0}: {1}. Error: {2}. Skipping this card entry.")
+EV_CSV_MISSING_COLUMN = TRACE.define("deck.csv_missing_column", TRACE_WARNING, "Warning: Missing expected column '{0}' in row {1}: {2}. Please check CSV headers. Skipping this card entry.")
+EV_CSV_ROW_ERROR = TRACE.define("deck.csv_row_error", TRACE_ERROR, "An unexpected error occurred while processing row {0}: {1}. Error: {2}. Skipping this card entry.")
+EV_CSV_NOT_FOUND = TRACE.define("deck.csv_not_found", TRACE_ERROR, "Error: CSV file not found at {0}. No cards loaded.")
+EV_CSV_READ_ERROR = TRACE.define("deck.csv_read_error", TRACE_ERROR, "An unexpected error occurred while opening/reading CSV: {0}. No cards loaded.")
+EV_CSV_LOADED = TRACE.define("deck.csv_loaded", TRACE_INFO, "Successfully loaded {0} raw card entries from CSV.")
+EV_GAME_SEED = TRACE.define("deck.game_seed", TRACE_INFO, "New game started with seed: {0}")
+EV_DECK_RAW_COUNT = TRACE.define("deck.raw_count", TRACE_DEBUG, "The deck currently contains {0} amount of cards based on the CSV data.")
+EV_DECK_THEMING_COUNT = TRACE.define("deck.theming_count", TRACE_DEBUG, "Found {0} non-Dungeon Exit cards for theme selection.")
+EV_DECK_THEME = TRACE.define("deck.theme_selected", TRACE_INFO, "Randomly selected dungeon theme: {0}")
+EV_DECK_NO_THEMES = TRACE.define("deck.no_themes", TRACE_WARNING, "No themes found to select from, or no non-Dungeon Exit cards available in CSV.")
+EV_DECK_POPULATED = TRACE.define("deck.populated", TRACE_DEBUG, "Main deck populated with {0} cards for theme '{1}'.")
+EV_DECK_UNLOCKED_POOL = TRACE.define("deck.unlocked_pool", TRACE_DEBUG, "Unlocked cards pool populated with {0} cards from other themes.")
+EV_DECK_SHUFFLED = TRACE.define("deck.shuffled", TRACE_DEBUG, "Main deck shuffled. Current size: {0}")
+EV_DECK_EXIT_INSERTED = TRACE.define("deck.exit_inserted", TRACE_INFO, "Dungeon Exit card inserted at position {0}. New deck size: {1}")
+EV_DECK_NO_EXIT = TRACE.define("deck.no_exit", TRACE_WARNING, "Warning: Dungeon Exit card not found in CSV or could not be created. Game might not have an exit.")
+EV_DECK_EMPTY = TRACE.define("deck.empty", TRACE_WARNING, "Main deck is empty after theme selection and card generation.")
 
 # --- Hero and Card Classes ---
 class Hero:
@@ -12,8 +43,9 @@ class Hero:
         self.attack = 1
         self.defense = 0 # Now functions as temporary HP
         self.equipment_slots = 3
-        self.current_equipment = [] # List of equipped items
+        self.current_equipment = EquipmentStore() # Equipped items, grouped per category in FIFO order
         self.experience = 0
+        self.experience_spent = 0 # XP paid for level-ups; experience + experience_spent is all XP earned
         self.max_health = 5 # For level up tracking
         self.min_attack = 1 # For equipment and level up tracking
         self.min_defense = 0 # For equipment and level up tracking
@@ -44,83 +76,113 @@ def _load_raw_card_data_from_csv(file_path):
     matching the (theme, type, hp, atk, def, cost, xp_gain, inv_boost, name) format.
     Handles 'Quantity' to duplicate entries and cleans/converts data types.
     """
-    raw_card_data = [] # This will conceptually replace your starter_cards_data
-    
-    print(f"Attempting to load CSV from: {file_path}")
+    if EV_CSV_LOAD_START.on:
+        TRACE.emit(EV_CSV_LOAD_START, file_path)
     
     try:
         with open(file_path, mode='r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            print(f"CSV Headers: {reader.fieldnames}") 
-            
-            row_count = 0
-            for row in reader:
-                row_count += 1
-                
-                if row is None or not row:
-                    print(f"Warning: Skipping empty or malformed row {row_count}. Content: {row}")
-                    continue
-                    
-                try:
-                    theme = row.get('Theme', '').strip()
-                    card_type = row.get('Type', '').strip().lower()
-                    name = row.get('Name', '').strip()
-
-                    health = int(row.get('Health', '0').strip().replace('-', '0'))
-                    attack = int(row.get('Attack', '0').strip().replace('-', '0'))
-                    defense = int(row.get('Defense', '0').strip().replace('-', '0'))
-                    
-                    cost = 0 
-                    
-                    xp_str = row.get('XP', '0').strip().replace('XP', '').replace('-', '0')
-                    xp_gain = int(xp_str)
-                    
-                    inventory_boost = int(row.get('Inventory', '0').strip().replace('-', '0'))
-                    quantity = int(row.get('Quantity', '1').strip())
-
-                    if theme and card_type and name:
-                        for _ in range(quantity):
-                            raw_card_data.append((theme, card_type, health, attack, defense, cost, xp_gain, inventory_boost, name))
-                    else:
-                        print(f"Warning: Skipping row {row_count} due to empty Theme, Type, or Name (after stripping): {row}")
-                
-                except ValueError as e:
-                    print(f"Warning: Could not parse numeric value for row {row_count}: {row}. Error: {e}. Skipping this card entry.")
-                except KeyError as e:
-                    print(f"Warning: Missing expected column '{e}' in row {row_count}: {row}. Please check CSV headers. Skipping this card entry.")
-                except Exception as e:
-                    print(f"An unexpected error occurred while processing row {row_count}: {row}. Error: {e}. Skipping this card entry.")
+            raw_card_data = _read_raw_card_rows(csvfile)
                     
     except FileNotFoundError:
-        print(f"Error: CSV file not found at {file_path}. No cards loaded.")
+        if EV_CSV_NOT_FOUND.on:
+            TRACE.emit(EV_CSV_NOT_FOUND, file_path)
         return []
     except Exception as e:
-        print(f"An unexpected error occurred while opening/reading CSV: {e}. No cards loaded.")
+        if EV_CSV_READ_ERROR.on:
+            TRACE.emit(EV_CSV_READ_ERROR, e)
         return []
 
-    print(f"Successfully loaded {len(raw_card_data)} raw card entries from CSV.")
+    if EV_CSV_LOADED.on:
+        TRACE.emit(EV_CSV_LOADED, len(raw_card_data))
     return raw_card_data
 
 
-def setup_new_game():
+def _read_raw_card_rows(csvfile, rejected_rows=None):
+    """
+    Parses card rows from an open CSV file (or any iterable of CSV lines) into raw card tuples.
+    The numbers of rows that could not be used are appended to `rejected_rows` if it is given.
+    """
+    raw_card_data = [] # This will conceptually replace your starter_cards_data
+    reader = csv.DictReader(csvfile)
+    if EV_CSV_HEADERS.on:
+        TRACE.emit(EV_CSV_HEADERS, reader.fieldnames)
+    
+    row_count = 0
+    for row in reader:
+        row_count += 1
+        
+        if row is None or not row:
+            if EV_CSV_EMPTY_ROW.on:
+                TRACE.emit(EV_CSV_EMPTY_ROW, row_count, row)
+            continue
+            
+        try:
+            theme = row.get('Theme', '').strip()
+            card_type = row.get('Type', '').strip().lower()
+            name = row.get('Name', '').strip()
+
+            health = int(row.get('Health', '0').strip().replace('-', '0'))
+            attack = int(row.get('Attack', '0').strip().replace('-', '0'))
+            defense = int(row.get('Defense', '0').strip().replace('-', '0'))
+            
+            cost = 0 
+            
+            xp_str = row.get('XP', '0').strip().replace('XP', '').replace('-', '0')
+            xp_gain = int(xp_str)
+            
+            inventory_boost = int(row.get('Inventory', '0').strip().replace('-', '0'))
+            quantity = int(row.get('Quantity', '1').strip())
+
+            if theme and card_type and name:
+                for _ in range(quantity):
+                    raw_card_data.append((theme, card_type, health, attack, defense, cost, xp_gain, inventory_boost, name))
+            else:
+                if rejected_rows is not None:
+                    rejected_rows.append(row_count)
+                if EV_CSV_MISSING_FIELDS.on:
+                    TRACE.emit(EV_CSV_MISSING_FIELDS, row_count, row)
+        
+        except ValueError as e:
+            if rejected_rows is not None:
+                rejected_rows.append(row_count)
+            if EV_CSV_BAD_NUMBER.on:
+                TRACE.emit(EV_CSV_BAD_NUMBER, row_count, row, e)
+        except KeyError as e:
+            if rejected_rows is not None:
+                rejected_rows.append(row_count)
+            if EV_CSV_MISSING_COLUMN.on:
+                TRACE.emit(EV_CSV_MISSING_COLUMN, e, row_count, row)
+        except Exception as e:
+            if rejected_rows is not None:
+                rejected_rows.append(row_count)
+            if EV_CSV_ROW_ERROR.on:
+                TRACE.emit(EV_CSV_ROW_ERROR, row_count, row, e)
+    return raw_card_data
+
+
+def setup_new_game(csv_file_path=CARDS_CSV_PATH, game_seed=None):
     """Initializes a new game session, including hero, main deck, and unlocked card pool.
+    Uses its own Random(game_seed), so it can run on a worker thread without touching the global RNG;
+    the same seed gives the same deck as seeding the global RNG did.
     Returns: Tuple (Hero object, main_deck list, unlocked_cards_pool list, game_seed)
     """
-    game_seed = int(time.time() * 1000)
-    random.seed(game_seed)
-    print(f"New game started with seed: {game_seed}")
+    if game_seed is None:
+        game_seed = int(time.time() * 1000)
+    rng = random.Random(game_seed)
+    if EV_GAME_SEED.on:
+        TRACE.emit(EV_GAME_SEED, game_seed)
 
     hero_instance = Hero()
 
-    csv_file_path = "/home/mat_dev/boot.dev/projects/github.com/matomatocuztheres2/delver_project/data/cards.csv"
-
     all_raw_card_data = _load_raw_card_data_from_csv(csv_file_path)
 
-    print(f"The deck currently contains {len(all_raw_card_data)} amount of cards based on the CSV data.")
+    if EV_DECK_RAW_COUNT.on:
+        TRACE.emit(EV_DECK_RAW_COUNT, len(all_raw_card_data))
 
     main_deck_list = []
     unlocked_cards_pool_list = []
     dungeon_exit_card = None
+    selected_theme = None
 
     # Separate Dungeon Exit and other cards, and also separate by selected theme
     cards_for_theming = []
@@ -130,16 +192,19 @@ def setup_new_game():
         else:
             cards_for_theming.append(card_tuple)
     
-    print(f"Found {len(cards_for_theming)} non-Dungeon Exit cards for theme selection.")
+    if EV_DECK_THEMING_COUNT.on:
+        TRACE.emit(EV_DECK_THEMING_COUNT, len(cards_for_theming))
     
     # --- Theme Selection and Deck Generation ---
     # Theme is at index 0 in the tuple, ensure card_tuple has at least one element
-    themes = list(set(card[0] for card in cards_for_theming if len(card) > 0))
+    # Sorted so a seed picks the same theme in every process (set order depends on string hashing)
+    themes = sorted(set(card[0] for card in cards_for_theming if len(card) > 0))
     
     if themes:
         # Revert to random selection
-        selected_theme = random.choice(themes)
-        print(f"Randomly selected dungeon theme: {selected_theme}") # Updated print statement
+        selected_theme = rng.choice(themes)
+        if EV_DECK_THEME.on:
+            TRACE.emit(EV_DECK_THEME, selected_theme)
         
         # Populate the main_deck_list with Card objects for the selected theme
         for card_tuple in cards_for_theming:
@@ -148,25 +213,32 @@ def setup_new_game():
             elif len(card_tuple) > 0 and card_tuple[0] != selected_theme:
                 unlocked_cards_pool_list.append(Card(*card_tuple))
     else:
-        print("No themes found to select from, or no non-Dungeon Exit cards available in CSV.")
+        if EV_DECK_NO_THEMES.on:
+            TRACE.emit(EV_DECK_NO_THEMES)
 
-    print(f"Main deck populated with {len(main_deck_list)} cards for theme '{selected_theme}'.")
-    print(f"Unlocked cards pool populated with {len(unlocked_cards_pool_list)} cards from other themes.")
+    if EV_DECK_POPULATED.on:
+        TRACE.emit(EV_DECK_POPULATED, len(main_deck_list), selected_theme)
+    if EV_DECK_UNLOCKED_POOL.on:
+        TRACE.emit(EV_DECK_UNLOCKED_POOL, len(unlocked_cards_pool_list))
     
     # Shuffle the main deck BEFORE inserting the dungeon exit
     if main_deck_list:
-        random.shuffle(main_deck_list)
-        print(f"Main deck shuffled. Current size: {len(main_deck_list)}")
+        rng.shuffle(main_deck_list)
+        if EV_DECK_SHUFFLED.on:
+            TRACE.emit(EV_DECK_SHUFFLED, len(main_deck_list))
 
         # Add the dungeon exit card (if it was found in the CSV)
         if dungeon_exit_card:
-            exit_position = len(main_deck_list) // 2 + random.randint(-3, 3)
+            exit_position = len(main_deck_list) // 2 + rng.randint(-3, 3)
             exit_position = max(0, min(exit_position, len(main_deck_list)))
             main_deck_list.insert(exit_position, dungeon_exit_card)
-            print(f"Dungeon Exit card inserted at position {exit_position}. New deck size: {len(main_deck_list)}")
+            if EV_DECK_EXIT_INSERTED.on:
+                TRACE.emit(EV_DECK_EXIT_INSERTED, exit_position, len(main_deck_list))
         else:
-            print("Warning: Dungeon Exit card not found in CSV or could not be created. Game might not have an exit.")
+            if EV_DECK_NO_EXIT.on:
+                TRACE.emit(EV_DECK_NO_EXIT)
     else:
-        print("Main deck is empty after theme selection and card generation.")
+        if EV_DECK_EMPTY.on:
+            TRACE.emit(EV_DECK_EMPTY)
 
     return hero_instance, main_deck_list, unlocked_cards_pool_list, game_seed
\ No newline at end of file
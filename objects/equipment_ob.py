@@ -0,0 +1,104 @@
+# objects/equipment_ob.py
+from collections import deque
+
+# --- Equipment Categories ---
+EQUIPMENT_WEAPON = "weapon" # Equipment with attack and no defense, breaks when attack wears down
+EQUIPMENT_ARMOR = "armor"   # Equipment with defense and no attack, breaks when defense wears down
+EQUIPMENT_MIXED = "mixed"   # Attack and defense (e.g. Bear Form), never picked for breaking
+EQUIPMENT_BAG = "bag"       # Inventory boost only
+EQUIPMENT_OTHER = "other"   # Anything else that ends up in a slot (never breaks)
+
+EQUIPMENT_CATEGORIES = (EQUIPMENT_WEAPON, EQUIPMENT_ARMOR, EQUIPMENT_MIXED, EQUIPMENT_BAG, EQUIPMENT_OTHER)
+
+
+def equipment_category(card):
+    """
+    Returns the equipment category a card belongs to. Weapon and armor use the original break
+    rule: an "equipment" card with attack and no defense breaks as a weapon, one with defense and
+    no attack as armor; anything else is never picked for breaking.
+    """
+    if card.card_type != "equipment":
+        return EQUIPMENT_OTHER
+    if card.attack > 0 and card.defense == 0:
+        return EQUIPMENT_WEAPON
+    if card.defense > 0 and card.attack == 0:
+        return EQUIPMENT_ARMOR
+    if card.attack > 0 and card.defense > 0:
+        return EQUIPMENT_MIXED
+    if card.inventory_boost > 0:
+        return EQUIPMENT_BAG
+    return EQUIPMENT_OTHER
+
+
+class EquipmentStore:
+    """
+    Holds the hero's equipped cards.
+    Every card gets a sequence number when it is added. The store keeps one FIFO
+    queue of sequence numbers per category, so finding or removing the oldest
+    weapon/armor is O(1), and an insertion-ordered dict so drawing still walks the
+    items in the order they were equipped. `weapon_attacks` and `armor_defenses` are
+    the breakable stats in breaking order, kept up to date on add and pop so a fight
+    key can use them as they are.
+    """
+    def __init__(self):
+        self._items = {} # sequence number -> card (insertion ordered)
+        self._queues = {category: deque() for category in EQUIPMENT_CATEGORIES}
+        self._next_seq = 0
+        self.weapon_attacks = () # Attack of each weapon, oldest (next to break) first
+        self.armor_defenses = () # Defense of each armor, oldest first
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def add(self, card):
+        """Equips a card at the back of its category queue. Returns the category."""
+        category = equipment_category(card)
+        seq = self._next_seq
+        self._next_seq += 1
+
+        self._items[seq] = card
+        self._queues[category].append(seq)
+        if category == EQUIPMENT_WEAPON:
+            self.weapon_attacks += (card.attack,)
+        elif category == EQUIPMENT_ARMOR:
+            self.armor_defenses += (card.defense,)
+        return category
+
+    def oldest(self, category):
+        """Returns the oldest card of the category without removing it, or None."""
+        queue = self._queues[category]
+        if not queue:
+            return None
+        return self._items[queue[0]]
+
+    def pop_oldest(self, category):
+        """Removes and returns the oldest card of the category, or None if there is none."""
+        queue = self._queues[category]
+        if not queue:
+            return None
+        if category == EQUIPMENT_WEAPON:
+            self.weapon_attacks = self.weapon_attacks[1:]
+        elif category == EQUIPMENT_ARMOR:
+            self.armor_defenses = self.armor_defenses[1:]
+        return self._items.pop(queue.popleft())
+
+    def queued(self, category):
+        """The category's cards, oldest (next to break) first."""
+        return [self._items[seq] for seq in self._queues[category]]
+
+    def count(self, category):
+        """Number of equipped cards in a category."""
+        return len(self._queues[category])
+
+    def clear(self):
+        self._items.clear()
+        for queue in self._queues.values():
+            queue.clear()
+        self.weapon_attacks = ()
+        self.armor_defenses = ()
@@ -0,0 +1,285 @@
+# objects/game_room_ob.py
+import pygame
+
+from objects.atlas_ob import SpriteAtlas
+from objects.card_face_ob import CardFaceCache, SURF_UI
+
+# --- UI Sprite Paths ---
+BACKGROUND_SPRITE_PATH = './sprites/background.png'
+CARD_BACK_SPRITE_PATH = './sprites/delver_cardback.png'
+CARD_FRONT_SPRITE_PATH = './sprites/delver_cardfront.png'
+HEALTH_ICON_PATH = './sprites/health_icon.png'
+ATTACK_ICON_PATH = './sprites/attack_icon.png'
+DEFENSE_ICON_PATH = './sprites/defense_icon.png'
+
+
+def build_ui_atlas(stat_size=144, card_stat_size=120, card_size=(360, 480)):
+    """
+    Packs the background, card back/front and both sizes of the stat icons into one SpriteAtlas.
+    Needs a display mode set (the pages are converted to the screen format).
+    """
+    atlas = SpriteAtlas()
+    atlas.add("background", BACKGROUND_SPRITE_PATH, alpha=False)
+    atlas.add("card_back", CARD_BACK_SPRITE_PATH, card_size)
+    atlas.add("card_front", CARD_FRONT_SPRITE_PATH, card_size)
+    for name, path in (("health", HEALTH_ICON_PATH), ("attack", ATTACK_ICON_PATH), ("defense", DEFENSE_ICON_PATH)):
+        atlas.add(f"{name}_icon", path, (stat_size, stat_size))
+        atlas.add(f"card_{name}_icon", path, (card_stat_size, card_stat_size))
+    return atlas.build()
+
+
+# --- Game Room UI Class (Your Original Version) ---
+class GameRoomUI:
+    """Manages the drawing of elements within the GAME_ROOM state."""
+    def __init__(self, screen_width, screen_height, atlas=None):
+        self.WIDTH = screen_width
+        self.HEIGHT = screen_height
+
+        self.GRAY = (50, 50, 50)
+        self.WHITE = (255, 255, 255)
+        self.BLACK = (0, 0, 0)
+        self.NEON_BLUE = (0, 255, 255)
+        self.NEON_YELLOW = (255, 255, 0)
+        self.NEON_CYAN = (0, 255, 255) # Same as NEON_BLUE but used to differentiate placeholder
+        self.RED = (255, 0, 0) # For enemy health
+        self.GREEN = (0, 200, 0) # Added for inventory items (from previous suggestion)
+        self.DARK_GRAY = (30, 30, 30) # Added for empty inventory slots (from previous suggestion)
+
+        # Fonts for game room UI
+        self.stat_font = pygame.font.SysFont("Arial Black", 30)
+        self.card_text_font = pygame.font.SysFont("Arial", 25)
+
+        # Pre-calculate positions for static elements
+        self.deck_x = (self.WIDTH - 360) // 2
+        self.deck_y = 40 # 40px from top
+        self.deck_rect = pygame.Rect(self.deck_x, self.deck_y, 360, 480)
+
+        self.stat_width = 144
+        self.stat_height = 144
+        self.padding = 12
+
+        # Player stats positioning
+        self.health_x = self.padding
+        self.attack_x = self.padding + self.stat_width + self.padding
+        self.defense_x = self.padding + self.stat_width + self.padding + self.stat_width + self.padding
+        self.stat_y = self.HEIGHT - self.stat_height - self.padding # 10px from bottom
+
+        self.health_rect = pygame.Rect(self.health_x, self.stat_y, self.stat_width, self.stat_height)
+        self.attack_rect = pygame.Rect(self.attack_x, self.stat_y, self.stat_width, self.stat_height)
+        self.defense_rect = pygame.Rect(self.defense_x, self.stat_y, self.stat_width, self.stat_height)
+
+        # Card stat placeholder dimensions
+        self.enemy_stat_size = 120
+        self.enemy_stat_padding = 2 
+
+        # Calculate Card stat positions (relative to the drawn card)
+        self.enemy_stat_y = self.deck_y + self.deck_rect.height - self.enemy_stat_size - self.padding
+        
+        # Calculate x positions for card stats to be evenly distributed within the card width
+        total_enemy_stat_width = (self.enemy_stat_size * 3) + (self.enemy_stat_padding * 2)
+        start_x_for_enemy_stats = self.deck_x + (self.deck_rect.width - total_enemy_stat_width) // 2
+
+        self.enemy_health_x = start_x_for_enemy_stats
+        self.enemy_attack_x = start_x_for_enemy_stats + self.enemy_stat_size + self.enemy_stat_padding
+        self.enemy_defense_x = start_x_for_enemy_stats + (self.enemy_stat_size + self.enemy_stat_padding) * 2
+
+        self.card_health_rect = pygame.Rect(self.enemy_health_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
+        self.card_attack_rect = pygame.Rect(self.enemy_attack_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
+        self.card_defense_rect = pygame.Rect(self.enemy_defense_x, self.enemy_stat_y, self.enemy_stat_size, self.enemy_stat_size)
+
+        #--- Sprites (subsurfaces of the shared atlas; None falls back to placeholder rects) ---
+        self.atlas = atlas if atlas is not None else build_ui_atlas(self.stat_width, self.enemy_stat_size)
+        self.background_sprite = self.atlas.get("background")
+
+        #--- Card Back and Card Front Sprites ---
+        self.deck_card_back_sprite = self.atlas.get("card_back")
+        self.drawn_card_front_sprite = self.atlas.get("card_front")
+
+        # --- Player stat icons (144px) ---
+        self.health_icon_sprite = self.atlas.get("health_icon")
+        self.attack_icon_sprite = self.atlas.get("attack_icon")
+        self.defense_icon_sprite = self.atlas.get("defense_icon")
+
+        # --- Card stat icons (120px) ---
+        self.card_health_icon_sprite = self.atlas.get("card_health_icon")
+        self.card_attack_icon_sprite = self.atlas.get("card_attack_icon")
+        self.card_defense_icon_sprite = self.atlas.get("card_defense_icon")
+
+        #--- Inventory Icon management ---
+        self.icon_size = 60
+        self.icon_padding = 2 # Padding between icons
+
+        self.inventory_start_x = self.padding # Start from left edge, with padding
+        self.inventory_start_y = self.deck_y # Align with the top of the deck
+
+        self.xp_display_area_width = 100 # Approx. width needed for XP text
+        self.xp_display_area_height = 80 # Approx. height needed for two lines of text
+        self.xp_padding_right = 20 # Padding from the right edge of the screen
+
+        # Calculate the top-left corner of this conceptual area
+        self.xp_display_x = self.WIDTH - self.xp_display_area_width - self.xp_padding_right
+        self.xp_display_y = self.deck_y # Align with the top of the deck
+
+        #--- Card face cache (static part of each drawn card) and rendered stat numbers ---
+        self.card_faces = CardFaceCache(self)
+        self._stat_text_cache = {}
+
+
+    def draw_game_room(self, screen, hero_instance, deck_drawn_card): 
+        """Draws all game room elements to the screen."""
+        screen.fill(self.GRAY) # A distinct color for the game room
+        #Draw background to screen
+        if self.background_sprite: # Always check if the sprite was loaded successfully
+            screen.blit(self.background_sprite, (0, 0))
+
+        # --- Draw Deck Placeholder ---
+        if self.deck_card_back_sprite: # Check if the sprite was loaded
+            screen.blit(self.deck_card_back_sprite, self.deck_rect.topleft)
+        else:
+            pygame.draw.rect(screen, self.NEON_BLUE, self.deck_rect, 5)
+
+        # --- Draw Drawn Card Placeholder (if a card is drawn) ---
+        if deck_drawn_card:
+            drawn_card_x = self.deck_x # Same position as deck for now
+            drawn_card_y = self.deck_y
+
+            # Card front, name, type line and stat icons come pre-composed from the face cache
+            self.card_faces.blit(screen, deck_drawn_card)
+
+           # --- Draw Card Stat Numbers (the only part that changes during a fight) ---
+            if deck_drawn_card.card_type == "enemy" or "equipment" or "level up":
+                card_health_text_surface = self._stat_text(f"HP: {deck_drawn_card.current_health}")
+                card_health_text_rect = card_health_text_surface.get_rect(center=self.card_health_rect.center)
+                screen.blit(card_health_text_surface, card_health_text_rect)
+
+                card_attack_text_surface = self._stat_text(f"ATK: {deck_drawn_card.attack}")
+                card_attack_text_rect = card_attack_text_surface.get_rect(center=self.card_attack_rect.center)
+                screen.blit(card_attack_text_surface, card_attack_text_rect)
+
+                card_defense_text_surface = self._stat_text(f"DEF: {deck_drawn_card.current_defense}")
+                card_defense_text_rect = card_defense_text_surface.get_rect(center=self.card_defense_rect.center)
+                screen.blit(card_defense_text_surface, card_defense_text_rect)
+
+            else: # For Dungeon Exit
+                card_info_surface = SURF_UI.add(self.card_text_font.render(
+                    "No info has been added yet", True, self.BLACK
+                ))
+                card_info_rect = card_info_surface.get_rect(center=(drawn_card_x + 360 // 2, drawn_card_y + 480 // 2 + 20))
+                screen.blit(card_info_surface, card_info_rect)
+
+       # Health Placeholder
+        if self.health_icon_sprite: # Check if the sprite was loaded
+            screen.blit(self.health_icon_sprite, self.health_rect.topleft) # Draw sprite at rect's position
+        else: # Fallback to drawing the rectangle if sprite not loaded
+            pygame.draw.rect(screen, self.NEON_YELLOW, self.health_rect, 5) # Outline
+        health_text_surface = SURF_UI.add(self.stat_font.render(f"HP: {hero_instance.health}", True, self.WHITE))
+        health_text_rect = health_text_surface.get_rect(center=self.health_rect.center)
+        screen.blit(health_text_surface, health_text_rect)
+
+        # Attack Placeholder
+        if self.attack_icon_sprite: # Check if the sprite was loaded
+            screen.blit(self.attack_icon_sprite, self.attack_rect.topleft) # Draw sprite at rect's position
+        else: # Fallback to drawing the rectangle if sprite not loaded
+            pygame.draw.rect(screen, self.NEON_YELLOW, self.attack_rect, 5) # Outline
+        attack_text_surface = SURF_UI.add(self.stat_font.render(f"ATK: {hero_instance.attack}", True, self.WHITE))
+        attack_text_rect = attack_text_surface.get_rect(center=self.attack_rect.center)
+        screen.blit(attack_text_surface, attack_text_rect)
+
+        # Defense Placeholder
+        if self.defense_icon_sprite: # Check if the sprite was loaded
+            screen.blit(self.defense_icon_sprite, self.defense_rect.topleft) # Draw sprite at rect's position
+        else: # Fallback to drawing the rectangle if sprite not loaded
+            pygame.draw.rect(screen, self.NEON_YELLOW, self.defense_rect, 5) # Outline
+        defense_text_surface = SURF_UI.add(self.stat_font.render(f"DEF: {hero_instance.defense}", True, self.WHITE))
+        defense_text_rect = defense_text_surface.get_rect(center=self.defense_rect.center)
+        screen.blit(defense_text_surface, defense_text_rect)
+
+        # --- CALL THE INVENTORY ICON DRAWING ---
+        self.draw_inventory_icons(screen, hero_instance) 
+
+        #--- CALL XP DRAWING ---
+        self.draw_xp_display(screen, hero_instance)
+
+    def _stat_text(self, text):
+        """Rendered white stat text ("HP: 3"), cached since only a handful of values ever show up."""
+        surface = self._stat_text_cache.get(text)
+        if surface is None:
+            if len(self._stat_text_cache) >= 256:
+                self._stat_text_cache.clear()
+            surface = SURF_UI.add(self.stat_font.render(text, True, self.WHITE))
+            self._stat_text_cache[text] = surface
+        return surface
+
+    def prefetch_card_face(self, card):
+        """Composes the face of the next card to be drawn (call on frames with time to spare)."""
+        return self.card_faces.prefetch(card)
+
+    #--- Inventory icon function (this method is correct as is, but needed to be called) ---
+    def draw_inventory_icons(self, screen, hero_instance):
+        current_x = self.inventory_start_x
+        current_y = self.inventory_start_y
+
+        #Quick adjust, code it properly later
+        current_x = current_x - 12
+        
+        # Draw placeholder slots up to hero.equipment_slots
+        for i in range(hero_instance.equipment_slots):
+            slot_rect = SURF_UI.add_rect(pygame.Rect(current_x, current_y + (self.icon_size + self.icon_padding) * i, self.icon_size, self.icon_size))
+            pygame.draw.rect(screen, self.DARK_GRAY, slot_rect, 0) # Draw empty slot background
+            pygame.draw.rect(screen, self.GRAY, slot_rect, 1) # Draw slot border
+
+        # Draw actual equipped items
+        for i, item_card in enumerate(hero_instance.current_equipment):
+            # Calculate position for this item
+            item_x = self.inventory_start_x
+            item_y = self.inventory_start_y + (self.icon_size + self.icon_padding) * i
+            
+            #Quick adjust, code it properly later
+            item_x = item_x - 12
+
+            item_rect = SURF_UI.add_rect(pygame.Rect(item_x, item_y, self.icon_size, self.icon_size))
+
+            color = (0, 150, 0) if item_card.card_type == "equipment" else (150, 0, 150) # Example colors
+            
+            # Draw background square
+            pygame.draw.rect(screen, color, item_rect)
+            # Draw border
+            pygame.draw.rect(screen, self.WHITE, item_rect, 2) # White border for equipped item
+
+            text_surface = SURF_UI.add(self.card_text_font.render(item_card.name[0].upper(), True, self.BLACK)) # Just first letter
+            text_rect = text_surface.get_rect(center=item_rect.center)
+            screen.blit(text_surface, text_rect)
+    
+    def draw_xp_display(self, screen, hero_instance):
+        """Draws the hero's current XP as text on the screen, right-aligned."""
+        text_right_anchor_x = self.WIDTH - self.xp_padding_right # Use the screen width minus your right padding
+        #Quick fix, update properly later
+        text_right_anchor_x = text_right_anchor_x + 10
+
+        xp_label_surface = SURF_UI.add(self.stat_font.render("XP", True, self.WHITE))
+        xp_label_rect = xp_label_surface.get_rect(
+            topright=(text_right_anchor_x, self.xp_display_y + 10) # 10px down from top, right-aligned
+        ) 
+        screen.blit(xp_label_surface, xp_label_rect)
+
+        xp_value_surface = SURF_UI.add(self.stat_font.render(f"{hero_instance.experience}", True, self.WHITE))
+        xp_value_rect = xp_value_surface.get_rect(
+            topright=(text_right_anchor_x, self.xp_display_y + 40) 
+        ) 
+        screen.blit(xp_value_surface, xp_value_rect)
+
+
+    def get_deck_rect(self):
+        return self.deck_rect
+    def get_health_rect(self):
+        return self.health_rect
+    def get_attack_rect(self):
+        return self.attack_rect
+    def get_defense_rect(self):
+        return self.defense_rect
+    def get_card_health_rect(self):
+        return self.card_health_rect
+    def get_card_attack_rect(self):
+        return self.card_attack_rect
+    def get_card_defense_rect(self):
+        return self.card_defense_rect
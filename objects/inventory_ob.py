@@ -1,8 +1,96 @@
 import pygame
 import math
 
+from objects.memory_ob import SURFACES, SUBSYSTEM_INVENTORY
+from objects.metrics_ob import METRICS
+from objects.particle_ob import FloatingTextPool, OWNER_INVENTORY
+from objects.timeline_ob import Timeline, ZoomFadeTween
+from objects.trace_ob import TRACE, TRACE_INFO, TRACE_ERROR
+
+# --- Trace Events ---
+EV_INVENTORY_NO_EQUIPMENT = TRACE.define("inventory.no_equipment", TRACE_ERROR, "Error: No equipment to add.")
+EV_HERO_HEALED = TRACE.define("inventory.hero_healed", TRACE_INFO, "Hero healed {0}. Current HP: {1}")
+EV_POTION_SOLD = TRACE.define("inventory.potion_sold", TRACE_INFO, "Potion sold, gained {0} XP.")
+EV_POTION_SOLD_AT_MAX_HP = TRACE.define("inventory.potion_sold_at_max_hp", TRACE_INFO, "Hero already at max HP, gained {0} XP.")
+EV_BAG_ADDED = TRACE.define("inventory.bag_added", TRACE_INFO, "Added {0}. Inventory size: {1}/{2} (+{3} slots)")
+EV_EQUIPPED = TRACE.define("inventory.equipped", TRACE_INFO, "Equipped {0}.")
+EV_SOLD_NO_SLOTS = TRACE.define("inventory.sold_no_slots", TRACE_INFO, "No equipment slots. Sold {0}. Hero XP: {1}")
+
+# --- Equipment Outcomes (apply_equipment) ---
+EQUIP_NOTHING = "nothing"
+EQUIP_HEALED = "healed"
+EQUIP_HEALED_AND_SOLD = "healed_and_sold" # Healed to max; the rest of the potion was sold
+EQUIP_POTION_SOLD = "potion_sold" # Already at max health
+EQUIP_BAG = "bag"
+EQUIP_EQUIPPED = "equipped"
+EQUIP_SOLD = "sold" # No free slot
+
+# --- Metrics ---
+M_EQUIPMENT = METRICS.counter("dg_equipment_total", "Equipment cards applied in the game, by outcome", ("outcome",))
+M_XP_GAINED = METRICS.counter("dg_xp_gained_total", "XP gained in the game, by source", ("source",))
+M_XP_FROM_SALES = M_XP_GAINED.labels("sold")
+XP_SOLD_OUTCOMES = (EQUIP_HEALED_AND_SOLD, EQUIP_POTION_SOLD, EQUIP_SOLD)
+SURF_INVENTORY = SURFACES.subsystem(SUBSYSTEM_INVENTORY)
+
+
+# --- Equipment Rules (no drawing; InventoryManager adds the pop-ups, the simulation uses them headless) ---
+def apply_equipment(hero_instance, equipment_card):
+    """
+    Applies a drawn equipment card to the hero: heal (selling what is left over), add a bag,
+    equip into a free slot or sell it for XP.
+    Returns (outcome, amount): HP healed for EQUIP_HEALED*, XP for the sold outcomes, slots for EQUIP_BAG.
+    """
+    # If it's a POTION
+    if equipment_card.health > 0:
+        if hero_instance.health < hero_instance.max_health:
+            actual_heal_amount = min(equipment_card.health, hero_instance.max_health - hero_instance.health)
+            hero_instance.health += actual_heal_amount
+            if EV_HERO_HEALED.on:
+                TRACE.emit(EV_HERO_HEALED, actual_heal_amount, hero_instance.health)
+            
+            if actual_heal_amount < equipment_card.health or hero_instance.health == hero_instance.max_health:
+                hero_instance.experience += equipment_card.xp_gain # Flat XP for potion use/excess
+                if EV_POTION_SOLD.on:
+                    TRACE.emit(EV_POTION_SOLD, equipment_card.xp_gain)
+                return EQUIP_HEALED_AND_SOLD, actual_heal_amount
+            return EQUIP_HEALED, actual_heal_amount
+
+        else: # Hero is already at max health, potion is sold
+            hero_instance.experience += equipment_card.xp_gain # Flat XP for wasted heal
+            if EV_POTION_SOLD_AT_MAX_HP.on:
+                TRACE.emit(EV_POTION_SOLD_AT_MAX_HP, equipment_card.xp_gain)
+            return EQUIP_POTION_SOLD, equipment_card.xp_gain
+
+    # If it's EQUIPMENT (including bags)
+    elif equipment_card.card_type == "equipment":
+        # Check if it's a bag (inventory boost)
+        if equipment_card.inventory_boost > 0:
+            hero_instance.equipment_slots += equipment_card.inventory_boost 
+            if EV_BAG_ADDED.on:
+                TRACE.emit(EV_BAG_ADDED, equipment_card.name, len(hero_instance.current_equipment), hero_instance.equipment_slots, equipment_card.inventory_boost)
+            return EQUIP_BAG, equipment_card.inventory_boost
+        # Regular equipment (not a bag)
+        elif equipment_card.current_health == 0: #Put stuff in your inventory
+            # Attempt to equip if slots available
+            if len(hero_instance.current_equipment) < hero_instance.equipment_slots:
+                hero_instance.current_equipment.add(equipment_card) 
+                if EV_EQUIPPED.on:
+                    TRACE.emit(EV_EQUIPPED, equipment_card.name)
+                # Add all stats to hero
+                hero_instance.attack += equipment_card.attack
+                hero_instance.defense += equipment_card.current_defense
+                return EQUIP_EQUIPPED, 0
+            else:
+                # No slots, sell automatically
+                hero_instance.experience += equipment_card.xp_gain 
+                if EV_SOLD_NO_SLOTS.on:
+                    TRACE.emit(EV_SOLD_NO_SLOTS, equipment_card.name, hero_instance.experience)
+                return EQUIP_SOLD, equipment_card.xp_gain
+    return EQUIP_NOTHING, 0
+
+
 class InventoryManager: # CORRECTED TYPO HERE
-    def __init__(self, screen_width, screen_height, game_room_ui_instance):
+    def __init__(self, screen_width, screen_height, game_room_ui_instance, floating_texts=None, timeline=None):
         self.WIDTH = screen_width
         self.HEIGHT = screen_height
         self.game_room_ui = game_room_ui_instance 
@@ -19,18 +107,19 @@ class InventoryManager: # CORRECTED TYPO HERE
 
         # --- Main Pop-up State Variables (for "Treasure!", "Equipped!", "Sold!" etc.) ---
         self.buff_text_message = "" 
-        self.buff_text_start_time = 0
-        self.buff_text_alpha = 0     
-        self.buff_text_scale = 0.0   
-        self.buff_text_active = False
-        self.buff_text_display_duration = 2000 
+        self.buff_text_tween = ZoomFadeTween(2000) # Zoom in for half the duration, fade out for the other half
         self.buff_text_color = self.WHITE 
 
         # Current equipment state information
         self.current_equipment = None 
 
-        # Floating Buff Text Display List (for +HP, +ATK numbers)
-        self.buff_display_list = [] 
+        # Floating Buff Texts (for +HP, +ATK numbers), drawn from the pool shared with the other managers
+        self.floating_texts = floating_texts if floating_texts is not None else FloatingTextPool()
+
+        # Animation timeline (shared with the other managers in main.py, which ticks it once per frame)
+        self.timeline = timeline if timeline is not None else Timeline()
+        self._owns_timeline = timeline is None # A private timeline is ticked from update_popups
+        self.timeline.add_ticker(self.floating_texts)
 
     # --- Helper to trigger the main central pop-up ---
     def _trigger_main_inventory_popup(self, message, color=None, duration_ms=2000):
@@ -39,23 +128,12 @@ class InventoryManager: # CORRECTED TYPO HERE
         """
         self.buff_text_message = message
         self.buff_text_color = color if color is not None else self.WHITE
-        self.buff_text_start_time = pygame.time.get_ticks()
-        self.buff_text_alpha = 255
-        self.buff_text_scale = 0.1 
-        self.buff_text_active = True
-        self.buff_text_display_duration = duration_ms
+        self.timeline.play(self.buff_text_tween, duration_ms)
 
     # Your existing _display_buff_text (for floating numbers)
     def _display_buff_text(self, value, color, target_rect_center):
         """Adds a buff/healing text element to be displayed."""
-        pos_x = target_rect_center[0]
-        pos_y = target_rect_center[1] - 30 
-        self.buff_display_list.append({
-            'value': value,
-            'color': color,
-            'pos': (pos_x, pos_y),
-            'start_time': pygame.time.get_ticks()
-        })
+        self.floating_texts.spawn(OWNER_INVENTORY, self.floating_buff_font, value, color, target_rect_center, self.timeline.now)
     
     # Your existing start_inventory (now uses the new _trigger_main_inventory_popup helper)
     def start_inventory(self, equipment_card):
@@ -71,66 +149,34 @@ class InventoryManager: # CORRECTED TYPO HERE
         Returns the new sub_state.
         """
         if not self.current_equipment:
-            print("Error: No equipment to add.")
+            if EV_INVENTORY_NO_EQUIPMENT.on:
+                TRACE.emit(EV_INVENTORY_NO_EQUIPMENT)
             return "IDLE" 
-        
-        # Store original stats for printing later if needed
-        hero_health = hero_instance.health
-        hero_attack = hero_instance.attack
-        hero_defense = hero_instance.defense
-        hero_inventory = hero_instance.equipment_slots
-        hero_xp = hero_instance.experience
+
+        outcome, amount = apply_equipment(hero_instance, self.current_equipment)
+        M_EQUIPMENT.labels(outcome).inc()
+        if outcome in XP_SOLD_OUTCOMES:
+            M_XP_FROM_SALES.inc(self.current_equipment.xp_gain)
 
         # If it's a POTION
-        if self.current_equipment.health > 0:
-            if hero_instance.health < hero_instance.max_health:
-                actual_heal_amount = min(self.current_equipment.health, hero_instance.max_health - hero_instance.health)
-                hero_instance.health += actual_heal_amount
-                self._trigger_main_inventory_popup(f"Healed {actual_heal_amount} HP!", self.GREEN)
-                self._display_buff_text(str(actual_heal_amount), self.GREEN, self.game_room_ui.get_health_rect().center)
-                print(f"Hero healed {actual_heal_amount}. Current HP: {hero_instance.health}")
-                
-                if actual_heal_amount < self.current_equipment.health or hero_instance.health == hero_instance.max_health:
-                    hero_instance.experience += self.current_equipment.xp_gain # Flat XP for potion use/excess
-                    self._trigger_main_inventory_popup(f"Potion sold! +{self.current_equipment.xp_gain}XP", self.BLUE)
-                    self._display_buff_text(f"+{self.current_equipment.xp_gain}XP", self.BLUE, self.game_room_ui.get_deck_rect().center)
-                    print(f"Potion sold, gained {self.current_equipment.xp_gain} XP.")
-
-            else: # Hero is already at max health, potion is sold
-                hero_instance.experience += self.current_equipment.xp_gain # Flat XP for wasted heal
-                self._trigger_main_inventory_popup(f"Sold Potion!\n+{self.current_equipment.xp_gain}XP", self.RED, 1500)
-                self._display_buff_text(f"Sold Potion!\n+{self.current_equipment.xp_gain}XP", self.RED, self.game_room_ui.get_deck_rect().center)
-                print(f"Hero already at max HP, gained {self.current_equipment.xp_gain} XP.")
+        if outcome in (EQUIP_HEALED, EQUIP_HEALED_AND_SOLD):
+            self._trigger_main_inventory_popup(f"Healed {amount} HP!", self.GREEN)
+            self._display_buff_text(str(amount), self.GREEN, self.game_room_ui.get_health_rect().center)
+            if outcome == EQUIP_HEALED_AND_SOLD:
+                self._trigger_main_inventory_popup(f"Potion sold! +{self.current_equipment.xp_gain}XP", self.BLUE)
+                self._display_buff_text(f"+{self.current_equipment.xp_gain}XP", self.BLUE, self.game_room_ui.get_deck_rect().center)
+        elif outcome == EQUIP_POTION_SOLD: # Hero is already at max health, potion is sold
+            self._trigger_main_inventory_popup(f"Sold Potion!\n+{self.current_equipment.xp_gain}XP", self.RED, 1500)
+            self._display_buff_text(f"Sold Potion!\n+{self.current_equipment.xp_gain}XP", self.RED, self.game_room_ui.get_deck_rect().center)
 
         # If it's EQUIPMENT (including bags)
-        elif self.current_equipment.card_type == "equipment":
-            # Check if it's a bag (inventory boost)
-            if self.current_equipment.inventory_boost > 0:
-                hero_instance.equipment_slots += self.current_equipment.inventory_boost 
-                print(f"Added {self.current_equipment.name}. Inventory size: {len(hero_instance.current_equipment)}/{hero_instance.equipment_slots} (+{self.current_equipment.inventory_boost} slots)")
-                self._trigger_main_inventory_popup(f"Bag!\n+{self.current_equipment.inventory_boost} Slots", self.WHITE, 1500)
-            else: # Regular equipment (not a bag)
-                # If equipment is already equipped (clicked again to sell)
-                if self.current_equipment.card_type == "equipment" and self.current_equipment.inventory_boost == 0 and self.current_equipment.current_health == 0: #Put stuff in your inventory
-                    # Attempt to equip if slots available
-                    if len(hero_instance.current_equipment) < hero_instance.equipment_slots:
-                        hero_instance.current_equipment.append(self.current_equipment) 
-                        self._trigger_main_inventory_popup(f"Equipped {self.current_equipment.name}", self.GREEN, 2000)
-                        print(f"Equipped {self.current_equipment.name}.")
-                        # Add all stats to hero
-                        effective_attack_from_equipment = self.current_equipment.attack
-                        effective_defense_from_equipment = self.current_equipment.current_defense
-
-                        hero_instance.attack += effective_attack_from_equipment
-                        hero_instance.defense += effective_defense_from_equipment
-
-                    else:
-                        # No slots, sell automatically
-                        hero_instance.experience += self.current_equipment.xp_gain 
-                        self._trigger_main_inventory_popup(f"No space!\nSold {self.current_equipment.name}\n+{self.current_equipment.xp_gain}XP", self.BLUE)
-                        self._display_buff_text(f"+{self.current_equipment.xp_gain}XP", self.BLUE, self.game_room_ui.get_deck_rect().center)
-                        print(f"No equipment slots. Sold {self.current_equipment.name}. Hero XP: {hero_instance.experience}")
-        
+        elif outcome == EQUIP_BAG:
+            self._trigger_main_inventory_popup(f"Bag!\n+{self.current_equipment.inventory_boost} Slots", self.WHITE, 1500)
+        elif outcome == EQUIP_EQUIPPED:
+            self._trigger_main_inventory_popup(f"Equipped {self.current_equipment.name}", self.GREEN, 2000)
+        elif outcome == EQUIP_SOLD: # No slots, sold automatically
+            self._trigger_main_inventory_popup(f"No space!\nSold {self.current_equipment.name}\n+{self.current_equipment.xp_gain}XP", self.BLUE)
+            self._display_buff_text(f"+{self.current_equipment.xp_gain}XP", self.BLUE, self.game_room_ui.get_deck_rect().center)
 
         self.current_equipment = None # Clear the equipment after processing
         return "EQUIPMENT_ADDED" # This state signals that processing is complete
@@ -140,38 +186,10 @@ class InventoryManager: # CORRECTED TYPO HERE
         """
         Updates the animation state for both the main central pop-up
         and the floating buff texts. Call this every frame.
+        Both are advanced by the timeline; this only ticks it when the manager owns it.
         """
-        current_time = pygame.time.get_ticks()
-
-        # 1. Update Main Central Pop-up Animation
-        if self.buff_text_active:
-            elapsed_time = current_time - self.buff_text_start_time
-
-            if elapsed_time > self.buff_text_display_duration:
-                self.buff_text_active = False
-                self.buff_text_alpha = 0
-                self.buff_text_scale = 0.0
-            else:
-                zoom_duration = self.buff_text_display_duration * 0.5 
-                fade_duration = self.buff_text_display_duration * 0.5 
-
-                if elapsed_time < zoom_duration:
-                    progress = elapsed_time / zoom_duration
-                    self.buff_text_scale = 0.1 + (0.9 * progress) 
-                    self.buff_text_alpha = 255 
-                else:
-                    self.buff_text_scale = 1.0 
-                    fade_progress = (elapsed_time - zoom_duration) / fade_duration
-                    self.buff_text_alpha = int(255 * (1.0 - fade_progress))
-
-                self.buff_text_alpha = max(0, min(255, self.buff_text_alpha))
-                self.buff_text_scale = max(0.0, min(1.0, self.buff_text_scale))
-
-        # 2. Update Floating Buff Texts Animation
-        self.buff_display_list = [
-            text_info for text_info in self.buff_display_list
-            if current_time - text_info['start_time'] < 1000 
-        ]
+        if self._owns_timeline:
+            self.timeline.tick()
 
     # --- NEW METHOD: draw_popups (Draws both main and floating texts) ---
     def draw_popups(self, screen):
@@ -179,25 +197,24 @@ class InventoryManager: # CORRECTED TYPO HERE
         Draws the main central inventory pop-up and all active floating buff texts.
         Call this every frame.
         """
-        current_time = pygame.time.get_ticks()
-
         # 1. Draw Main Central Pop-up
-        if self.buff_text_active and self.buff_text_alpha > 0 and self.buff_text_scale > 0:
+        buff_text = self.buff_text_tween
+        if buff_text.active and buff_text.alpha > 0 and buff_text.scale > 0:
             lines = self.buff_text_message.split('\n')
             
             scaled_surfaces = []
             for line in lines:
-                original_line_surface = self.main_popup_font.render(line, True, self.buff_text_color)
+                original_line_surface = SURF_INVENTORY.add(self.main_popup_font.render(line, True, self.buff_text_color))
                 
-                scaled_line_width = int(original_line_surface.get_width() * self.buff_text_scale)
-                scaled_line_height = int(original_line_surface.get_height() * self.buff_text_scale)
+                scaled_line_width = int(original_line_surface.get_width() * buff_text.scale)
+                scaled_line_height = int(original_line_surface.get_height() * buff_text.scale)
                 
                 scaled_line_width = max(1, scaled_line_width)
                 scaled_line_height = max(1, scaled_line_height)
                 
-                scaled_line_surface = pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height))
+                scaled_line_surface = SURF_INVENTORY.add(pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height)))
                 
-                scaled_line_surface.set_alpha(self.buff_text_alpha)
+                scaled_line_surface.set_alpha(buff_text.alpha)
                 scaled_surfaces.append(scaled_line_surface)
 
             scaled_total_height = sum(s.get_height() for s in scaled_surfaces)
@@ -209,19 +226,4 @@ class InventoryManager: # CORRECTED TYPO HERE
                 current_y += s_surface.get_height()
 
         # 2. Draw Floating Buff Texts
-        text_fade_duration = 1000 
-        text_float_speed = 0.05 
-
-        for text_info in self.buff_display_list:
-            elapsed_time = current_time - text_info['start_time']
-            if elapsed_time < text_fade_duration:
-                alpha = int(255 * (1 - (elapsed_time / text_fade_duration)))
-                alpha = max(0, alpha)
-
-                float_offset_y = elapsed_time * text_float_speed
-
-                text_surface = self.floating_buff_font.render(str(text_info['value']), True, text_info['color'])
-                text_surface.set_alpha(alpha)
-
-                text_rect = text_surface.get_rect(center=(text_info['pos'][0], text_info['pos'][1] - float_offset_y))
-                screen.blit(text_surface, text_rect)
\ No newline at end of file
+        self.floating_texts.draw(screen, OWNER_INVENTORY)
@@ -0,0 +1,254 @@
+# objects/leaderboard_ob.py
+import gzip
+import json
+import os
+import time
+
+from sortedcontainers import SortedList
+
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_WARNING
+
+# --- Leaderboard Location ---
+LEADERBOARD_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "save", "leaderboards.json.gz")
+SNAPSHOT_VERSION = 1
+
+# --- Board Kinds ---
+BOARD_ALL = "all"
+BOARD_THEME = "theme"
+BOARD_DAY = "day"
+BOARD_SEED = "seed"
+
+# --- Score Packing (see RunResult._score) ---
+SCORE_MAX_XP = (1 << 20) - 1
+SCORE_MAX_CARDS = (1 << 12) - 1
+SCORE_MAX_TIME = (1 << 44) - 1 # Milliseconds since the epoch, good until the year 2527
+PLAYER_BITS = 32 # Low bits of a ranking key: the player's slot on that board, so keys are unique
+
+# --- Trace Events ---
+EV_LEADERBOARD_SNAPSHOT = TRACE.define("leaderboard.snapshot", TRACE_DEBUG, "Saved {0} leaderboards ({1} entries) to {2} in {3:.1f} ms")
+EV_LEADERBOARD_LOAD_FAILED = TRACE.define("leaderboard.load_failed", TRACE_WARNING, "Could not load leaderboards from {0}: {1}. Starting empty.")
+
+
+class RunResult:
+    """One finished run as the leaderboards see it (xp is all XP earned, including XP spent on level-ups).
+    Treat it as read-only: its score is computed once."""
+    __slots__ = ("player_id", "run_id", "seed", "theme", "day", "xp", "cards_cleared", "survived", "finished_at", "score")
+
+    def __init__(self, player_id, run_id, seed, theme, xp, cards_cleared, survived, finished_at=None, day=None):
+        self.player_id = player_id
+        self.run_id = run_id
+        self.seed = seed
+        self.theme = theme
+        self.xp = xp
+        self.cards_cleared = cards_cleared
+        self.survived = bool(survived)
+        self.finished_at = time.time() if finished_at is None else finished_at
+        self.day = day or time.strftime("%Y-%m-%d", time.gmtime(self.finished_at)) # UTC day
+        self.score = self._score()
+
+    def _score(self):
+        """
+        One integer, smaller is better: survivors, then XP, then cards cleared, then whoever finished first.
+        Ints compare much faster than tuples, which is most of what a ranking insert or lookup does.
+        """
+        xp = min(max(self.xp, 0), SCORE_MAX_XP)
+        cards_cleared = min(max(self.cards_cleared, 0), SCORE_MAX_CARDS)
+        finished_ms = min(max(int(self.finished_at * 1000), 0), SCORE_MAX_TIME)
+        return (((((0 if self.survived else 1) << 20 | (SCORE_MAX_XP - xp)) << 12 | (SCORE_MAX_CARDS - cards_cleared))
+                 << 44) | finished_ms)
+
+    def row(self):
+        return [self.player_id, self.run_id, self.seed, self.theme, self.xp, self.cards_cleared,
+                int(self.survived), self.finished_at, self.day]
+
+    @classmethod
+    def from_row(cls, row):
+        player_id, run_id, seed, theme, xp, cards_cleared, survived, finished_at, day = row
+        return cls(player_id, run_id, seed, theme, xp, cards_cleared, survived, finished_at, day)
+
+
+class Leaderboard:
+    """
+    One ranking with each player's best run. Keys are (score << 32 | player slot) ints kept in a
+    SortedList, so an insert, a removal and a rank lookup are O(log n) and top(k) only walks k entries.
+    Exact ties are ordered by who first appeared on the board.
+    """
+    def __init__(self):
+        self._ranking = SortedList()
+        self._players = [] # slot -> player_id
+        self._slots = {} # player_id -> slot
+        self._best = {} # slot -> (key, RunResult)
+
+    def __len__(self):
+        return len(self._best)
+
+    def _slot(self, player_id):
+        slot = self._slots.get(player_id)
+        if slot is None:
+            slot = self._slots[player_id] = len(self._players)
+            self._players.append(player_id)
+        return slot
+
+    def _candidate(self, result):
+        """(slot, key, previous entry) if `result` beats the player's best run here, else None."""
+        slot = self._slot(result.player_id)
+        key = result.score << PLAYER_BITS | slot
+        previous = self._best.get(slot)
+        if previous is not None and previous[0] <= key:
+            return None
+        return slot, key, previous
+
+    def submit(self, result):
+        """Records `result` if it beats the player's best run here. Returns True if the board changed."""
+        candidate = self._candidate(result)
+        if candidate is None:
+            return False
+        slot, key, previous = candidate
+        if previous is not None:
+            self._ranking.remove(previous[0])
+        self._ranking.add(key)
+        self._best[slot] = (key, result)
+        return True
+
+    def submit_many(self, results):
+        """
+        Applies a batch. The batch's new keys go in with one SortedList.update(), which re-sorts
+        in one go when the batch is large next to the board (bulk loads, simulator batches).
+        Returns the results that changed the board.
+        """
+        winners = {}
+        for result in results:
+            candidate = self._candidate(result)
+            if candidate is not None and (candidate[0] not in winners or candidate[1] < winners[candidate[0]][0]):
+                winners[candidate[0]] = (candidate[1], result, candidate[2])
+        for slot, (key, result, previous) in winners.items():
+            if previous is not None:
+                self._ranking.remove(previous[0])
+            self._best[slot] = (key, result)
+        self._ranking.update(key for key, _, _ in winners.values())
+        return [result for _, result, _ in winners.values()]
+
+    def rank(self, player_id):
+        """1-based rank of the player's best run, or None if they have no run on this board."""
+        entry = self._best.get(self._slots.get(player_id))
+        if entry is None:
+            return None
+        return self._ranking.bisect_left(entry[0]) + 1
+
+    def best(self, player_id):
+        entry = self._best.get(self._slots.get(player_id))
+        return entry[1] if entry else None
+
+    def top(self, k=10):
+        """The k best runs, best first."""
+        best = self._best
+        mask = (1 << PLAYER_BITS) - 1
+        return [best[key & mask][1] for key in self._ranking.islice(0, k)]
+
+    def around(self, player_id, radius=2):
+        """The runs ranked just above and below the player's, as [(rank, RunResult)]."""
+        rank = self.rank(player_id)
+        if rank is None:
+            return []
+        first = max(0, rank - 1 - radius)
+        best = self._best
+        mask = (1 << PLAYER_BITS) - 1
+        return [(first + offset + 1, best[key & mask][1])
+                for offset, key in enumerate(self._ranking.islice(first, rank + radius))]
+
+    def results(self):
+        return [entry[1] for entry in self._best.values()]
+
+
+class LeaderboardSet:
+    """
+    Every leaderboard, fed by finished runs: one overall board plus one per theme, per UTC day and per seed.
+    submit_many() takes the batches a session server or simulator collects; save() writes a compact
+    snapshot (each distinct run once, gzip'd JSON rows) and maybe_save() does so at most every
+    `snapshot_interval` seconds.
+    """
+    def __init__(self, path=LEADERBOARD_PATH, snapshot_interval=60.0):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.boards = {} # (kind, value) -> Leaderboard
+        self.dirty = False
+        self._last_snapshot = time.monotonic()
+
+    def board(self, kind, value=None):
+        """The board for (kind, value), e.g. board("theme", "Crypt"); empty if nobody has played it yet."""
+        return self.boards.get((kind, value)) or Leaderboard()
+
+    def _board_keys(self, result):
+        return ((BOARD_ALL, None), (BOARD_THEME, result.theme), (BOARD_DAY, result.day), (BOARD_SEED, result.seed))
+
+    def submit(self, result):
+        changed = False
+        for board_key in self._board_keys(result):
+            board = self.boards.get(board_key)
+            if board is None:
+                board = self.boards[board_key] = Leaderboard()
+            changed |= board.submit(result)
+        self.dirty |= changed
+        return changed
+
+    def submit_many(self, results):
+        """Applies a batch of RunResults board by board (see Leaderboard.submit_many). Returns how many changed a board."""
+        by_board = {}
+        for result in results:
+            for board_key in self._board_keys(result):
+                by_board.setdefault(board_key, []).append(result)
+        changed = set()
+        for board_key, board_results in by_board.items():
+            board = self.boards.get(board_key)
+            if board is None:
+                board = self.boards[board_key] = Leaderboard()
+            changed.update(id(result) for result in board.submit_many(board_results))
+        self.dirty |= bool(changed)
+        return len(changed)
+
+    # --- Snapshots ---
+    def save(self, path=None):
+        """Writes every run still on some board, once, and replaces the old snapshot atomically."""
+        path = path or self.path
+        started = time.perf_counter()
+        runs = {}
+        for board in self.boards.values():
+            for result in board.results():
+                runs[result.run_id] = result
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary_path = path + ".tmp"
+        with gzip.open(temporary_path, "wt", encoding="utf-8", compresslevel=5) as snapshot_file:
+            json.dump({"version": SNAPSHOT_VERSION, "runs": [result.row() for result in runs.values()]},
+                      snapshot_file, separators=(",", ":"))
+        os.replace(temporary_path, path)
+        self.dirty = False
+        self._last_snapshot = time.monotonic()
+        if EV_LEADERBOARD_SNAPSHOT.on:
+            TRACE.emit(EV_LEADERBOARD_SNAPSHOT, len(self.boards), len(runs), path, (time.perf_counter() - started) * 1000)
+        return len(runs)
+
+    def maybe_save(self):
+        """save() if something changed and the last snapshot is older than snapshot_interval."""
+        if self.dirty and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.save()
+            return True
+        return False
+
+    @classmethod
+    def load(cls, path=LEADERBOARD_PATH, snapshot_interval=60.0):
+        """Rebuilds the boards from a snapshot; a missing or unreadable snapshot gives empty boards."""
+        leaderboards = cls(path, snapshot_interval)
+        if not os.path.exists(path):
+            return leaderboards
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"snapshot version {snapshot.get('version')}, expected {SNAPSHOT_VERSION}")
+            leaderboards.submit_many([RunResult.from_row(row) for row in snapshot["runs"]])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if EV_LEADERBOARD_LOAD_FAILED.on:
+                TRACE.emit(EV_LEADERBOARD_LOAD_FAILED, path, e)
+            leaderboards = cls(path, snapshot_interval)
+        leaderboards.dirty = False
+        return leaderboards
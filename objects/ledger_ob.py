@@ -0,0 +1,253 @@
+# objects/ledger_ob.py
+import os
+import queue
+from collections import deque
+import random
+import sqlite3
+import threading
+import time
+
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_INFO, TRACE_WARNING, TRACE_ERROR
+
+# --- Ledger Location ---
+LEDGER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "save", "ledger.sqlite3")
+REWARD_CARD_COUNT = 3 # Cards granted from the unlocked pool on a dungeon exit
+WRITER_BUSY_TIMEOUT_MS = 5000 # How long one statement waits on another process's lock before it counts as failed
+WRITE_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6) # Backoff between attempts at one batch before it is requeued
+
+# --- Trace Events ---
+EV_LEDGER_OPENED = TRACE.define("ledger.opened", TRACE_DEBUG, "Card ledger opened at {0}")
+EV_LEDGER_FLUSHED = TRACE.define("ledger.flushed", TRACE_DEBUG, "Card ledger wrote {0} grant(s) ({1} new, {2} duplicate) in {3:.1f} ms")
+EV_LEDGER_GRANTED = TRACE.define("ledger.granted", TRACE_INFO, "Reward for run {0}: {1}")
+EV_LEDGER_WRITE_RETRY = TRACE.define("ledger.write_retry", TRACE_WARNING, "Card ledger could not write {0} grant(s): {1}. Retrying in {2:.2f} s.")
+EV_LEDGER_WRITE_FAILED = TRACE.define("ledger.write_failed", TRACE_ERROR, "Card ledger could not write {0} grant(s): {1}. {2}")
+EV_LEDGER_BACKLOG = TRACE.define("ledger.backlog", TRACE_WARNING, "Card ledger queue is full ({0} pending); spilling grants to memory until the writer catches up")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    player_id TEXT NOT NULL,
+    seed INTEGER,
+    theme TEXT,
+    granted_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS owned_cards (
+    id INTEGER PRIMARY KEY,
+    player_id TEXT NOT NULL,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    theme TEXT NOT NULL,
+    card_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    granted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS owned_cards_by_player ON owned_cards (player_id, name);
+CREATE INDEX IF NOT EXISTS runs_by_player ON runs (player_id, granted_at);
+"""
+
+_WAKE = object() # Queue sentinel: stop waiting (a grant spilled, or the ledger is closing)
+
+
+def pick_reward_cards(unlocked_cards_pool, game_seed, count=REWARD_CARD_COUNT):
+    """The run's reward: `count` cards from the other themes, fixed by the seed so a replayed grant matches."""
+    if not unlocked_cards_pool:
+        return []
+    rng = random.Random(game_seed)
+    return rng.sample(unlocked_cards_pool, min(count, len(unlocked_cards_pool)))
+
+
+def _connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL") # Readers never wait on the writer
+    connection.execute("PRAGMA synchronous=NORMAL") # Durable at checkpoints; a crash can lose only the last batch
+    return connection
+
+
+class CardLedger:
+    """
+    Records which collectible cards each player owns, in SQLite (WAL mode).
+    grant() only queues the write and returns; one writer thread drains the queue and commits up to
+    `batch_size` grants per transaction, so game actions never wait on the disk. When the writer
+    falls `max_pending` grants behind, further grants go to an in-memory spill list instead of
+    blocking. A batch that fails (e.g. the database is locked) is retried with backoff and then
+    requeued, never dropped; the run id key makes a retried grant safe.
+    Grants are idempotent per run id: the runs table's primary key rejects a second grant for the
+    same run and its cards are skipped with it.
+    Reads run on the calling thread's own connection and see what has been committed;
+    call flush() first to read your own writes.
+    """
+    def __init__(self, db_path=LEDGER_PATH, batch_size=512, max_pending=100000, retry_delays=WRITE_RETRY_DELAYS):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.retry_delays = retry_delays
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        schema_connection = _connect(db_path)
+        schema_connection.executescript(SCHEMA)
+        schema_connection.close()
+
+        self.granted = 0 # Grants committed as new
+        self.duplicates = 0 # Grants skipped because the run was already recorded
+        self.failed = 0 # Failed write attempts (the grants are retried, then requeued)
+        self.spilled = 0 # Grants that found the queue full and went to the spill list
+        self._queue = queue.Queue(max_pending)
+        self._spill = deque() # Overflow when the queue is full: grant() never blocks; the writer drains it first
+        self._pending = 0 # Grants neither committed nor given up on
+        self._stalled = False # The last batch failed every retry and was requeued
+        self._closing = False
+        self._settled = threading.Condition() # Signalled whenever the writer finishes a batch
+        self._local = threading.local()
+        self._writer = threading.Thread(target=self._write_loop, name="card-ledger", daemon=True)
+        self._writer.start()
+        if EV_LEDGER_OPENED.on:
+            TRACE.emit(EV_LEDGER_OPENED, db_path)
+
+    # --- Writes ---
+    def grant(self, player_id, run_id, cards, seed=None, theme=None):
+        """Queues `cards` (Card objects or (theme, card_type, name) tuples) for `player_id` under `run_id`."""
+        rows = tuple(card if isinstance(card, tuple) else (card.theme, card.card_type, card.name) for card in cards)
+        if EV_LEDGER_GRANTED.on:
+            TRACE.emit(EV_LEDGER_GRANTED, run_id, ", ".join(row[2] for row in rows))
+        grant = (player_id, run_id, seed, theme, time.time(), rows)
+        with self._settled:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(grant)
+        except queue.Full:
+            if not self._spill and EV_LEDGER_BACKLOG.on:
+                TRACE.emit(EV_LEDGER_BACKLOG, self._queue.qsize())
+            self._spill.append(grant)
+            self.spilled += 1
+            try:
+                self._queue.put_nowait(_WAKE) # In case the writer empties the queue before it sees the spill
+            except queue.Full:
+                pass # Still full: the writer is busy and takes the spill on its next batch
+
+    def flush(self):
+        """Blocks until every grant so far has been committed, or the writer is stuck retrying a failing database."""
+        with self._settled:
+            self._settled.wait_for(lambda: not self._pending or self._stalled)
+
+    def close(self):
+        """Writes what is queued and stops the writer."""
+        if self._writer.is_alive():
+            self._closing = True
+            try:
+                self._queue.put_nowait(_WAKE)
+            except queue.Full:
+                pass # The writer is not waiting on an empty queue
+            self._writer.join()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _next_batch(self, block):
+        """Up to `batch_size` grants: spilled ones first (they are older), then the queue's."""
+        grants = []
+        while self._spill and len(grants) < self.batch_size:
+            grants.append(self._spill.popleft())
+        while len(grants) < self.batch_size:
+            try:
+                item = self._queue.get() if block and not grants else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                block = False
+            else:
+                grants.append(item)
+        return grants
+
+    def _write_loop(self):
+        connection = _connect(self.db_path)
+        connection.execute(f"PRAGMA busy_timeout = {WRITER_BUSY_TIMEOUT_MS}")
+        while not self._closing:
+            grants = self._next_batch(block=True)
+            if grants:
+                self._write_batch(connection, grants, requeue=True)
+        while True: # Closing: one last try at everything queued or spilled
+            grants = self._next_batch(block=False)
+            if not grants:
+                break
+            self._write_batch(connection, grants, requeue=False)
+        connection.close()
+
+    def _write_batch(self, connection, grants, requeue=True):
+        """
+        Commits `grants` in one transaction, retrying with backoff on SQLite errors. If every attempt
+        fails the grants go back on the spill list for a later batch (unless `requeue` is off, when
+        the writer is closing).
+        """
+        started = time.perf_counter()
+        for attempt in range(len(self.retry_delays) + 1):
+            try:
+                new = self._insert_grants(connection, grants)
+                break
+            except sqlite3.Error as e:
+                self.failed += 1
+                if attempt < len(self.retry_delays):
+                    if EV_LEDGER_WRITE_RETRY.on:
+                        TRACE.emit(EV_LEDGER_WRITE_RETRY, len(grants), e, self.retry_delays[attempt])
+                    time.sleep(self.retry_delays[attempt])
+                    continue
+                if EV_LEDGER_WRITE_FAILED.on:
+                    TRACE.emit(EV_LEDGER_WRITE_FAILED, len(grants), e,
+                               "Requeued for the next batch." if requeue else "Giving up while closing.")
+                with self._settled:
+                    if requeue:
+                        self._spill.extend(grants)
+                        self._stalled = True
+                    else:
+                        self._pending -= len(grants)
+                    self._settled.notify_all()
+                return
+        with self._settled:
+            self._pending -= len(grants)
+            self._stalled = False
+            self._settled.notify_all()
+        self.granted += new
+        self.duplicates += len(grants) - new
+        if EV_LEDGER_FLUSHED.on:
+            TRACE.emit(EV_LEDGER_FLUSHED, len(grants), new, len(grants) - new, (time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    def _insert_grants(connection, grants):
+        """Inserts the grants in one transaction (rolled back on error). Returns how many runs were new."""
+        new = 0
+        with connection:
+            for player_id, run_id, seed, theme, granted_at, rows in grants:
+                inserted = connection.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, player_id, seed, theme, granted_at) VALUES (?, ?, ?, ?, ?)",
+                    (run_id, player_id, seed, theme, granted_at)).rowcount
+                if not inserted:
+                    continue
+                new += 1
+                connection.executemany(
+                    "INSERT INTO owned_cards (player_id, run_id, theme, card_type, name, granted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(player_id, run_id, card_theme, card_type, name, granted_at) for card_theme, card_type, name in rows])
+        return new
+
+    # --- Reads ---
+    def _reader(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = _connect(self.db_path)
+        return connection
+
+    def collection(self, player_id):
+        """[(name, theme, card_type, copies)] owned by `player_id`, by name."""
+        return self._reader().execute(
+            "SELECT name, theme, card_type, COUNT(*) FROM owned_cards WHERE player_id = ? "
+            "GROUP BY name, theme, card_type ORDER BY name", (player_id,)).fetchall()
+
+    def copies(self, player_id, name):
+        """How many copies of card `name` the player owns."""
+        return self._reader().execute(
+            "SELECT COUNT(*) FROM owned_cards WHERE player_id = ? AND name = ?", (player_id, name)).fetchone()[0]
+
+    def runs(self, player_id, limit=20):
+        """[(run_id, seed, theme, granted_at)] of the player's rewarded runs, newest first."""
+        return self._reader().execute(
+            "SELECT run_id, seed, theme, granted_at FROM runs WHERE player_id = ? ORDER BY granted_at DESC LIMIT ?",
+            (player_id, limit)).fetchall()
+
+    def has_run(self, run_id):
+        return self._reader().execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
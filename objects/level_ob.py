@@ -3,12 +3,88 @@
 import pygame
 import math
 
+from objects.memory_ob import SURFACES, SUBSYSTEM_LEVEL
+from objects.metrics_ob import METRICS
+from objects.particle_ob import FloatingTextPool, OWNER_LEVEL
+from objects.timeline_ob import Timeline, ZoomFadeTween
+from objects.trace_ob import TRACE, TRACE_INFO, TRACE_ERROR
+
+# --- Trace Events ---
+EV_LEVEL_NO_CARD = TRACE.define("level.no_card", TRACE_ERROR, "Error: No level-up card to apply.")
+EV_LEVEL_NOT_ENOUGH_XP = TRACE.define("level.not_enough_xp", TRACE_INFO, "Need {0} XP for level up!\n(Current: {1})")
+EV_LEVEL_MAX_HEALTH = TRACE.define("level.max_health", TRACE_INFO, "Max Health: {0} -> {1} (+{2})")
+EV_LEVEL_MIN_ATTACK = TRACE.define("level.min_attack", TRACE_INFO, "Min Attack: {0} -> {1} (+{2})")
+EV_LEVEL_MIN_DEFENSE = TRACE.define("level.min_defense", TRACE_INFO, "Min Defense: {0} -> {1} (+{2})")
+
+LEVEL_UP_XP_THRESHOLD = 40 # XP a level-up card costs
+
+# --- Level-Up Stats (apply_level_up) ---
+LEVEL_STAT_HEALTH = "health"
+LEVEL_STAT_ATTACK = "attack"
+LEVEL_STAT_DEFENSE = "defense"
+
+# --- Metrics ---
+M_LEVEL_UPS = METRICS.counter("dg_level_ups_total", "Level-up cards drawn in the game, by result", ("result",))
+M_LEVEL_UPS_APPLIED = M_LEVEL_UPS.labels("applied")
+M_LEVEL_UPS_DENIED = M_LEVEL_UPS.labels("not_enough_xp")
+M_XP_SPENT = METRICS.counter("dg_xp_spent_total", "XP spent on level-ups in the game").labels()
+SURF_LEVEL = SURFACES.subsystem(SUBSYSTEM_LEVEL)
+
+
+# --- Level-Up Rules (no drawing; LevelManager adds the pop-ups, the simulation uses them headless) ---
+def apply_level_up(hero_instance, level_up_card, required_xp=LEVEL_UP_XP_THRESHOLD):
+    """
+    Buys a level-up card with `required_xp` XP: +health raises max (and current) HP, +attack and
+    +defense raise the minimum stats.
+    Returns the applied [(stat, amount)] in the order health, attack, defense, or None if the
+    hero does not have enough XP (nothing changes then).
+    """
+    # Get boost values directly from the card's attributes
+    health_boost = level_up_card.health
+    attack_boost = level_up_card.attack
+    defense_boost = level_up_card.defense
+
+    if hero_instance.experience < required_xp:
+        if EV_LEVEL_NOT_ENOUGH_XP.on:
+            TRACE.emit(EV_LEVEL_NOT_ENOUGH_XP, required_xp, hero_instance.experience)
+        return None
+
+    boosts = []
+    if health_boost > 0:
+        old_max_health = hero_instance.max_health
+        hero_instance.max_health += health_boost
+        hero_instance.health += health_boost
+        boosts.append((LEVEL_STAT_HEALTH, health_boost))
+        if EV_LEVEL_MAX_HEALTH.on:
+            TRACE.emit(EV_LEVEL_MAX_HEALTH, old_max_health, hero_instance.max_health, health_boost)
+
+    if attack_boost > 0:
+        old_min_attack = hero_instance.min_attack
+        hero_instance.min_attack += attack_boost
+        hero_instance.attack += attack_boost 
+        boosts.append((LEVEL_STAT_ATTACK, attack_boost))
+        if EV_LEVEL_MIN_ATTACK.on:
+            TRACE.emit(EV_LEVEL_MIN_ATTACK, old_min_attack, hero_instance.min_attack, attack_boost)
+
+    if defense_boost > 0:
+        old_min_defense = hero_instance.min_defense
+        hero_instance.min_defense += defense_boost
+        hero_instance.defense += defense_boost 
+        boosts.append((LEVEL_STAT_DEFENSE, defense_boost))
+        if EV_LEVEL_MIN_DEFENSE.on:
+            TRACE.emit(EV_LEVEL_MIN_DEFENSE, old_min_defense, hero_instance.min_defense, defense_boost)
+
+    hero_instance.experience = hero_instance.experience - required_xp
+    hero_instance.experience_spent += required_xp
+    return boosts
+
+
 class LevelManager:
-    def __init__(self, screen_width, screen_height, game_room_ui_instance):
+    def __init__(self, screen_width, screen_height, game_room_ui_instance, floating_texts=None, timeline=None):
         self.WIDTH = screen_width
         self.HEIGHT = screen_height
         self.game_room_ui = game_room_ui_instance 
-        self.LEVEL_UP_XP_THRESHOLD = 40 # Define your XP purchase threshold here
+        self.LEVEL_UP_XP_THRESHOLD = LEVEL_UP_XP_THRESHOLD # Define your XP purchase threshold here
 
         self.WHITE = (255, 255, 255)
         self.RED = (255, 0, 0)      
@@ -19,34 +95,24 @@ class LevelManager:
         self.main_popup_font = pygame.font.SysFont("Arial Black", 50, bold=True) 
 
         self.buff_text_message = "" 
-        self.buff_text_start_time = 0
-        self.buff_text_alpha = 0     
-        self.buff_text_scale = 0.0   
-        self.buff_text_active = False
-        self.buff_text_display_duration = 2000 
+        self.buff_text_tween = ZoomFadeTween(2000) # Zoom in for half the duration, fade out for the other half
         self.buff_text_color = self.WHITE 
 
 
-        self.buff_display_list = [] 
+        self.floating_texts = floating_texts if floating_texts is not None else FloatingTextPool()
+
+        # Animation timeline (shared with the other managers in main.py, which ticks it once per frame)
+        self.timeline = timeline if timeline is not None else Timeline()
+        self._owns_timeline = timeline is None # A private timeline is ticked from update_popups
+        self.timeline.add_ticker(self.floating_texts)
 
     def _trigger_main_level_up_popup(self, message, color=None, duration_ms=2000):
         self.buff_text_message = message
         self.buff_text_color = color if color is not None else self.WHITE
-        self.buff_text_start_time = pygame.time.get_ticks()
-        self.buff_text_alpha = 255
-        self.buff_text_scale = 0.1 
-        self.buff_text_active = True
-        self.buff_text_display_duration = duration_ms
+        self.timeline.play(self.buff_text_tween, duration_ms)
 
     def _display_floating_buff_text(self, text, color, target_rect_center):
-        pos_x = target_rect_center[0]
-        pos_y = target_rect_center[1] - 30 
-        self.buff_display_list.append({
-            'value': text, 
-            'color': color,
-            'pos': (pos_x, pos_y),
-            'start_time': pygame.time.get_ticks()
-        })
+        self.floating_texts.spawn(OWNER_LEVEL, self.floating_buff_font, text, color, target_rect_center, self.timeline.now)
     
     def start_level_up(self, level_up_card):
         self.current_level_up_card = level_up_card
@@ -60,54 +126,28 @@ class LevelManager:
         Returns the new sub_state.
         """
         if not self.current_level_up_card:
-            print("Error: No level-up card to apply.")
+            if EV_LEVEL_NO_CARD.on:
+                TRACE.emit(EV_LEVEL_NO_CARD)
             return "IDLE" 
 
-        # Store old stats for display
-        old_max_health = hero_instance.max_health
-        old_min_attack = hero_instance.min_attack
-        old_min_defense = hero_instance.min_defense
-
-        # Get boost values directly from the card's attributes
-        health_boost = self.current_level_up_card.health
-        attack_boost = self.current_level_up_card.attack
-        defense_boost = self.current_level_up_card.defense
-
-        boost_message_parts = []
-
-        required_xp = self.LEVEL_UP_XP_THRESHOLD
-        if hero_instance.experience < required_xp:
-            print(f"Need {required_xp} XP for level up!\n(Current: {hero_instance.experience})")
-            final_message = "Not Enough XP!\n" + "\n".join(boost_message_parts)
+        boosts = apply_level_up(hero_instance, self.current_level_up_card, self.LEVEL_UP_XP_THRESHOLD)
+        if boosts is None:
+            M_LEVEL_UPS_DENIED.inc()
+            final_message = "Not Enough XP!\n"
             self._trigger_main_level_up_popup(final_message, self.RED, 2500) 
-
-        # Apply boosts and prepare messages
-        
-
-        elif hero_instance.experience >= required_xp:
-            if health_boost > 0:
-                hero_instance.max_health += health_boost
-                hero_instance.health += health_boost
-                boost_message_parts.append(f"+{health_boost} Max HP")
-                self._display_floating_buff_text(f"+{health_boost} Max HP", 
-                                                    self.GREEN, self.game_room_ui.get_health_rect().center)
-                print(f"Max Health: {old_max_health} -> {hero_instance.max_health} (+{health_boost})")
-
-            if attack_boost > 0:
-                hero_instance.min_attack += attack_boost
-                hero_instance.attack += attack_boost 
-                boost_message_parts.append(f"+{attack_boost} Min ATK")
-                self._display_floating_buff_text(f"+{attack_boost} Min ATK", 
-                                                    self.GREEN, self.game_room_ui.get_attack_rect().center)
-                print(f"Min Attack: {old_min_attack} -> {hero_instance.min_attack} (+{attack_boost})")
-
-            if defense_boost > 0:
-                hero_instance.min_defense += defense_boost
-                hero_instance.defense += defense_boost 
-                boost_message_parts.append(f"+{defense_boost} Min DEF")
-                self._display_floating_buff_text(f"+{defense_boost} Min DEF", 
-                                                    self.GREEN, self.game_room_ui.get_defense_rect().center)
-                print(f"Min Defense: {old_min_defense} -> {hero_instance.min_defense} (+{defense_boost})")
+        else:
+            M_LEVEL_UPS_APPLIED.inc()
+            M_XP_SPENT.inc(self.LEVEL_UP_XP_THRESHOLD)
+            # Apply boosts and prepare messages
+            boost_message_parts = []
+            for stat, amount in boosts:
+                label, target_rect = {
+                    LEVEL_STAT_HEALTH: ("Max HP", self.game_room_ui.get_health_rect()),
+                    LEVEL_STAT_ATTACK: ("Min ATK", self.game_room_ui.get_attack_rect()),
+                    LEVEL_STAT_DEFENSE: ("Min DEF", self.game_room_ui.get_defense_rect()),
+                }[stat]
+                boost_message_parts.append(f"+{amount} {label}")
+                self._display_floating_buff_text(f"+{amount} {label}", self.GREEN, target_rect.center)
             
             # Trigger a final main pop-up summarizing boosts, if any
             if boost_message_parts:
@@ -115,54 +155,27 @@ class LevelManager:
                 self._trigger_main_level_up_popup(final_message, self.GREEN, 2500) 
             else:
                 self._trigger_main_level_up_popup("No Stat Boosts!", self.RED, 1500)
-
-            hero_instance.experience = hero_instance.experience - required_xp
- 
         
         self.current_level_up_card = None 
         return "LEVEL_UP_ADDED" 
 
     def update_popups(self):
-        current_time = pygame.time.get_ticks()
-
-        if self.buff_text_active:
-            elapsed_time = current_time - self.buff_text_start_time
-            if elapsed_time > self.buff_text_display_duration:
-                self.buff_text_active = False
-                self.buff_text_alpha = 0
-                self.buff_text_scale = 0.0
-            else:
-                zoom_duration = self.buff_text_display_duration * 0.5 
-                fade_duration = self.buff_text_display_duration * 0.5 
-                if elapsed_time < zoom_duration:
-                    progress = elapsed_time / zoom_duration
-                    self.buff_text_scale = 0.1 + (0.9 * progress) 
-                    self.buff_text_alpha = 255 
-                else:
-                    self.buff_text_scale = 1.0 
-                    fade_progress = (elapsed_time - zoom_duration) / fade_duration
-                    self.buff_text_alpha = int(255 * (1.0 - fade_progress))
-                self.buff_text_alpha = max(0, min(255, self.buff_text_alpha))
-                self.buff_text_scale = max(0.0, min(1.0, self.buff_text_scale))
-
-        self.buff_display_list = [
-            text_info for text_info in self.buff_display_list
-            if current_time - text_info['start_time'] < 1000 
-        ]
+        if self._owns_timeline:
+            self.timeline.tick()
 
     def draw_popups(self, screen):
-        current_time = pygame.time.get_ticks()
-        if self.buff_text_active and self.buff_text_alpha > 0 and self.buff_text_scale > 0:
+        buff_text = self.buff_text_tween
+        if buff_text.active and buff_text.alpha > 0 and buff_text.scale > 0:
             lines = self.buff_text_message.split('\n')
             scaled_surfaces = []
             for line in lines:
-                original_line_surface = self.main_popup_font.render(line, True, self.buff_text_color)
-                scaled_line_width = int(original_line_surface.get_width() * self.buff_text_scale)
-                scaled_line_height = int(original_line_surface.get_height() * self.buff_text_scale)
+                original_line_surface = SURF_LEVEL.add(self.main_popup_font.render(line, True, self.buff_text_color))
+                scaled_line_width = int(original_line_surface.get_width() * buff_text.scale)
+                scaled_line_height = int(original_line_surface.get_height() * buff_text.scale)
                 scaled_line_width = max(1, scaled_line_width)
                 scaled_line_height = max(1, scaled_line_height)
-                scaled_line_surface = pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height))
-                scaled_line_surface.set_alpha(self.buff_text_alpha)
+                scaled_line_surface = SURF_LEVEL.add(pygame.transform.scale(original_line_surface, (scaled_line_width, scaled_line_height)))
+                scaled_line_surface.set_alpha(buff_text.alpha)
                 scaled_surfaces.append(scaled_line_surface)
 
             scaled_total_height = sum(s.get_height() for s in scaled_surfaces)
@@ -172,15 +185,4 @@ class LevelManager:
                 screen.blit(s_surface, s_rect)
                 current_y += s_surface.get_height()
 
-        text_fade_duration = 1000 
-        text_float_speed = 0.05 
-        for text_info in self.buff_display_list:
-            elapsed_time = current_time - text_info['start_time']
-            if elapsed_time < text_fade_duration:
-                alpha = int(255 * (1 - (elapsed_time / text_fade_duration)))
-                alpha = max(0, alpha)
-                float_offset_y = elapsed_time * text_float_speed
-                text_surface = self.floating_buff_font.render(str(text_info['value']), True, text_info['color'])
-                text_surface.set_alpha(alpha)
-                text_rect = text_surface.get_rect(center=(text_info['pos'][0], text_info['pos'][1] - float_offset_y))
-                screen.blit(text_surface, text_rect)
\ No newline at end of file
+        self.floating_texts.draw(screen, OWNER_LEVEL)
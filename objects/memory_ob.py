@@ -0,0 +1,179 @@
+# objects/memory_ob.py
+import sys
+
+try:
+    import resource # Optional: not available on Windows, where peak_rss() returns None
+except ImportError:
+    resource = None
+
+from objects.metrics_ob import METRICS
+from objects.trace_ob import TRACE, TRACE_INFO
+
+# --- Trace Events ---
+EV_SURFACE_SUMMARY = TRACE.define("memory.surface_summary", TRACE_INFO, "Surfaces: {0} frames, {1:.1f} surfaces ({2:.1f} KiB) per frame, worst {3} ({4:.1f} KiB); peak RSS {5}")
+
+# --- Subsystems (who allocated; each draw module binds its counter once at import) ---
+SUBSYSTEM_UI = "ui"
+SUBSYSTEM_BATTLE = "battle"
+SUBSYSTEM_INVENTORY = "inventory"
+SUBSYSTEM_LEVEL = "level"
+SUBSYSTEM_TITLE = "title"
+SUBSYSTEM_OVERLAY = "overlay"
+
+MAX_BUDGET_FAILURES = 100 # Over-budget frames kept for the report; the rest are only counted
+
+M_SURFACES = METRICS.counter("dg_surfaces_allocated_total", "Surfaces created while drawing frames", ("subsystem",))
+M_SURFACE_BYTES = METRICS.counter("dg_surface_bytes_allocated_total", "Pixel bytes of the surfaces created while drawing frames", ("subsystem",))
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where the platform can't say."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, KiB elsewhere
+
+
+def describe_bytes(count):
+    if count is None:
+        return "unknown"
+    return f"{count / (1024 * 1024):.1f} MiB"
+
+
+class SurfaceCounter:
+    """
+    Surfaces (and their pixel bytes) and Rects one subsystem created this frame.
+    add() and add_rect() return what they are given, so a call site wraps the allocation:
+    `surface = SURF_UI.add(font.render(...))`. While the tracker is disabled both return at once.
+    """
+    __slots__ = ("name", "tracker", "surfaces", "pixel_bytes", "rects",
+                 "total_surfaces", "total_bytes", "total_rects", "_metric_surfaces", "_metric_bytes")
+
+    def __init__(self, name, tracker):
+        self.name = name
+        self.tracker = tracker
+        self.surfaces = self.pixel_bytes = self.rects = 0
+        self.total_surfaces = self.total_bytes = self.total_rects = 0
+        self._metric_surfaces = M_SURFACES.labels(name)
+        self._metric_bytes = M_SURFACE_BYTES.labels(name)
+
+    def add(self, surface):
+        if self.tracker.enabled:
+            self.surfaces += 1
+            self.pixel_bytes += surface.get_pitch() * surface.get_height()
+        return surface
+
+    def add_rect(self, rect):
+        if self.tracker.enabled:
+            self.rects += 1
+        return rect
+
+
+class SurfaceTracker:
+    """
+    Per-frame surface churn by subsystem. The loop calls begin_frame() and end_frame() around each
+    frame; end_frame() folds the frame's counts into totals and worst frames, adds them to the
+    metrics, and checks them against the per-frame budget (set_budget), keeping the frames that
+    went over. Disabled by default: every hook is then a single attribute check.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.max_surfaces = None
+        self.max_bytes = None
+        self.reset()
+
+    def subsystem(self, name):
+        """The counter for `name`, created on first use."""
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = SurfaceCounter(name, self)
+        return counter
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.begin_frame()
+
+    def set_budget(self, max_surfaces=None, max_bytes=None):
+        """Per-frame limits on surfaces created and on their pixel bytes (None = no limit)."""
+        self.max_surfaces = max_surfaces
+        self.max_bytes = max_bytes
+
+    def reset(self):
+        self.frames = 0
+        self.total_surfaces = 0
+        self.total_bytes = 0
+        self.worst_surfaces = 0
+        self.worst_bytes = 0
+        self.last_frame = (0, 0)
+        self.over_budget = [] # (frame number, surfaces, pixel bytes, label), at most MAX_BUDGET_FAILURES
+        self.over_budget_count = 0
+        for counter in self.counters.values():
+            counter.surfaces = counter.pixel_bytes = counter.rects = 0
+            counter.total_surfaces = counter.total_bytes = counter.total_rects = 0
+
+    # --- Per-frame ---
+    def begin_frame(self):
+        """Drops anything counted since the last end_frame() (set-up work between frames)."""
+        for counter in self.counters.values():
+            counter.surfaces = counter.pixel_bytes = counter.rects = 0
+
+    def end_frame(self, label=None):
+        """Closes the frame. Returns its (surfaces, pixel bytes); `label` names it in budget failures."""
+        if not self.enabled:
+            return 0, 0
+        surfaces = pixel_bytes = 0
+        for counter in self.counters.values():
+            if counter.surfaces:
+                surfaces += counter.surfaces
+                pixel_bytes += counter.pixel_bytes
+                counter.total_surfaces += counter.surfaces
+                counter.total_bytes += counter.pixel_bytes
+                counter._metric_surfaces.inc(counter.surfaces)
+                counter._metric_bytes.inc(counter.pixel_bytes)
+            counter.total_rects += counter.rects
+            counter.surfaces = counter.pixel_bytes = counter.rects = 0
+
+        self.frames += 1
+        self.total_surfaces += surfaces
+        self.total_bytes += pixel_bytes
+        self.worst_surfaces = max(self.worst_surfaces, surfaces)
+        self.worst_bytes = max(self.worst_bytes, pixel_bytes)
+        self.last_frame = (surfaces, pixel_bytes)
+        if ((self.max_surfaces is not None and surfaces > self.max_surfaces) or
+                (self.max_bytes is not None and pixel_bytes > self.max_bytes)):
+            self.over_budget_count += 1
+            if len(self.over_budget) < MAX_BUDGET_FAILURES:
+                self.over_budget.append((self.frames, surfaces, pixel_bytes, label))
+        return surfaces, pixel_bytes
+
+    # --- Reporting ---
+    def report(self):
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "surfaces_per_frame": self.total_surfaces / frames,
+            "surface_bytes_per_frame": self.total_bytes / frames,
+            "worst_frame_surfaces": self.worst_surfaces,
+            "worst_frame_bytes": self.worst_bytes,
+            "subsystems": {
+                name: {
+                    "surfaces_per_frame": counter.total_surfaces / frames,
+                    "surface_bytes_per_frame": counter.total_bytes / frames,
+                    "rects_per_frame": counter.total_rects / frames,
+                }
+                for name, counter in sorted(self.counters.items())
+            },
+            "budget": {"max_surfaces": self.max_surfaces, "max_bytes": self.max_bytes,
+                       "frames_over": self.over_budget_count},
+            "peak_rss_bytes": peak_rss(),
+        }
+
+    def emit_summary(self):
+        if EV_SURFACE_SUMMARY.on and self.frames:
+            TRACE.emit(EV_SURFACE_SUMMARY, self.frames, self.total_surfaces / self.frames,
+                       self.total_bytes / self.frames / 1024, self.worst_surfaces, self.worst_bytes / 1024,
+                       describe_bytes(peak_rss()))
+
+
+SURFACES = SurfaceTracker()
@@ -0,0 +1,217 @@
+# objects/metrics_ob.py
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from objects.trace_ob import TRACE, TRACE_INFO, TRACE_WARNING
+
+# --- Trace Events ---
+EV_METRICS_SERVING = TRACE.define("metrics.serving", TRACE_INFO, "Metrics at http://127.0.0.1:{0}/metrics")
+EV_METRICS_SERVE_FAILED = TRACE.define("metrics.serve_failed", TRACE_WARNING, "Could not serve metrics on port {0}: {1}")
+EV_METRICS_DUMP_FAILED = TRACE.define("metrics.dump_failed", TRACE_WARNING, "Could not write metrics to {0}: {1}")
+
+# --- Default Histogram Buckets (seconds) ---
+FRAME_TIME_BUCKETS = (0.005, 0.010, 0.0167, 0.025, 0.0333, 0.050, 0.0667, 0.100, 0.250, 1.0)
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.010, 0.020, 0.0333, 0.050, 0.100, 0.250, 0.500, 1.0)
+
+METRICS_HOST = "127.0.0.1" # Never exposed beyond the machine
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """A monotonically increasing number. inc() is one attribute add, no lock: only the game thread writes."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets (upper bounds, sorted) plus their sum and count.
+    observe() is a bisect and three adds on preallocated storage; cumulative counts are only
+    built when the registry is rendered.
+    """
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """One named metric and its children, one per combination of label values."""
+    def __init__(self, name, help_text, kind, label_names, buckets=None):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind # "counter" or "histogram"
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self.children = {} # label values tuple -> Counter / Histogram
+
+    def labels(self, *values):
+        """The child for these label values, created on first use. Hot paths look it up once and keep it."""
+        values = tuple(str(value) for value in values)
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {values}")
+            child = Counter() if self.kind == "counter" else Histogram(self.buckets)
+            self.children = {**self.children, values: child} # Copy-on-write: a scrape never sees a dict mid-resize
+        return child
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _label_text(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else str(int(value))
+    return str(value)
+
+
+class MetricsRegistry:
+    """
+    Every metric the game keeps, rendered on demand in the Prometheus text format.
+    Modules define their metrics at import time, like trace events; defining a name twice
+    returns the existing family.
+    """
+    def __init__(self):
+        self.families = {}
+
+    def _family(self, name, help_text, kind, label_names, buckets=None):
+        family = self.families.get(name)
+        if family is None:
+            family = self.families[name] = MetricFamily(name, help_text, kind, label_names, buckets)
+        elif family.kind != kind or family.label_names != tuple(label_names):
+            raise ValueError(f"metric {name} is already defined as a {family.kind} with labels {family.label_names}")
+        return family
+
+    def counter(self, name, help_text, label_names=()):
+        return self._family(name, help_text, "counter", label_names)
+
+    def histogram(self, name, help_text, buckets, label_names=()):
+        return self._family(name, help_text, "histogram", label_names, tuple(buckets))
+
+    def render(self):
+        """All metrics as Prometheus text exposition (version 0.0.4)."""
+        lines = []
+        for family in self.families.values():
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in family.children.items():
+                if family.kind == "counter":
+                    lines.append(f"{family.name}{_label_text(family.label_names, values)} {_number(child.value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(child.bounds + (None,), list(child.counts)):
+                    cumulative += count
+                    le = "+Inf" if bound is None else _number(float(bound))
+                    bucket_labels = _label_text(family.label_names, values, f'le="{le}"')
+                    lines.append(f"{family.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{family.name}_sum{_label_text(family.label_names, values)} {_number(child.sum)}")
+                lines.append(f"{family.name}_count{_label_text(family.label_names, values)} {child.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+# --- Export ---
+class MetricsServer:
+    """Serves METRICS at http://127.0.0.1:<port>/metrics from a daemon thread. Port 0 picks a free one."""
+    def __init__(self, registry=METRICS, port=9464):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass # Scrapes every few seconds would flood the console
+
+        self._server = ThreadingHTTPServer((METRICS_HOST, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MetricsFileWriter:
+    """Writes METRICS to `path` every `interval` seconds from a daemon thread (atomic replace), and once more on close()."""
+    def __init__(self, path, registry=METRICS, interval=15.0):
+        self.path = path
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        temporary_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(self.registry.render())
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            if EV_METRICS_DUMP_FAILED.on:
+                TRACE.emit(EV_METRICS_DUMP_FAILED, self.path, e)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()
+
+
+def start_metrics_export(port=None, path=None, interval=15.0, registry=METRICS):
+    """
+    Starts whichever exports are configured: an HTTP endpoint if `port` is given, a periodic
+    file dump if `path` is. Returns the started exporters (each has close()).
+    """
+    exporters = []
+    if port is not None:
+        try:
+            server = MetricsServer(registry, port)
+            exporters.append(server)
+            if EV_METRICS_SERVING.on:
+                TRACE.emit(EV_METRICS_SERVING, server.port)
+        except OSError as e:
+            if EV_METRICS_SERVE_FAILED.on:
+                TRACE.emit(EV_METRICS_SERVE_FAILED, port, e)
+    if path:
+        exporters.append(MetricsFileWriter(path, registry, interval))
+    return exporters
@@ -0,0 +1,145 @@
+# objects/particle_ob.py
+from array import array
+
+import pygame
+
+from objects.memory_ob import SURFACES, SUBSYSTEM_BATTLE, SUBSYSTEM_INVENTORY, SUBSYSTEM_LEVEL
+
+# --- Owner Tags (each manager only draws its own texts, so draw order stays the same) ---
+OWNER_BATTLE = 0
+OWNER_INVENTORY = 1
+OWNER_LEVEL = 2
+OWNER_SURFACES = tuple(SURFACES.subsystem(name) for name in (SUBSYSTEM_BATTLE, SUBSYSTEM_INVENTORY, SUBSYSTEM_LEVEL)) # By owner tag
+
+
+class FloatingTextPool:
+    """
+    Fixed-capacity pool for the floating numbers ("-2", "+10XP", "+5 Max HP") shared by
+    BattleManager, InventoryManager and LevelManager.
+    Slot data lives in preallocated arrays and freed slots are recycled through a free list.
+    Text surfaces are rendered once per (font, text, color) and reused, so a hit costs no
+    new surface and a frame costs no new objects.
+    """
+    def __init__(self, capacity=64, duration_ms=1000, float_speed=0.05, rise_px=30, text_cache_size=128):
+        self.capacity = capacity
+        self.duration_ms = duration_ms
+        self.float_speed = float_speed # Pixels per millisecond
+        self.rise_px = rise_px # Texts start this far above the target's center
+        self.text_cache_size = text_cache_size
+
+        # Per-slot state
+        self._alive = bytearray(capacity)
+        self._owner = array('b', bytes(capacity))
+        self._x = array('i', bytes(4 * capacity))
+        self._y = array('i', bytes(4 * capacity))
+        self._start_time = array('q', bytes(8 * capacity))
+        self._alpha = array('B', bytes(capacity))
+        self._offset_y = array('d', bytes(8 * capacity))
+        self._surfaces = [None] * capacity
+        self._rects = [pygame.Rect(0, 0, 0, 0) for _ in range(capacity)]
+
+        # Free list (stack of slot indices) and the highest slot ever used, which bounds every loop
+        self._free = array('i', range(capacity - 1, -1, -1))
+        self._high_water = 0
+        self.active_count = 0
+
+        self._text_cache = {}
+        self._last_update_time = None
+
+    # --- Spawning ---
+    def _text_surface(self, owner, font, text, color):
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= self.text_cache_size:
+                self._text_cache.clear()
+            surface = OWNER_SURFACES[owner].add(font.render(text, True, color))
+            self._text_cache[key] = surface
+        return surface
+
+    def _oldest_slot(self):
+        oldest = 0
+        for slot in range(self._high_water):
+            if self._alive[slot] and self._start_time[slot] < self._start_time[oldest]:
+                oldest = slot
+        return oldest
+
+    def spawn(self, owner, font, value, color, target_rect_center, current_time=None):
+        """Starts a floating text above `target_rect_center`. When the pool is full the oldest text is replaced."""
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        if self._free:
+            slot = self._free.pop()
+            self.active_count += 1
+        else:
+            slot = self._oldest_slot()
+        if slot >= self._high_water:
+            self._high_water = slot + 1
+
+        surface = self._text_surface(owner, font, str(value), color)
+        self._alive[slot] = 1
+        self._owner[slot] = owner
+        self._x[slot] = target_rect_center[0]
+        self._y[slot] = target_rect_center[1] - self.rise_px
+        self._start_time[slot] = current_time
+        self._alpha[slot] = 255
+        self._offset_y[slot] = 0.0
+        self._surfaces[slot] = surface
+        self._rects[slot].size = surface.get_size()
+        return slot
+
+    # --- Per-frame ---
+    def update(self, current_time):
+        """
+        Advances alpha and float offset for every live text in one pass and frees expired slots.
+        The timeline calls this once per tick; repeated calls with the same timestamp do nothing.
+        """
+        if current_time == self._last_update_time:
+            return
+        self._last_update_time = current_time
+
+        duration = self.duration_ms
+        for slot in range(self._high_water):
+            if not self._alive[slot]:
+                continue
+            elapsed = current_time - self._start_time[slot]
+            if elapsed >= duration:
+                self._release(slot)
+                continue
+            self._alpha[slot] = max(0, int(255 * (1 - (elapsed / duration))))
+            self._offset_y[slot] = elapsed * self.float_speed
+
+        while self._high_water and not self._alive[self._high_water - 1]:
+            self._high_water -= 1
+
+    def draw(self, screen, owner):
+        """Blits the live texts tagged with `owner`."""
+        for slot in range(self._high_water):
+            if not self._alive[slot] or self._owner[slot] != owner:
+                continue
+            surface = self._surfaces[slot]
+            rect = self._rects[slot]
+            rect.center = (self._x[slot], self._y[slot] - self._offset_y[slot])
+            surface.set_alpha(self._alpha[slot])
+            screen.blit(surface, rect)
+
+    # --- Housekeeping ---
+    def _release(self, slot):
+        self._alive[slot] = 0
+        self._surfaces[slot] = None
+        self._free.append(slot)
+        self.active_count -= 1
+
+    def count(self, owner=None):
+        """Number of live texts (optionally only those tagged with `owner`)."""
+        if owner is None:
+            return self.active_count
+        return sum(1 for slot in range(self._high_water) if self._alive[slot] and self._owner[slot] == owner)
+
+    def clear(self, owner=None):
+        """Frees every live text (or only those tagged with `owner`)."""
+        for slot in range(self._high_water):
+            if self._alive[slot] and (owner is None or self._owner[slot] == owner):
+                self._release(slot)
+        while self._high_water and not self._alive[self._high_water - 1]:
+            self._high_water -= 1
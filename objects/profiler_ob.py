@@ -0,0 +1,183 @@
+# objects/profiler_ob.py
+import json
+import time
+from array import array
+
+import pygame
+
+from objects.memory_ob import SURFACES, SUBSYSTEM_OVERLAY
+
+SURF_OVERLAY = SURFACES.subsystem(SUBSYSTEM_OVERLAY)
+
+
+class FrameProfiler:
+    """
+    Per-phase frame profiler for the main loop.
+    The loop calls begin_frame(), then mark(phase) right after each phase finishes, then end_frame().
+    Samples go into fixed-size ring buffers (one array per phase), so nothing is allocated per frame.
+    While disabled every call returns on the first line.
+    """
+    def __init__(self, phase_names, capacity=300, frame_budget_ms=1000 / 30, hitch_ms=None):
+        self.phase_names = tuple(phase_names)
+        self.capacity = capacity
+        self.frame_budget_ms = frame_budget_ms
+        self.hitch_ms = hitch_ms if hitch_ms is not None else frame_budget_ms * 1.5
+
+        self.enabled = False
+        self.overlay_visible = False
+
+        # Ring buffers: per phase start offset (ms from frame start) and duration (ms), plus frame start/total
+        phase_count = len(self.phase_names)
+        self._phase_starts = [array('d', bytes(8 * capacity)) for _ in range(phase_count)]
+        self._phase_durations = [array('d', bytes(8 * capacity)) for _ in range(phase_count)]
+        self._frame_starts = array('d', bytes(8 * capacity))
+        self._frame_totals = array('d', bytes(8 * capacity))
+        self._write_index = 0
+        self._sample_count = 0
+
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+        self._clock_origin = time.perf_counter()
+
+        # Overlay text is only re-rendered every few frames
+        self.overlay_refresh_frames = 10
+        self._overlay_font = None
+        self._overlay_surface = None
+        self._frames_since_overlay_refresh = 0
+
+    # --- Recording ---
+    def set_enabled(self, enabled):
+        was_enabled = self.enabled
+        self.enabled = enabled
+        if enabled and not was_enabled:
+            self.reset()
+            self.begin_frame() # Toggled mid-frame: the first sample starts now
+
+    def reset(self):
+        self._write_index = 0
+        self._sample_count = 0
+        self._frames_since_overlay_refresh = self.overlay_refresh_frames
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._frame_start = now
+        self._last_mark = now
+        index = self._write_index
+        for durations in self._phase_durations:
+            durations[index] = 0.0
+
+    def mark(self, phase):
+        """Records the time since the previous mark as `phase` (an index into phase_names)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        index = self._write_index
+        if self._phase_durations[phase][index] == 0.0:
+            self._phase_starts[phase][index] = (self._last_mark - self._frame_start) * 1000.0
+        self._phase_durations[phase][index] += (now - self._last_mark) * 1000.0
+        self._last_mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        index = self._write_index
+        self._frame_starts[index] = (self._frame_start - self._clock_origin) * 1000.0
+        self._frame_totals[index] = (self._last_mark - self._frame_start) * 1000.0
+        self._write_index = (index + 1) % self.capacity
+        if self._sample_count < self.capacity:
+            self._sample_count += 1
+
+    # --- Statistics ---
+    def _ordered_indices(self):
+        """Ring indices from oldest to newest sample."""
+        start = (self._write_index - self._sample_count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self._sample_count)]
+
+    def _summarize(self, samples):
+        if not samples:
+            return 0.0, 0.0
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return sum(samples) / len(samples), p99
+
+    def summary(self, idle_phase=None):
+        """
+        Returns rolling stats over the ring buffer:
+        {'frames', 'frame_avg_ms', 'frame_p99_ms', 'hitches', 'phases': {name: (avg_ms, p99_ms)}}.
+        A hitch is a frame whose busy time (everything except `idle_phase`) exceeds hitch_ms.
+        """
+        indices = self._ordered_indices()
+        totals = [self._frame_totals[i] for i in indices]
+        busy = totals
+        if idle_phase is not None:
+            idle = self._phase_durations[idle_phase]
+            busy = [self._frame_totals[i] - idle[i] for i in indices]
+
+        frame_avg, frame_p99 = self._summarize(totals)
+        phases = {}
+        for phase, name in enumerate(self.phase_names):
+            durations = self._phase_durations[phase]
+            phases[name] = self._summarize([durations[i] for i in indices])
+
+        return {
+            'frames': len(indices),
+            'frame_avg_ms': frame_avg,
+            'frame_p99_ms': frame_p99,
+            'hitches': sum(1 for value in busy if value > self.hitch_ms),
+            'phases': phases,
+        }
+
+    # --- Overlay ---
+    def draw_overlay(self, screen, idle_phase=None):
+        """Draws rolling averages, p99 and hitch count in the top-left corner."""
+        if not (self.enabled and self.overlay_visible):
+            return
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.SysFont("Courier New", 14, bold=True)
+
+        self._frames_since_overlay_refresh += 1
+        if self._frames_since_overlay_refresh >= self.overlay_refresh_frames:
+            self._frames_since_overlay_refresh = 0
+            stats = self.summary(idle_phase)
+            lines = [
+                f"frame avg {stats['frame_avg_ms']:5.1f} p99 {stats['frame_p99_ms']:5.1f} ms",
+                f"hitches {stats['hitches']}/{stats['frames']} (> {self.hitch_ms:.0f} ms busy)",
+            ]
+            for name, (avg_ms, p99_ms) in stats['phases'].items():
+                lines.append(f"{name:<18}{avg_ms:6.2f}{p99_ms:7.2f}")
+            line_surfaces = [SURF_OVERLAY.add(self._overlay_font.render(line, True, (255, 255, 0))) for line in lines]
+            line_height = line_surfaces[0].get_height()
+            panel_width = max(surface.get_width() for surface in line_surfaces) + 8
+            panel = SURF_OVERLAY.add(pygame.Surface((panel_width, line_height * len(line_surfaces) + 8)))
+            panel.set_alpha(180)
+            panel.fill((0, 0, 0))
+            for i, surface in enumerate(line_surfaces):
+                panel.blit(surface, (4, 4 + i * line_height))
+            self._overlay_surface = panel
+
+        if self._overlay_surface:
+            screen.blit(self._overlay_surface, (0, 0))
+
+    # --- Export ---
+    def export_chrome_trace(self, file_path):
+        """
+        Writes the ring buffer as a Chrome trace (chrome://tracing / Perfetto) JSON file.
+        Each frame is one 'X' event with its phases nested inside it.
+        """
+        events = []
+        for i in self._ordered_indices():
+            frame_start_us = self._frame_starts[i] * 1000.0
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': frame_start_us, 'dur': self._frame_totals[i] * 1000.0})
+            for phase, name in enumerate(self.phase_names):
+                duration = self._phase_durations[phase][i]
+                if duration > 0.0:
+                    events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                                   'ts': frame_start_us + self._phase_starts[phase][i] * 1000.0,
+                                   'dur': duration * 1000.0})
+
+        with open(file_path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+        return len(events)
@@ -0,0 +1,76 @@
+# objects/session_ob.py
+from concurrent.futures import ThreadPoolExecutor
+
+from objects.catalog_ob import deal_session
+from objects.deck_ob import setup_new_game, CARDS_CSV_PATH
+from objects.trace_ob import TRACE, TRACE_DEBUG
+
+# --- Trace Events ---
+EV_SESSION_PREFETCH = TRACE.define("session.prefetch", TRACE_DEBUG, "Building next game session in the background.")
+EV_SESSION_WAITING = TRACE.define("session.waiting", TRACE_DEBUG, "Shuffle animation finished before the session was ready; waiting.")
+EV_SESSION_STALE = TRACE.define("session.stale", TRACE_DEBUG, "Prefetched session was dealt from catalog v{0}; redealing from v{1}.")
+
+
+class SessionLoader:
+    """
+    Builds the next game session (setup_new_game) on a worker thread so the title-screen click
+    never blocks the frame. prefetch() is called as soon as the title screen shows; the shuffling
+    screen polls ready() and then take()s the finished (hero, deck, unlocked pool, seed) tuple.
+    Session building never touches pygame, so it is safe off the main thread.
+    With `catalogs` (catalog_watch_ob.CatalogVersions) sessions are dealt from the live compiled
+    catalog instead of reading the CSV; a prefetched session whose version was replaced before
+    it was taken is dealt again, and take() records the version in `taken_version`.
+    """
+    def __init__(self, csv_file_path=CARDS_CSV_PATH, catalogs=None):
+        self.csv_file_path = csv_file_path
+        self.catalogs = catalogs
+        self.taken_version = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session")
+        self._future = None
+        self._future_version = None
+        self._future_seed = None
+        self._waiting_reported = False
+
+    def prefetch(self, game_seed=None):
+        """Starts building a session unless one is already pending or finished."""
+        if self._future is None:
+            if EV_SESSION_PREFETCH.on:
+                TRACE.emit(EV_SESSION_PREFETCH)
+            self._future_seed = game_seed
+            if self.catalogs is not None:
+                self._future_version = self.catalogs.current # Pinned: the deal uses this version even if it is swapped mid-build
+                self._future = self._executor.submit(deal_session, self._future_version.catalog, game_seed)
+            else:
+                self._future = self._executor.submit(setup_new_game, self.csv_file_path, game_seed)
+            self._waiting_reported = False
+
+    def _redeal_if_stale(self):
+        if self.catalogs is None or self._future is None or self._future_version is self.catalogs.current:
+            return
+        if EV_SESSION_STALE.on:
+            TRACE.emit(EV_SESSION_STALE, self._future_version.number, self.catalogs.current.number)
+        self._future.cancel()
+        self._future = None
+        self.prefetch(self._future_seed)
+
+    def ready(self):
+        """True once the pending session is built. Starts one if nothing was prefetched."""
+        self.prefetch()
+        self._redeal_if_stale()
+        done = self._future.done()
+        if not done and not self._waiting_reported:
+            self._waiting_reported = True
+            if EV_SESSION_WAITING.on:
+                TRACE.emit(EV_SESSION_WAITING)
+        return done
+
+    def take(self):
+        """Returns the built session (blocking if it is not ready yet) and clears the slot for the next one."""
+        self.prefetch()
+        self._redeal_if_stale()
+        future, self._future = self._future, None
+        self.taken_version = self._future_version
+        return future.result() # Re-raises anything setup_new_game raised
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,221 @@
+# objects/shared_catalog_ob.py
+import struct
+import sys
+from multiprocessing import shared_memory
+
+from objects.catalog_ob import CardCatalog, EXIT_CARD_TYPE, np, _require_numpy
+from objects.deck_ob import Card
+from objects.trace_ob import TRACE, TRACE_DEBUG
+
+# --- Trace Events ---
+EV_SHARED_CATALOG_PUBLISHED = TRACE.define("shared_catalog.published", TRACE_DEBUG, "Card catalog shared as {0} ({1} bytes, {2} cards, {3} strings)")
+
+MAGIC = b"DGCAT\0\0\1"
+HEADER = struct.Struct("<8s8i") # magic, cards, themes, deck ids, card order ids, strings, string bytes, exit id, max deck size
+STRING_COLUMNS = ("theme", "card_type", "name")
+NUMBER_COLUMNS = ("health", "attack", "defense", "cost", "xp_gain", "inventory_boost")
+ITEM = "i" # Every column is native int32; a card id, string id or stat always fits
+ITEM_SIZE = struct.calcsize(ITEM)
+
+
+def _layout(cards, themes, deck_ids, order_ids, strings):
+    """Byte offsets of every int32 section after the header, in order, and the offset of the string bytes."""
+    offsets = {}
+    position = HEADER.size
+    for section, length in (("columns", cards * (len(STRING_COLUMNS) + len(NUMBER_COLUMNS))),
+                            ("themes", themes), ("deck_starts", themes + 1), ("deck_ids", deck_ids),
+                            ("card_order", order_ids), ("string_starts", strings + 1)):
+        offsets[section] = (position, length)
+        position += length * ITEM_SIZE
+    return offsets, position
+
+
+class SharedCatalog:
+    """
+    A CardCatalog laid out once in multiprocessing.shared_memory, for pools of worker processes.
+
+    Cards are fixed-width int32 columns (string columns hold ids into one table of interned
+    strings), theme decks are one flat id array plus start offsets, and the string table is
+    offsets plus UTF-8 bytes. publish() writes the block in the parent; attach(name) in a worker
+    maps it and exposes the columns as memoryviews over the shared pages, so a worker neither
+    reads the CSV nor holds its own copy of the data. Only the few dozen theme, type and name
+    strings are decoded per process.
+
+    Reads like a CardCatalog: themes, theme_decks, exit_id, max_deck_size, card_order, card_types,
+    health/attack/defense/xp_gain, definitions, card(id), arrays() and len(). The publisher must
+    close() and unlink() it when the pool is done (a `with` block does both).
+    """
+    def __init__(self, shm, owner=False):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name
+        self._views = []
+        magic, cards, themes, deck_ids, order_ids, strings, string_bytes, exit_id, max_deck_size = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"shared memory block {shm.name} is not a shared card catalog")
+        offsets, string_offset = _layout(cards, themes, deck_ids, order_ids, strings)
+
+        def ints(section):
+            start, length = offsets[section]
+            view = shm.buf[start:start + length * ITEM_SIZE].cast(ITEM)
+            self._views.append(view)
+            return view
+
+        columns = ints("columns")
+        self._columns = {}
+        for index, column in enumerate(STRING_COLUMNS + NUMBER_COLUMNS):
+            view = columns[index * cards:(index + 1) * cards]
+            self._views.append(view)
+            self._columns[column] = view
+
+        string_starts = ints("string_starts")
+        raw = shm.buf[string_offset:string_offset + string_bytes]
+        self.strings = tuple(sys.intern(bytes(raw[string_starts[i]:string_starts[i + 1]]).decode("utf-8"))
+                             for i in range(strings))
+        raw.release()
+
+        self.exit_id = exit_id if exit_id >= 0 else None
+        self.max_deck_size = max_deck_size
+        self.themes = [self.strings[string_id] for string_id in ints("themes")]
+        deck_starts = ints("deck_starts")
+        flat_decks = ints("deck_ids")
+        self.theme_decks = []
+        for index in range(themes):
+            view = flat_decks[deck_starts[index]:deck_starts[index + 1]]
+            self._views.append(view)
+            self.theme_decks.append(view)
+        self.card_order = ints("card_order")
+
+        strings = self.strings
+        self.card_types = [strings[string_id] for string_id in self._columns["card_type"]]
+        self.health = self._columns["health"]
+        self.attack = self._columns["attack"]
+        self.defense = self._columns["defense"]
+        self.xp_gain = self._columns["xp_gain"]
+        self.definitions = _Definitions(self)
+
+    # --- Publishing and Attaching ---
+    @classmethod
+    def publish(cls, catalog, name=None):
+        """Copies `catalog` (a CardCatalog) into a new shared memory block. The caller owns the block."""
+        strings, string_ids = [], {}
+
+        def intern(text):
+            string_id = string_ids.get(text)
+            if string_id is None:
+                string_id = string_ids[text] = len(strings)
+                strings.append(text)
+            return string_id
+
+        cards = len(catalog.definitions)
+        columns = []
+        for position in (0, 1, 8): # theme, type, name
+            columns.extend(intern(definition[position]) for definition in catalog.definitions)
+        for position in (2, 3, 4, 5, 6, 7): # health, attack, defense, cost, xp_gain, inventory_boost
+            columns.extend(definition[position] for definition in catalog.definitions)
+        theme_ids = [intern(theme) for theme in catalog.themes]
+        deck_starts = [0]
+        for theme_deck in catalog.theme_decks:
+            deck_starts.append(deck_starts[-1] + len(theme_deck))
+        deck_ids = [card_id for theme_deck in catalog.theme_decks for card_id in theme_deck]
+        encoded = [text.encode("utf-8") for text in strings]
+        string_starts = [0]
+        for data in encoded:
+            string_starts.append(string_starts[-1] + len(data))
+
+        offsets, string_offset = _layout(cards, len(theme_ids), len(deck_ids), len(catalog.card_order), len(strings))
+        size = string_offset + string_starts[-1]
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, size))
+        try:
+            HEADER.pack_into(shm.buf, 0, MAGIC, cards, len(theme_ids), len(deck_ids), len(catalog.card_order),
+                             len(strings), string_starts[-1], -1 if catalog.exit_id is None else catalog.exit_id,
+                             catalog.max_deck_size)
+            for section, values in (("columns", columns), ("themes", theme_ids), ("deck_starts", deck_starts),
+                                    ("deck_ids", deck_ids), ("card_order", catalog.card_order),
+                                    ("string_starts", string_starts)):
+                start, length = offsets[section]
+                struct.pack_into(f"{length}{ITEM}", shm.buf, start, *values)
+            shm.buf[string_offset:size] = b"".join(encoded)
+            shared = cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        if EV_SHARED_CATALOG_PUBLISHED.on:
+            TRACE.emit(EV_SHARED_CATALOG_PUBLISHED, shm.name, size, cards, len(strings))
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        """Maps the block another process published under `name`. Nothing is copied but the strings."""
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def close(self):
+        """Releases this process's mapping (the views go first; an exported buffer can't be unmapped)."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._shm.close()
+
+    def unlink(self):
+        """Frees the block for every process. Only the publisher calls this, once the workers are done."""
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    # --- CardCatalog Interface ---
+    def __len__(self):
+        return len(self.card_types)
+
+    def definition(self, card_id):
+        """The raw card tuple (theme, type, hp, atk, def, cost, xp, inv, name) for `card_id`."""
+        columns, strings = self._columns, self.strings
+        return (strings[columns["theme"][card_id]], strings[columns["card_type"][card_id]],
+                columns["health"][card_id], columns["attack"][card_id], columns["defense"][card_id],
+                columns["cost"][card_id], columns["xp_gain"][card_id], columns["inventory_boost"][card_id],
+                strings[columns["name"][card_id]])
+
+    def card(self, card_id):
+        """A fresh Card for `card_id` (cards carry per-fight state, so they are never shared)."""
+        return Card(*self.definition(card_id))
+
+    def arrays(self):
+        """The stat columns as NumPy arrays over the shared pages (no copy), indexed by card id."""
+        _require_numpy()
+        return {
+            "health": np.frombuffer(self.health, dtype=np.int32),
+            "attack": np.frombuffer(self.attack, dtype=np.int32),
+            "defense": np.frombuffer(self.defense, dtype=np.int32),
+            "xp_gain": np.frombuffer(self.xp_gain, dtype=np.int32),
+            "is_exit": np.array([card_type == EXIT_CARD_TYPE for card_type in self.card_types]),
+        }
+
+
+class _Definitions:
+    """CardCatalog.definitions for a SharedCatalog: raw card tuples built on access from the shared columns."""
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __len__(self):
+        return len(self._catalog)
+
+    def __getitem__(self, card_id):
+        if card_id < 0:
+            card_id += len(self)
+        if not 0 <= card_id < len(self):
+            raise IndexError("card id out of range")
+        return self._catalog.definition(card_id)
+
+    def __iter__(self):
+        return (self._catalog.definition(card_id) for card_id in range(len(self)))
+
+
+def share_catalog(csv_file_path):
+    """Parses `csv_file_path` once and publishes it. Use as `with share_catalog(path) as shared:`."""
+    return SharedCatalog.publish(CardCatalog(csv_file_path))
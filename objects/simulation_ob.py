@@ -0,0 +1,116 @@
+# objects/simulation_ob.py
+from objects.battle_ob import guard_against_endless_fight, FightMemo, FIGHT_VICTORY, FIGHT_DEFEAT
+from objects.catalog_ob import deck_for_seed, EXIT_CARD_TYPE
+from objects.deck_ob import Hero
+from objects.inventory_ob import apply_equipment
+from objects.level_ob import apply_level_up
+
+# --- Run Events (tuples, first item is the kind) ---
+RUN_START = "start" # (RUN_START, theme, seed)
+RUN_FIGHT = "fight" # (RUN_FIGHT, enemy card, FightResult)
+RUN_BROKE = "broke" # (RUN_BROKE, equipment card) after the fight it broke in
+RUN_EQUIPMENT = "equipment" # (RUN_EQUIPMENT, card, outcome, amount) - see inventory_ob.apply_equipment
+RUN_LEVEL_UP = "level_up" # (RUN_LEVEL_UP, card, [(stat, amount)] or None when XP was short)
+RUN_EXIT = "exit" # (RUN_EXIT, hero) - survived
+RUN_DEFEAT = "defeat" # (RUN_DEFEAT, enemy card, hero)
+RUN_STALEMATE = "stalemate" # (RUN_STALEMATE, enemy card, hero) - a fight nobody could win; the run ends there
+
+RUN_END_EVENTS = (RUN_EXIT, RUN_DEFEAT, RUN_STALEMATE)
+
+FIGHT_MEMO = FightMemo() # Per process; headless runs share it unless given another `fight`
+
+
+def run_events(hero, deck, theme=None, seed=None, fight=FIGHT_MEMO.resolve):
+    """
+    Plays `deck` (any iterable of Cards) with the game's rules and no drawing, as the player would
+    by clicking through it, and yields one event per thing that happened. Ends with RUN_EXIT,
+    RUN_DEFEAT or RUN_STALEMATE. `fight(hero, enemy)` resolves combat and returns a FightResult;
+    the default, FIGHT_MEMO.resolve, skips fights it has already seen (pass battle_ob.resolve_fight
+    to play every one).
+    """
+    yield (RUN_START, theme, seed)
+    for card in deck:
+        if card.card_type == "enemy":
+            guard_against_endless_fight(hero, card)
+            result = fight(hero, card)
+            yield (RUN_FIGHT, card, result)
+            for broken_card in result.broken:
+                yield (RUN_BROKE, broken_card)
+            if result.outcome == FIGHT_VICTORY:
+                hero.experience += card.xp_gain
+            elif result.outcome == FIGHT_DEFEAT:
+                yield (RUN_DEFEAT, card, hero)
+                return
+            else:
+                yield (RUN_STALEMATE, card, hero)
+                return
+        elif card.card_type == "equipment":
+            outcome, amount = apply_equipment(hero, card)
+            yield (RUN_EQUIPMENT, card, outcome, amount)
+        elif card.card_type == "level up":
+            yield (RUN_LEVEL_UP, card, apply_level_up(hero, card))
+        elif card.card_type == EXIT_CARD_TYPE:
+            break
+    yield (RUN_EXIT, hero) # Also reached if a deck has no exit card and runs out
+
+
+def seed_events(catalog, seed, fight=FIGHT_MEMO.resolve):
+    """run_events() for the deck setup_new_game(game_seed=seed) would deal, built from `catalog`."""
+    theme_index, card_ids, _ = deck_for_seed(catalog, seed)
+    theme = catalog.themes[theme_index] if catalog.themes else None
+    # Cards are built as they are drawn, so nothing past the exit or a defeat is ever made
+    return run_events(Hero(), (catalog.card(card_id) for card_id in card_ids), theme, seed, fight)
+
+
+class RunSummary:
+    """The numbers the leaderboards and balance tools care about, taken from a run's events."""
+    __slots__ = ("theme", "seed", "survived", "stalemate", "xp", "cards_cleared", "fights", "rounds",
+                 "damage_taken", "items_broken", "level_ups")
+
+    def __init__(self):
+        self.theme = None
+        self.seed = None
+        self.survived = False
+        self.stalemate = False
+        self.xp = 0 # All XP earned, including XP spent on level-ups
+        self.cards_cleared = 0
+        self.fights = 0
+        self.rounds = 0
+        self.damage_taken = 0
+        self.items_broken = 0
+        self.level_ups = 0
+
+
+def summarize_run(events):
+    """Consumes a run's events and returns its RunSummary."""
+    summary = RunSummary()
+    for event in events:
+        kind = event[0]
+        if kind == RUN_FIGHT:
+            result = event[2]
+            summary.fights += 1
+            summary.rounds += result.rounds
+            summary.damage_taken += result.damage_taken
+            if result.outcome == FIGHT_VICTORY:
+                summary.cards_cleared += 1
+        elif kind == RUN_BROKE:
+            summary.items_broken += 1
+        elif kind == RUN_EQUIPMENT:
+            summary.cards_cleared += 1
+        elif kind == RUN_LEVEL_UP:
+            summary.cards_cleared += 1
+            if event[2] is not None:
+                summary.level_ups += 1
+        elif kind == RUN_START:
+            summary.theme, summary.seed = event[1], event[2]
+        else:
+            hero = event[-1]
+            summary.survived = kind == RUN_EXIT
+            summary.stalemate = kind == RUN_STALEMATE
+            summary.xp = hero.experience + hero.experience_spent
+    return summary
+
+
+def simulate_seed(catalog, seed, fight=FIGHT_MEMO.resolve):
+    """The RunSummary of the run setup_new_game(game_seed=seed) deals."""
+    return summarize_run(seed_events(catalog, seed, fight))
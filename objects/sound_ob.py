@@ -0,0 +1,132 @@
+# objects/sound_ob.py
+import hashlib
+import os
+import time
+
+import pygame
+
+from objects.trace_ob import TRACE, TRACE_DEBUG, TRACE_WARNING
+
+# --- Trace Events ---
+EV_SOUND_BANK_LOADED = TRACE.define("sound.bank_loaded", TRACE_DEBUG, "Sound bank: {0} effect(s), {1} from the PCM cache, in {2:.1f} ms ({3} Hz, {4}-bit, {5} ch)")
+EV_SOUND_LOAD_FAILED = TRACE.define("sound.load_failed", TRACE_WARNING, "Error loading sound effect '{0}': {1}\nPlease ensure the sound file exists and is a valid audio file.")
+EV_SOUND_CACHE_FAILED = TRACE.define("sound.cache_failed", TRACE_WARNING, "Could not write PCM cache {0}: {1}")
+
+SOUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "sounds")
+DEFAULT_SFX_CHANNELS = 6 # Reserved for effects; the rest stay free for anything calling find_channel()
+
+
+class SoundEffect:
+    """One effect in the bank: its Sound, the most copies that may play at once, and the channels playing it."""
+    __slots__ = ("name", "sound", "max_voices", "voices")
+
+    def __init__(self, name, sound, max_voices):
+        self.name = name
+        self.sound = sound
+        self.max_voices = max_voices
+        self.voices = [] # Channels started for this effect, oldest first
+
+
+class SoundBank:
+    """
+    Sound effects decoded once into the mixer's own sample rate, sample size and channel count,
+    and played through a fixed pool of reserved channels.
+
+    The converted PCM is cached in `cache_dir` under a key made of the source file's hash and the
+    mixer format, so later starts skip MP3/WAV decoding and resampling altogether, and a changed
+    file or mixer setting simply misses. play() keeps at most `max_voices` copies of an effect
+    sounding (the oldest is cut off for the new one) and, when the pool is full, takes over the
+    channel that started longest ago, so rapid clicks never stack unbounded overlapping copies.
+    """
+    def __init__(self, cache_dir=SOUND_CACHE_DIR, channels=DEFAULT_SFX_CHANNELS):
+        self.cache_dir = cache_dir
+        self.effects = {}
+        self.cache_hits = 0
+        self.load_ms = 0.0
+        self.mixer_format = pygame.mixer.get_init() # (frequency, size, channels), or None without audio
+        if self.mixer_format is not None and pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)] if self.mixer_format else []
+        if self.channels:
+            pygame.mixer.set_reserved(channels) # Sound.play() and find_channel() never pick these
+        self._started = {} # id(channel) -> when it was last started, for stealing the oldest
+
+    def _cache_path(self, data):
+        frequency, size, channels = self.mixer_format
+        digest = hashlib.sha1(data).hexdigest()
+        sample = f"{'s' if size < 0 else 'u'}{abs(size)}" # Negative sizes are signed samples
+        return os.path.join(self.cache_dir, f"{digest}-{frequency}-{sample}-{channels}.pcm")
+
+    def _decode(self, path):
+        """The file as mixer-format PCM bytes, from the cache when it has them."""
+        with open(path, "rb") as sound_file:
+            data = sound_file.read()
+        cache_path = self._cache_path(data)
+        try:
+            with open(cache_path, "rb") as cache_file:
+                pcm = cache_file.read()
+            self.cache_hits += 1
+            return pcm
+        except OSError:
+            pass
+        pcm = pygame.mixer.Sound(file=path).get_raw() # Decodes and converts to the mixer format
+        temporary_path = cache_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(pcm)
+            os.replace(temporary_path, cache_path)
+        except OSError as e:
+            if EV_SOUND_CACHE_FAILED.on:
+                TRACE.emit(EV_SOUND_CACHE_FAILED, cache_path, e)
+        return pcm
+
+    def load(self, name, path, volume=1.0, max_voices=2):
+        """Adds an effect. Returns False (and traces why) if it can't be loaded; play() then ignores the name."""
+        if self.mixer_format is None:
+            return False
+        started = time.perf_counter()
+        try:
+            sound = pygame.mixer.Sound(buffer=self._decode(path))
+        except (OSError, pygame.error) as e:
+            if EV_SOUND_LOAD_FAILED.on:
+                TRACE.emit(EV_SOUND_LOAD_FAILED, name, e)
+            return False
+        sound.set_volume(volume)
+        self.effects[name] = SoundEffect(name, sound, max(1, max_voices))
+        self.load_ms += (time.perf_counter() - started) * 1000
+        return True
+
+    def report_loaded(self):
+        if EV_SOUND_BANK_LOADED.on and self.mixer_format is not None:
+            frequency, size, channels = self.mixer_format
+            TRACE.emit(EV_SOUND_BANK_LOADED, len(self.effects), self.cache_hits, self.load_ms, frequency, abs(size), channels)
+
+    def _free_channel(self):
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        return min(self.channels, key=lambda channel: self._started.get(id(channel), 0.0)) # Steal the oldest
+
+    def play(self, name):
+        """Plays an effect on the reserved pool, respecting its voice limit. Unknown names are ignored."""
+        effect = self.effects.get(name)
+        if effect is None:
+            return None
+        voices = [channel for channel in effect.voices if channel.get_busy() and channel.get_sound() is effect.sound]
+        if len(voices) >= effect.max_voices:
+            channel = voices.pop(0) # Restart the oldest copy rather than layer another on top
+        else:
+            channel = self._free_channel()
+            for other in self.effects.values():
+                if other is not effect and channel in other.voices:
+                    other.voices.remove(channel)
+        channel.play(effect.sound)
+        self._started[id(channel)] = time.perf_counter()
+        voices.append(channel)
+        effect.voices = voices
+        return channel
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
@@ -0,0 +1,155 @@
+# objects/story_ob.py
+import random
+
+from objects.battle_ob import FIGHT_VICTORY
+from objects.inventory_ob import (EQUIP_HEALED, EQUIP_HEALED_AND_SOLD, EQUIP_POTION_SOLD, EQUIP_BAG,
+                                  EQUIP_EQUIPPED, EQUIP_SOLD)
+from objects.level_ob import LEVEL_STAT_HEALTH, LEVEL_STAT_ATTACK, LEVEL_STAT_DEFENSE
+from objects.simulation_ob import (RUN_START, RUN_FIGHT, RUN_BROKE, RUN_EQUIPMENT, RUN_LEVEL_UP,
+                                   RUN_EXIT, RUN_DEFEAT, RUN_STALEMATE)
+
+# --- Theme Flavour (filled into the templates once per theme) ---
+THEME_FLAVOUR = {
+    "Cave": {"place": "the cave", "gloom": "water drips somewhere in the dark", "way_out": "a cold draft from the surface"},
+    "Crypt": {"place": "the crypt", "gloom": "dust lies thick on the old tombs", "way_out": "worn steps climbing to the chapel"},
+    "Forest": {"place": "the forest", "gloom": "the branches close in overhead", "way_out": "a break in the trees"},
+    "Graveyard": {"place": "the graveyard", "gloom": "mist curls between the headstones", "way_out": "the rusted cemetery gate"},
+    "Hideout": {"place": "the hideout", "gloom": "a lantern gutters in the corridor", "way_out": "a hatch left unbarred"},
+}
+
+
+def default_flavour(theme):
+    """Flavour for a theme cards.csv has that THEME_FLAVOUR doesn't know yet."""
+    place = f"the {theme.lower()}" if theme else "the dungeon"
+    return {"place": place, "gloom": "something moves just out of sight", "way_out": f"the way out of {place}"}
+
+
+# --- Templates: run fields in {braces}, theme fields filled in by compile_templates() ---
+STORY_TEMPLATES = {
+    "start": (
+        "Seed {seed}. The hero steps into {place}; {gloom}.",
+        "Seed {seed}. Torch raised, the hero descends into {place}, where {gloom}.",
+    ),
+    "victory": (
+        "Ahead, {a_enemy} bars the way and falls {how}.",
+        "The hero meets {a_enemy} in {place} and cuts it down {how}.",
+    ),
+    "broke": (
+        "The {item} breaks and is left behind.",
+        "With a crack, the {item} gives out.",
+    ),
+    EQUIP_HEALED: (
+        "The {item} mends {amount} HP.",
+        "A moment's rest and the {item}: {amount} HP back.",
+    ),
+    EQUIP_HEALED_AND_SOLD: (
+        "The {item} mends {amount} HP and the rest is sold for XP.",
+    ),
+    EQUIP_POTION_SOLD: (
+        "Unhurt, the hero sells the {item} for {amount} XP.",
+    ),
+    EQUIP_BAG: (
+        "A {item} makes room for {amount} more item(s).",
+    ),
+    EQUIP_EQUIPPED: (
+        "The hero takes up the {item}.",
+        "The {item} is strapped on.",
+    ),
+    EQUIP_SOLD: (
+        "With no room to carry it, the {item} is sold for {amount} XP.",
+    ),
+    "level_up": (
+        "{item}: {boosts}.",
+        "In {place}, the hero learns {item}: {boosts}.",
+    ),
+    "level_up_denied": (
+        "The hero finds {item} but lacks the experience to learn it.",
+    ),
+    "exit": (
+        "At last, {way_out}. The hero leaves {place} with {xp} XP earned.",
+        "The hero follows {way_out} out of {place}, {xp} XP richer.",
+    ),
+    "defeat": (
+        "The {enemy} is too much. The hero falls in {place} with {xp} XP earned.",
+        "In {place}, {a_enemy} ends the journey. {xp} XP earned.",
+    ),
+    "stalemate": (
+        "Neither the hero nor the {enemy} can wound the other; the hero turns back from {place} with {xp} XP earned.",
+    ),
+}
+
+BOOST_NAMES = {LEVEL_STAT_HEALTH: "Max HP", LEVEL_STAT_ATTACK: "Min ATK", LEVEL_STAT_DEFENSE: "Min DEF"}
+
+
+class _KeepRunFields(dict):
+    """format_map() mapping that leaves fields it doesn't have as {field} for the run to fill in."""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def compile_templates(theme, flavour=None):
+    """STORY_TEMPLATES with `theme`'s flavour filled in, as {kind: tuple of bound str.format}."""
+    fields = _KeepRunFields(flavour or THEME_FLAVOUR.get(theme) or default_flavour(theme))
+    return {kind: tuple(template.format_map(fields).format for template in variants)
+            for kind, variants in STORY_TEMPLATES.items()}
+
+
+def _a(name):
+    return ("an " if name[:1] in "AEIOU" else "a ") + name
+
+
+def _how(rounds):
+    return "in a single blow" if rounds == 1 else f"after {rounds} exchanges"
+
+
+class StoryTeller:
+    """
+    Turns a run's events (simulation_ob.run_events) into prose. The templates for every theme
+    in the catalog are compiled once up front; tell() is a generator yielding the story a sentence
+    at a time, so a caller can write it out without holding the whole text.
+    """
+    def __init__(self, themes):
+        self.templates = {theme: compile_templates(theme) for theme in themes}
+
+    def _templates(self, theme):
+        templates = self.templates.get(theme)
+        if templates is None:
+            templates = self.templates[theme] = compile_templates(theme)
+        return templates
+
+    def tell(self, events):
+        """Yields the story for `events` piece by piece; the last piece ends with a blank line."""
+        templates = None
+        rng = None
+        for event in events:
+            kind = event[0]
+            if kind == RUN_START:
+                templates = self._templates(event[1])
+                rng = random.Random(event[2]) # Same seed, same wording
+                yield rng.choice(templates["start"])(seed=event[2])
+            elif kind == RUN_FIGHT:
+                result = event[2]
+                if result.outcome == FIGHT_VICTORY:
+                    yield " " + rng.choice(templates["victory"])(a_enemy=_a(event[1].name), how=_how(result.rounds))
+            elif kind == RUN_BROKE:
+                yield " " + rng.choice(templates["broke"])(item=event[1].name)
+            elif kind == RUN_EQUIPMENT:
+                variants = templates.get(event[2])
+                if variants:
+                    yield " " + rng.choice(variants)(item=event[1].name, amount=event[3])
+            elif kind == RUN_LEVEL_UP:
+                boosts = event[2]
+                if boosts is None:
+                    yield " " + rng.choice(templates["level_up_denied"])(item=event[1].name)
+                elif boosts:
+                    yield " " + rng.choice(templates["level_up"])(
+                        item=event[1].name, boosts=", ".join(f"+{amount} {BOOST_NAMES[stat]}" for stat, amount in boosts))
+            else:
+                hero = event[-1]
+                xp = hero.experience + hero.experience_spent
+                if kind == RUN_EXIT:
+                    yield " " + rng.choice(templates["exit"])(xp=xp) + "\n\n"
+                elif kind == RUN_DEFEAT:
+                    yield " " + rng.choice(templates["defeat"])(enemy=event[1].name, a_enemy=_a(event[1].name), xp=xp) + "\n\n"
+                elif kind == RUN_STALEMATE:
+                    yield " " + rng.choice(templates["stalemate"])(enemy=event[1].name, xp=xp) + "\n\n"
@@ -0,0 +1,353 @@
+# objects/timeline_ob.py
+import bisect
+import random
+
+import pygame
+
+
+# --- Clocks ---
+class SystemClock:
+    """Real time in milliseconds (pygame.time.get_ticks)."""
+    def now(self):
+        return pygame.time.get_ticks()
+
+
+class ManualClock:
+    """A clock that only moves when told to, for tests, simulations and the render harness."""
+    def __init__(self, start_ms=0):
+        self._now = float(start_ms)
+
+    def now(self):
+        return int(self._now) # Whole milliseconds, like get_ticks
+
+    def advance(self, ms):
+        self._now += ms
+
+    def set(self, ms):
+        self._now = float(ms)
+
+
+TIME_SCALE_INSTANT = float('inf')
+INSTANT_FRAME_MS = 60000 # Game time per frame in instant mode: longer than any timer or animation
+
+
+class ScaledClock:
+    """
+    Game time running `scale` times faster than `base` (the system clock by default).
+    Changing the scale keeps game time continuous. In instant mode (TIME_SCALE_INSTANT) every
+    reading jumps INSTANT_FRAME_MS ahead, so each timer and animation ends on the next tick.
+    """
+    def __init__(self, base=None, scale=1.0):
+        self.base = base or SystemClock()
+        self.scale = scale
+        self._origin_game = float(self.base.now())
+        self._origin_base = self.base.now()
+
+    def now(self):
+        if self.scale == TIME_SCALE_INSTANT:
+            self._origin_game += INSTANT_FRAME_MS
+            return int(self._origin_game)
+        return int(self._origin_game + (self.base.now() - self._origin_base) * self.scale)
+
+    def set_scale(self, scale):
+        if self.scale != TIME_SCALE_INSTANT:
+            self._origin_game += (self.base.now() - self._origin_base) * self.scale
+        self._origin_base = self.base.now()
+        self.scale = scale
+
+
+def parse_time_scale(value, default=1.0):
+    """'instant' or a positive number ('10', '0.5') -> scale. Anything else falls back to `default`."""
+    if value is None:
+        return default
+    value = str(value).strip().lower()
+    if value == "instant":
+        return TIME_SCALE_INSTANT
+    try:
+        scale = float(value.rstrip("x"))
+    except ValueError:
+        return default
+    return scale if scale > 0 else default
+
+
+def describe_time_scale(scale):
+    return "instant" if scale == TIME_SCALE_INSTANT else f"{scale:g}x"
+
+
+# --- Curves ---
+def zoom_fade(elapsed, duration):
+    """
+    The pop-up text curve used by combat text and the inventory/level-up pop-ups:
+    zoom from 0.1 to 1.0 over the first half, then fade out over the second half.
+    Returns (scale, alpha).
+    """
+    half = duration * 0.5
+    if elapsed < half:
+        return 0.1 + (0.9 * (elapsed / half)), 255
+    fade_progress = (elapsed - half) / half
+    alpha = int(255 * (1.0 - fade_progress))
+    return 1.0, max(0, min(255, alpha))
+
+
+# --- Tweens ---
+class Tween:
+    """
+    A timed animation owned by whoever created it and replayed with Timeline.play().
+    The timeline fills in elapsed/progress on every tick; subclasses compute their values in _apply().
+    """
+    def __init__(self, duration, on_finish=None):
+        self.duration = duration
+        self.on_finish = on_finish # Called with the tween when it runs to the end (not when stopped)
+        self.start_time = 0
+        self.end_time = 0
+        self.elapsed = 0
+        self.active = False
+        self.finished = False
+
+    def _update(self, now):
+        self.elapsed = min(now - self.start_time, self.duration)
+        self._apply()
+
+    def _apply(self):
+        pass
+
+    @property
+    def progress(self):
+        return self.elapsed / self.duration if self.duration else 1.0
+
+
+class ZoomFadeTween(Tween):
+    """Scale and alpha of a zoom-in / fade-out pop-up (see zoom_fade)."""
+    def __init__(self, duration=2000):
+        super().__init__(duration)
+        self.scale = 0.0
+        self.alpha = 0
+
+    def _apply(self):
+        if self.finished:
+            self.scale, self.alpha = 0.0, 0
+        else:
+            self.scale, self.alpha = zoom_fade(self.elapsed, self.duration)
+
+
+class ShakeTween(Tween):
+    """A short shake; offset() returns a new random offset every call while the shake is running."""
+    def __init__(self, duration=200, intensity=5, rng=None):
+        super().__init__(duration)
+        self.intensity = intensity
+        self.rng = rng or random # Shared module RNG unless a seeded one is passed in
+        self.target = None
+
+    def offset(self):
+        if not self.active:
+            return 0, 0
+        return (self.rng.randint(-self.intensity, self.intensity),
+                self.rng.randint(-self.intensity, self.intensity))
+
+
+class StepTimer:
+    """
+    One-shot stand-in for pygame.time.set_timer() that runs on timeline logic time, so turn delays
+    follow the time scale. set(ms) arms it and set(0) cancels; once `ms` have passed, take()
+    returns True once. Polled from a FixedStepper step callback, so the rules it drives run in
+    the step that reaches the deadline instead of a frame later through the event queue.
+    """
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.due = False
+        self.tween = Tween(0, on_finish=self._fire)
+
+    def set(self, ms):
+        self.due = False
+        if ms > 0:
+            self.timeline.play(self.tween, ms)
+        else:
+            self.timeline.stop(self.tween)
+
+    def take(self):
+        """True once after the timer has run out."""
+        due, self.due = self.due, False
+        return due
+
+    def _fire(self, tween):
+        self.due = True
+
+
+# --- Timeline ---
+class Timeline:
+    """
+    Samples its clock once per tick() and advances every playing tween from one list kept sorted
+    by end time, so finished tweens are always at the front and are retired without a scan.
+    Batch systems (the floating text pool) are added as tickers and get update(now) once per tick
+    while they have anything alive.
+
+    `now` is logic time: timers fire and tweens finish only when it is advanced (tick() or a
+    FixedStepper step). sample(t) updates what is drawn for a moment a little past `now` without
+    firing anything; `render_now` is the time the visuals were last sampled at.
+    """
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+        self.now = self.clock.now()
+        self.render_now = self.now
+        self._tweens = [] # Playing tweens, sorted by end_time
+        self._end_times = [] # Parallel list of end times for bisect
+        self._tickers = []
+
+    def play(self, tween, duration=None):
+        """(Re)starts `tween` at the current timeline time."""
+        if tween.active:
+            self._remove(tween)
+        if duration is not None:
+            tween.duration = duration
+        tween.start_time = self.now
+        tween.end_time = self.now + tween.duration
+        tween.active = True
+        tween.finished = False
+        tween._update(self.now)
+        index = bisect.bisect_right(self._end_times, tween.end_time)
+        self._end_times.insert(index, tween.end_time)
+        self._tweens.insert(index, tween)
+        return tween
+
+    def stop(self, tween):
+        """Stops `tween` without marking it finished."""
+        if tween.active:
+            self._remove(tween)
+            tween.active = False
+
+    def _remove(self, tween):
+        index = bisect.bisect_left(self._end_times, tween.end_time)
+        while self._tweens[index] is not tween:
+            index += 1
+        del self._tweens[index]
+        del self._end_times[index]
+
+    def add_ticker(self, ticker):
+        if ticker not in self._tickers:
+            self._tickers.append(ticker)
+
+    def tick(self):
+        """Samples the clock and advances everything. Call once per frame, before updating or drawing."""
+        return self.advance_to(self.clock.now())
+
+    def advance_to(self, now, sample=True):
+        """
+        Moves logic time to `now`: retires finished tweens and runs their on_finish. With `sample`
+        the playing tweens and tickers are updated for drawing too; fixed logic steps skip that and
+        leave it to one sample() per rendered frame.
+        """
+        self.now = now
+
+        # Retire finished tweens (all at the front)
+        done = bisect.bisect_right(self._end_times, now)
+        if done:
+            finished = self._tweens[:done]
+            del self._tweens[:done]
+            del self._end_times[:done]
+            for tween in finished:
+                tween.active = False
+                tween.finished = True
+                tween._update(now)
+                if tween.on_finish:
+                    tween.on_finish(tween)
+
+        if sample:
+            self.sample(now)
+        return now
+
+    def sample(self, now):
+        """Updates playing tweens and tickers as they look at `now` (>= the logic time); nothing finishes or fires."""
+        self.render_now = now
+        for tween in self._tweens:
+            tween._update(now)
+
+        for ticker in self._tickers:
+            if ticker.active_count:
+                ticker.update(now)
+
+    def clear(self):
+        """Stops every tween (used when a scripted session restarts)."""
+        for tween in self._tweens:
+            tween.active = False
+        self._tweens.clear()
+        self._end_times.clear()
+
+    def __len__(self):
+        return len(self._tweens)
+
+
+# --- Fixed Timestep ---
+LOGIC_STEP_MS = 1000 / 120 # Logic rate, independent of the frame rate
+MAX_CATCH_UP_MS = 500 # Most real time one frame may catch up on; game time past that is dropped
+
+
+class FixedStepper:
+    """
+    Advances a timeline's logic time in fixed steps of `step_ms` game time with an accumulator.
+    Each call to advance() adds the game time since the last call and runs as many whole steps as
+    fit, so a slow frame runs several steps and a fast one may run none; timers and tweens then
+    finish at the same moments whatever the frame rate. The leftover (`alpha` of a step) is where
+    the frame is drawn: the timeline is sampled at logic time + leftover, i.e. interpolated
+    between the last step and the next.
+
+    Game rules run inside the steps: every callback added with add_step_callback() is called
+    with the logic time after each step, so a turn timer that runs out mid-frame acts in that very
+    step and a slow frame can play several turns.
+
+    A frame that falls more than `max_catch_up_ms` of real time behind (scaled by the clock's time
+    scale, so 100x still gets its hundred-fold steps) drops the excess rather than spiralling.
+    In instant mode (TIME_SCALE_INSTANT) every frame is one step to the clock reading, as before.
+    """
+    def __init__(self, timeline, step_ms=LOGIC_STEP_MS, max_catch_up_ms=MAX_CATCH_UP_MS):
+        self.timeline = timeline
+        self.step_ms = step_ms
+        self.max_catch_up_ms = max_catch_up_ms
+        self.accumulator = 0.0
+        self.steps = 0 # Steps run by the last advance()
+        self.dropped_ms = 0.0 # Game time dropped by catch-up limits so far
+        self._logic_time = float(timeline.now)
+        self._last_clock = timeline.clock.now()
+        self._step_callbacks = []
+
+    def add_step_callback(self, callback):
+        """Calls `callback(now)` after every logic step, with the timeline already advanced to `now`."""
+        self._step_callbacks.append(callback)
+
+    @property
+    def alpha(self):
+        """How far the drawn frame is between the last logic step and the next (0..1)."""
+        return self.accumulator / self.step_ms
+
+    def advance(self):
+        """Runs the logic steps due since the last call and samples the timeline for drawing. Returns the step count."""
+        timeline = self.timeline
+        now = timeline.clock.now()
+        elapsed = now - self._last_clock
+        self._last_clock = now
+        scale = getattr(timeline.clock, "scale", 1.0)
+        if scale == TIME_SCALE_INSTANT:
+            self.accumulator = 0.0
+            self._logic_time = float(now)
+            timeline.advance_to(now)
+            for callback in self._step_callbacks:
+                callback(now)
+            self.steps = 1
+            return 1
+
+        self.accumulator += elapsed
+        limit = self.max_catch_up_ms * scale
+        if self.accumulator > limit:
+            self.dropped_ms += self.accumulator - limit
+            self.accumulator = limit
+        steps = 0
+        while self.accumulator >= self.step_ms:
+            self._logic_time += self.step_ms
+            self.accumulator -= self.step_ms
+            step_time = int(self._logic_time) # Whole milliseconds, like the clocks
+            timeline.advance_to(step_time, sample=False)
+            for callback in self._step_callbacks:
+                callback(step_time)
+            steps += 1
+        timeline.sample(int(self._logic_time + self.accumulator))
+        self.steps = steps
+        return steps
@@ -0,0 +1,193 @@
+# objects/trace_ob.py
+import os
+import struct
+import sys
+import time
+
+# --- Trace Levels ---
+TRACE_DEBUG = 10   # Step-by-step rule details (stat degrading, per-hit numbers)
+TRACE_INFO = 20    # One line per game action (card drawn, attack, equip)
+TRACE_WARNING = 30 # Recoverable data problems (bad CSV rows, missing assets)
+TRACE_ERROR = 40   # Broken invariants (no enemy during a turn)
+TRACE_OFF = 100    # Nothing is recorded; every event check is a single False attribute read
+
+TRACE_LEVELS = {
+    "debug": TRACE_DEBUG,
+    "info": TRACE_INFO,
+    "warning": TRACE_WARNING,
+    "error": TRACE_ERROR,
+    "off": TRACE_OFF,
+}
+
+
+class TraceEvent:
+    """
+    A named event type. `on` is recomputed whenever the tracer's level or sinks change,
+    so call sites guard with `if EV_SOMETHING.on:` and skip building the arguments entirely.
+    """
+    __slots__ = ("event_id", "name", "level", "template", "on")
+
+    def __init__(self, event_id, name, level, template):
+        self.event_id = event_id
+        self.name = name
+        self.level = level
+        self.template = template # str.format template, only used by sinks that produce text
+        self.on = False
+
+    def format(self, args):
+        return self.template.format(*args)
+
+
+class Tracer:
+    """Holds the registered event types, the active level and the sinks events are sent to."""
+    def __init__(self, level=TRACE_DEBUG):
+        self.events = []
+        self.events_by_name = {}
+        self.sinks = []
+        self.level = level
+
+    def define(self, name, level, template):
+        """Registers an event type (or returns the existing one with that name)."""
+        if name in self.events_by_name:
+            return self.events_by_name[name]
+        event = TraceEvent(len(self.events), name, level, template)
+        self.events.append(event)
+        self.events_by_name[name] = event
+        self._refresh(event)
+        return event
+
+    def _refresh(self, event):
+        event.on = bool(self.sinks) and event.level >= self.level
+
+    def _refresh_all(self):
+        for event in self.events:
+            self._refresh(event)
+
+    def set_level(self, level):
+        self.level = level
+        self._refresh_all()
+
+    def set_sinks(self, sinks):
+        self.sinks = list(sinks)
+        self._refresh_all()
+
+    def add_sink(self, sink):
+        self.set_sinks(self.sinks + [sink])
+
+    def remove_sink(self, sink):
+        self.set_sinks([existing for existing in self.sinks if existing is not sink])
+
+    def emit(self, event, *args):
+        """Sends an event to every sink. Callers check `event.on` first."""
+        for sink in self.sinks:
+            sink.write(event, args)
+
+
+# --- Sinks ---
+class ConsoleSink:
+    """Formats events with their template and prints them (the game's original behaviour)."""
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, event, args):
+        print(event.format(args), file=self.stream or sys.stdout)
+
+
+class CounterSink:
+    """Only counts events per type; no formatting, no I/O."""
+    def __init__(self):
+        self.counts = {}
+
+    def write(self, event, args):
+        self.counts[event.event_id] = self.counts.get(event.event_id, 0) + 1
+
+    def named_counts(self, tracer):
+        return {tracer.events[event_id].name: count for event_id, count in self.counts.items()}
+
+
+class RingBufferSink:
+    """
+    Stores events as fixed-size binary records in a preallocated ring buffer.
+    Record: timestamp (double), event id (uint16), arg count (uint16), up to 4 int64 args.
+    Non-integer args are interned into a string table and stored by index.
+    """
+    RECORD = struct.Struct("<dHH4q")
+    MAX_ARGS = 4
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.buffer = bytearray(self.RECORD.size * capacity)
+        self.write_index = 0
+        self.count = 0
+        self.strings = []
+        self._string_ids = {}
+
+    def _intern(self, value):
+        text = str(value)
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def write(self, event, args):
+        packed = [0, 0, 0, 0]
+        for i, value in enumerate(args[:self.MAX_ARGS]):
+            if type(value) is int:
+                packed[i] = value
+            else:
+                packed[i] = self._intern(value)
+        self.RECORD.pack_into(self.buffer, self.write_index * self.RECORD.size,
+                              time.perf_counter(), event.event_id, min(len(args), self.MAX_ARGS), *packed)
+        self.write_index = (self.write_index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def records(self):
+        """Yields (timestamp, event_id, raw_args) from oldest to newest."""
+        start = (self.write_index - self.count) % self.capacity
+        for i in range(self.count):
+            timestamp, event_id, argc, *args = self.RECORD.unpack_from(
+                self.buffer, ((start + i) % self.capacity) * self.RECORD.size)
+            yield timestamp, event_id, tuple(args[:argc])
+
+    def dump(self, file_path):
+        """Writes the raw ring (oldest first) to a file."""
+        with open(file_path, "wb") as dump_file:
+            start = (self.write_index - self.count) % self.capacity
+            record_size = self.RECORD.size
+            for i in range(self.count):
+                offset = ((start + i) % self.capacity) * record_size
+                dump_file.write(self.buffer[offset:offset + record_size])
+
+
+# --- Global Tracer ---
+TRACE = Tracer()
+
+
+def configure_tracing(mode=None, level=None):
+    """
+    Picks the sink setup: "console" (default), "counters", "ring" or "off".
+    Defaults come from the DG_TRACE and DG_TRACE_LEVEL environment variables, so the
+    simulator and server can run with every event check turned into a False attribute read.
+    Returns the sink that was installed (or None).
+    """
+    mode = (mode or os.environ.get("DG_TRACE", "console")).lower()
+    level_name = (level or os.environ.get("DG_TRACE_LEVEL", "debug")).lower()
+    TRACE.set_level(TRACE_LEVELS.get(level_name, TRACE_DEBUG))
+
+    if mode == "off":
+        TRACE.set_sinks([])
+        return None
+    if mode == "counters":
+        sink = CounterSink()
+    elif mode == "ring":
+        sink = RingBufferSink()
+    else:
+        sink = ConsoleSink()
+    TRACE.set_sinks([sink])
+    return sink
+
+
+configure_tracing()
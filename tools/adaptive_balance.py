@@ -0,0 +1,106 @@
+# tools/adaptive_balance.py
+"""
+Adaptive balance run: survival rate and mean XP per theme, to a target precision.
+
+Plays seeds in rounds and stops each theme as soon as its 95% intervals are narrow enough
+(Wilson interval for survival, Welford variance for XP); the rest of the budget goes to the
+themes that are still uncertain (objects/balance_ob.py AdaptiveSampler).
+
+    python -m tools.adaptive_balance --survival-precision 0.01 --xp-precision 0.5 --budget 200000
+    python -m tools.adaptive_balance --csv new_cards.csv --json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # objects.deck_ob imports pygame; keep its banner off stdout
+
+from objects.balance_ob import AdaptiveSampler
+from objects.catalog_ob import CardCatalog
+from objects.deck_ob import CARDS_CSV_PATH
+from objects.shared_catalog_ob import SharedCatalog
+from objects.simulation_ob import simulate_seed
+from objects.trace_ob import configure_tracing
+
+TASK_SEEDS = 250 # Seeds per worker task within a round
+
+
+# --- Workers ---
+_worker_catalog = None
+
+
+def _init_worker(shared_catalog_name):
+    global _worker_catalog
+    configure_tracing("off")
+    _worker_catalog = SharedCatalog.attach(shared_catalog_name)
+
+
+def _play_seeds(task):
+    theme, seeds = task
+    return theme, [simulate_seed(_worker_catalog, seed) for seed in seeds]
+
+
+def _pool_round(pool):
+    """A play_round for AdaptiveSampler.run() that spreads each round over `pool`."""
+    def play_round(plan):
+        tasks = [(theme, seeds[first:first + TASK_SEEDS]) for theme, seeds in plan.items()
+                 for first in range(0, len(seeds), TASK_SEEDS)]
+        results = {}
+        for theme, summaries in pool.imap_unordered(_play_seeds, tasks):
+            results.setdefault(theme, []).extend(summaries)
+        return results
+    return play_round
+
+
+def _print_report(report, elapsed):
+    print(f"{'theme':<12}{'seeds':>8}  {'survival':>8}  95% interval      {'xp':>7}  95% interval")
+    for theme, estimate in report["themes"].items():
+        survival_low, survival_high = estimate["survival_ci"]
+        xp_low, xp_high = estimate["xp_ci"] or (float("nan"), float("nan"))
+        survival = estimate["survival"] if estimate["survival"] is not None else float("nan")
+        print(f"{theme:<12}{estimate['seeds']:>8}  {survival:>8.4f}  [{survival_low:.4f}, {survival_high:.4f}]  "
+              f"{estimate['xp']:>7.2f}  [{xp_low:.2f}, {xp_high:.2f}]"
+              f"{'' if estimate['converged'] else '  (not converged)'}")
+    print(f"{report['seeds']} of {report['budget']} seeds in {report['rounds']} round(s), {elapsed:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-theme survival rate and mean XP to a target precision")
+    parser.add_argument("--csv", default=CARDS_CSV_PATH, help="Card data to deal from")
+    parser.add_argument("--survival-precision", type=float, default=0.01, help="Target 95%% half-width of the survival rate")
+    parser.add_argument("--xp-precision", type=float, default=1.0, help="Target 95%% half-width of mean XP")
+    parser.add_argument("--budget", type=int, default=200000, help="Most seeds to play in total")
+    parser.add_argument("--batch", type=int, default=5000, help="Seeds per round")
+    parser.add_argument("--min-seeds", type=int, default=200, help="Seeds every theme plays before it can stop")
+    parser.add_argument("--start", type=int, default=0, help="First seed")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core, 1 = no pool)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    configure_tracing("off")
+
+    catalog = CardCatalog(args.csv)
+    sampler = AdaptiveSampler(catalog, args.survival_precision, args.xp_precision, args.budget,
+                              args.batch, args.min_seeds, args.start)
+    started = time.perf_counter()
+    if args.workers == 1:
+        report = sampler.run()
+    else:
+        with SharedCatalog.publish(catalog) as shared, \
+                multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(shared.name,)) as pool:
+            report = sampler.run(_pool_round(pool))
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# tools/compare_catalogs.py
+"""
+Paired balance comparison of two versions of cards.csv.
+
+Plays the same seeds on both versions with common random numbers: the same theme, the same
+shuffle of deck positions and the same exit jitter (objects/balance_ob.py paired_decks). Reports
+survival rate and XP for each version and the per-seed difference B - A, overall and per theme,
+with a confidence interval for the paired difference next to the one two independent samples
+would give.
+
+    python -m tools.compare_catalogs data/cards.csv new_cards.csv --count 20000
+    python -m tools.compare_catalogs data/cards.csv new_cards.csv --count 100000 --per-seed diffs.csv --json
+
+Because most seeds play out the same on both versions, the paired interval is usually several
+times narrower; "variance_reduction" is how many times fewer seeds it needs for the same width.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # objects.deck_ob imports pygame; keep its banner off stdout
+
+from objects.balance_ob import PairedComparison, compare_seeds
+from objects.shared_catalog_ob import SharedCatalog, share_catalog
+from objects.trace_ob import configure_tracing
+
+DEFAULT_CHUNK = 2000 # Seeds per worker task
+PER_SEED_COLUMNS = ("seed", "theme", "survived_a", "survived_b", "xp_a", "xp_b", "cards_cleared_a", "cards_cleared_b")
+
+
+# --- Workers ---
+_worker_catalogs = None
+
+
+def _init_worker(shared_a, shared_b):
+    global _worker_catalogs
+    configure_tracing("off")
+    _worker_catalogs = (SharedCatalog.attach(shared_a), SharedCatalog.attach(shared_b))
+
+
+def _compare_chunk(task):
+    """The PairedComparison of seeds [first_seed, first_seed + count), plus their per-seed rows if asked for."""
+    first_seed, count, per_seed = task
+    rows = []
+    on_pair = None
+    if per_seed:
+        def on_pair(seed, theme, summary_a, summary_b):
+            rows.append((seed, theme, int(summary_a.survived), int(summary_b.survived), summary_a.xp, summary_b.xp,
+                         summary_a.cards_cleared, summary_b.cards_cleared))
+    comparison = compare_seeds(*_worker_catalogs, range(first_seed, first_seed + count), on_pair=on_pair)
+    return comparison, rows
+
+
+def compare_catalogs(csv_a, csv_b, start, count, workers=None, chunk=DEFAULT_CHUNK, per_seed_path=None):
+    """Compares the two card files on seeds [start, start + count). Returns the merged PairedComparison."""
+    tasks = [(start + first, min(chunk, count - first), per_seed_path is not None) for first in range(0, count, chunk)]
+    comparison = PairedComparison()
+    per_seed_file = open(per_seed_path, "w", newline="", encoding="utf-8") if per_seed_path else None
+    try:
+        writer = csv.writer(per_seed_file) if per_seed_file else None
+        if writer:
+            writer.writerow(PER_SEED_COLUMNS)
+        with share_catalog(csv_a) as shared_a, share_catalog(csv_b) as shared_b, \
+                multiprocessing.Pool(workers, initializer=_init_worker, initargs=(shared_a.name, shared_b.name)) as pool:
+            for chunk_comparison, rows in pool.imap(_compare_chunk, tasks): # In order, so the per-seed file is too
+                comparison.merge(chunk_comparison)
+                if writer:
+                    writer.writerows(rows)
+    finally:
+        if per_seed_file:
+            per_seed_file.close()
+    return comparison
+
+
+def _print_report(report):
+    def reduction(value):
+        return "same on every seed" if value is None else f"x{value:.1f}"
+
+    def line(name, group):
+        if not group["seeds"]:
+            print(f"{name:<12}{0:>9}")
+            return
+        survived, xp = group["survived"], group["xp"]
+        print(f"{name:<12}{group['seeds']:>9}  "
+              f"survived {survived['a']:.3f} -> {survived['b']:.3f}  diff {survived['diff']:+.4f} "
+              f"[{survived['ci'][0]:+.4f}, {survived['ci'][1]:+.4f}] ({reduction(survived['variance_reduction'])})  "
+              f"xp {xp['a']:.1f} -> {xp['b']:.1f}  diff {xp['diff']:+.2f} "
+              f"[{xp['ci'][0]:+.2f}, {xp['ci'][1]:+.2f}] ({reduction(xp['variance_reduction'])})")
+
+    print(f"{'group':<12}{'seeds':>9}  95% paired intervals, (xN) = variance reduction over independent runs")
+    line("overall", report["overall"])
+    for theme, group in report["themes"].items():
+        line(theme, group)
+    if report["unpaired"]:
+        print(f"{report['unpaired']} seed(s) dealt a theme the second file does not have and were skipped")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paired balance comparison of two versions of cards.csv")
+    parser.add_argument("csv_a", help="Baseline card file")
+    parser.add_argument("csv_b", help="Changed card file")
+    parser.add_argument("--start", type=int, default=0, help="First seed")
+    parser.add_argument("--count", type=int, default=20000, help="Number of consecutive seeds")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Seeds per worker task")
+    parser.add_argument("--per-seed", help="Also write every seed's results for both files to this CSV")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    configure_tracing("off")
+
+    started = time.perf_counter()
+    comparison = compare_catalogs(args.csv_a, args.csv_b, args.start, args.count, args.workers, args.chunk, args.per_seed)
+    report = comparison.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    print(f"Compared {args.count} seeds in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
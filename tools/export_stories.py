@@ -0,0 +1,120 @@
+# tools/export_stories.py
+"""
+Bulk story export for simulated seeds.
+
+Plays every seed in a range headlessly with the game's rules (objects/simulation_ob.py), tells
+each run as a story (objects/story_ob.py) and writes them all to one file, in seed order.
+
+    python -m tools.export_stories stories.txt --start 0 --count 1000000
+    python -m tools.export_stories stories.txt.gz --count 5000000 --workers 8
+
+Memory stays flat however many seeds you ask for: workers stream each story sentence by sentence
+into their own part file, at most two tasks per worker are in flight, and the parent appends
+finished parts to the output in order and deletes them. A .gz output is written as gzip parts,
+which concatenate into one valid gzip file.
+"""
+import argparse
+import collections
+import gzip
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # objects.deck_ob imports pygame; keep its banner off stdout
+
+from objects.deck_ob import CARDS_CSV_PATH
+from objects.shared_catalog_ob import SharedCatalog, share_catalog
+from objects.simulation_ob import seed_events
+from objects.story_ob import StoryTeller
+from objects.trace_ob import configure_tracing
+
+DEFAULT_CHUNK = 5000 # Seeds per worker task
+IN_FLIGHT_PER_WORKER = 2 # One running, one queued
+
+
+# --- Workers ---
+_worker_catalog = None
+_worker_teller = None
+
+
+def _init_worker(shared_catalog_name):
+    global _worker_catalog, _worker_teller
+    configure_tracing("off")
+    _worker_catalog = SharedCatalog.attach(shared_catalog_name)
+    _worker_teller = StoryTeller(_worker_catalog.themes)
+
+
+def _open_part(path, compress):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return open(path, "w", encoding="utf-8")
+
+
+def _export_chunk(task):
+    """Writes the stories for seeds [first_seed, first_seed + count) to `part_path`."""
+    first_seed, count, part_path, compress = task
+    tell = _worker_teller.tell
+    with _open_part(part_path, compress) as part_file:
+        write = part_file.write
+        for seed in range(first_seed, first_seed + count):
+            for piece in tell(seed_events(_worker_catalog, seed)):
+                write(piece)
+    return part_path
+
+
+# --- Pipeline ---
+def _append_part(output_file, part_path):
+    with open(part_path, "rb") as part_file:
+        shutil.copyfileobj(part_file, output_file, 1 << 20)
+    os.remove(part_path)
+
+
+def export_stories(path, start, count, workers=None, chunk=DEFAULT_CHUNK, csv_file_path=CARDS_CSV_PATH):
+    """Writes the stories of seeds [start, start + count) to `path` (gzip'd if it ends in .gz). Returns bytes written."""
+    workers = workers or os.cpu_count() or 1
+    compress = path.endswith(".gz")
+    parts_directory = path + ".parts"
+    os.makedirs(parts_directory, exist_ok=True)
+    tasks = ((start + first, min(chunk, count - first), os.path.join(parts_directory, f"{first:012d}.part"), compress)
+             for first in range(0, count, chunk))
+
+    pending = collections.deque() # AsyncResults in seed order
+    with open(path, "wb") as output_file, share_catalog(csv_file_path) as shared:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(shared.name,)) as pool:
+            for task in tasks:
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    _append_part(output_file, pending.popleft().get())
+                pending.append(pool.apply_async(_export_chunk, (task,)))
+            while pending:
+                _append_part(output_file, pending.popleft().get())
+        written = output_file.tell()
+    os.rmdir(parts_directory)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a story for every simulated seed in a range")
+    parser.add_argument("path", help="Output file; a .gz name writes gzip")
+    parser.add_argument("--start", type=int, default=0, help="First seed")
+    parser.add_argument("--count", type=int, default=10000, help="Number of consecutive seeds")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Seeds per worker task")
+    parser.add_argument("--csv", default=CARDS_CSV_PATH, help="Card data to deal from")
+    args = parser.parse_args(argv)
+    configure_tracing("off")
+
+    started = time.perf_counter()
+    written = export_stories(args.path, args.start, args.count, args.workers, args.chunk, args.csv)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {args.count} stories (seeds {args.start}..{args.start + args.count - 1}) in {elapsed:.1f}s "
+          f"({written / (1 << 20):.1f} MB) -> {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+# tools/seed_index.py
+"""
+Seed catalog index for daily challenges and tournaments.
+
+Precomputes what every seed in a range deals (theme, exit position, first enemy, level-up cards
+before the exit, difficulty) on all cores and writes it to one memory-mapped index file with a
+posting list per field value, so "find seeds matching X" never has to replay a game.
+
+    python -m tools.seed_index build seeds.idx --start 0 --count 1000000
+    python -m tools.seed_index query seeds.idx --theme Crypt --exit 8 --min-difficulty 200 --limit 10
+    python -m tools.seed_index info seeds.idx
+
+Difficulty is the total XP of the enemies dealt before the exit: XP is the game's own per-enemy
+rating, and those are the fights a run cannot avoid. Play a seed with DG_SEED=<seed> python main.py.
+"""
+import argparse
+import bisect
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from array import array
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # objects.deck_ob imports pygame; keep its banner off stdout
+
+from objects.catalog_ob import CardCatalog, deck_for_seed
+from objects.deck_ob import CARDS_CSV_PATH
+from objects.shared_catalog_ob import SharedCatalog
+from objects.trace_ob import configure_tracing
+
+# --- File Layout ---
+# magic | header length (u32) | JSON header | records | postings, every section 8-byte aligned.
+# A record is one seed's summary; record i is seed start + i.
+MAGIC = b"DGSEEDIX"
+FORMAT_VERSION = 1
+RECORD = struct.Struct("<qBbhBBH") # seed, theme, exit position, first enemy id, level-ups before exit, enemies before exit, difficulty
+FIELDS = ("theme", "exit", "first_enemy", "level_ups", "enemies", "difficulty") # Record order after the seed
+NO_ENEMY = -1
+
+DEFAULT_CHUNK = 50000 # Seeds per worker task
+
+
+# --- Summaries ---
+def summarize_seed(catalog, seed):
+    """The record fields (after the seed) for what setup_new_game(game_seed=seed) deals."""
+    theme_index, deck, exit_position = deck_for_seed(catalog, seed)
+    card_types = catalog.card_types
+    first_enemy = NO_ENEMY
+    level_ups = enemies = difficulty = 0
+    before_exit = deck[:exit_position] if exit_position >= 0 else deck
+    for card_id in before_exit:
+        card_type = card_types[card_id]
+        if card_type == "enemy":
+            if first_enemy == NO_ENEMY:
+                first_enemy = card_id
+            enemies += 1
+            difficulty += catalog.xp_gain[card_id]
+        elif card_type == "level up":
+            level_ups += 1
+    if first_enemy == NO_ENEMY: # No enemy before the exit: the first one after it still opens the run
+        first_enemy = next((card_id for card_id in deck if card_types[card_id] == "enemy"), NO_ENEMY)
+    return theme_index, exit_position, first_enemy, level_ups, enemies, difficulty
+
+
+_worker_catalog = None
+
+
+def _init_worker(shared_catalog_name):
+    global _worker_catalog
+    configure_tracing("off")
+    _worker_catalog = SharedCatalog.attach(shared_catalog_name)
+
+
+def _summarize_chunk(task):
+    """Packs the records for seeds [first, first + count) and their posting lists (global record indices)."""
+    first_seed, count, first_index = task
+    records = bytearray(RECORD.size * count)
+    postings = [{} for _ in FIELDS]
+    for offset in range(count):
+        seed = first_seed + offset
+        summary = summarize_seed(_worker_catalog, seed)
+        RECORD.pack_into(records, offset * RECORD.size, seed, *summary)
+        for field_postings, value in zip(postings, summary):
+            indices = field_postings.get(value)
+            if indices is None:
+                indices = field_postings[value] = array('I')
+            indices.append(first_index + offset)
+    return bytes(records), postings
+
+
+# --- Building ---
+def _pad(handle):
+    handle.write(b"\0" * (-handle.tell() % 8))
+
+
+def build_index(path, start, count, workers=None, chunk=DEFAULT_CHUNK, csv_file_path=CARDS_CSV_PATH):
+    """Summarizes seeds [start, start + count) on `workers` processes and writes the index to `path`."""
+    catalog = CardCatalog(csv_file_path)
+    tasks = [(start + first, min(chunk, count - first), first) for first in range(0, count, chunk)]
+    postings = [{} for _ in FIELDS]
+    records_path = path + ".records"
+
+    with open(records_path, "wb") as records_file:
+        with SharedCatalog.publish(catalog) as shared, \
+                multiprocessing.Pool(workers, initializer=_init_worker, initargs=(shared.name,)) as pool:
+            for records, chunk_postings in pool.imap(_summarize_chunk, tasks): # In order, so postings stay sorted
+                records_file.write(records)
+                for field_postings, chunk_field in zip(postings, chunk_postings):
+                    for value, indices in chunk_field.items():
+                        field_postings.setdefault(value, array('I')).extend(indices)
+
+    # Postings are laid out value by value in ascending order, so a difficulty range is one contiguous slice
+    header = {
+        "version": FORMAT_VERSION,
+        "start": start,
+        "count": count,
+        "record_format": RECORD.format,
+        "fields": list(FIELDS),
+        "themes": catalog.themes,
+        "card_names": [definition[8] for definition in catalog.definitions],
+        "csv_mtime": os.path.getmtime(csv_file_path),
+        "postings": {},
+    }
+    posting_bytes = 0
+    for field, field_postings in zip(FIELDS, postings):
+        table = header["postings"][field] = []
+        for value in sorted(field_postings):
+            table.append([value, posting_bytes // 4, len(field_postings[value])]) # value, first slot, length
+            posting_bytes += 4 * len(field_postings[value])
+
+    # Header size depends on the section offsets it records, so lay out with a placeholder first
+    header["records_offset"] = header["postings_offset"] = 0
+    header_length = len(json.dumps(header).encode("utf-8")) + 64
+    header["records_offset"] = records_offset = _align(len(MAGIC) + 4 + header_length)
+    header["postings_offset"] = _align(records_offset + RECORD.size * count)
+    encoded_header = json.dumps(header).encode("utf-8").ljust(header_length)
+
+    with open(path, "wb") as index_file:
+        index_file.write(MAGIC)
+        index_file.write(struct.pack("<I", header_length))
+        index_file.write(encoded_header)
+        _pad(index_file)
+        with open(records_path, "rb") as records_file:
+            while True:
+                block = records_file.read(1 << 20)
+                if not block:
+                    break
+                index_file.write(block)
+        _pad(index_file)
+        for field_postings in postings:
+            for value in sorted(field_postings):
+                field_postings[value].tofile(index_file)
+    os.remove(records_path)
+    return header
+
+
+def _align(offset):
+    return offset + (-offset % 8)
+
+
+# --- Querying ---
+class SeedIndex:
+    """
+    Read-only view of an index file. The file is memory-mapped, so opening it reads only the header
+    and a query touches only the posting lists and records it needs.
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a seed index")
+        header_length, = struct.unpack_from("<I", self._map, len(MAGIC))
+        self.header = json.loads(self._map[len(MAGIC) + 4:len(MAGIC) + 4 + header_length])
+        if self.header["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path} is index format {self.header['version']}, expected {FORMAT_VERSION}")
+        self.start = self.header["start"]
+        self.count = self.header["count"]
+        self.themes = self.header["themes"]
+        self.card_names = self.header["card_names"]
+        self._records_offset = self.header["records_offset"]
+        self._postings = memoryview(self._map)[self.header["postings_offset"]:].cast("I")
+        self._tables = {field: ([entry[0] for entry in table], table) for field, table in self.header["postings"].items()}
+
+    def close(self):
+        self._postings.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, index):
+        seed, *summary = RECORD.unpack_from(self._map, self._records_offset + index * RECORD.size)
+        return dict(zip(("seed",) + FIELDS, [seed] + summary))
+
+    def describe(self, record):
+        """A record with theme and first enemy as names."""
+        described = dict(record)
+        described["theme"] = self.themes[record["theme"]]
+        described["first_enemy"] = self.card_names[record["first_enemy"]] if record["first_enemy"] != NO_ENEMY else None
+        return described
+
+    def _posting(self, field, low, high):
+        """Record indices whose `field` lies in [low, high]: one slice of the value-ordered postings."""
+        values, table = self._tables[field]
+        first = bisect.bisect_left(values, low)
+        last = bisect.bisect_right(values, high)
+        if first >= last:
+            return self._postings[0:0]
+        begin = table[first][1]
+        end = table[last - 1][1] + table[last - 1][2]
+        return self._postings[begin:end]
+
+    def value_id(self, field, value):
+        """Theme / first-enemy names to the ids stored in records; None if the name is unknown."""
+        if field == "theme":
+            return self.themes.index(value) if value in self.themes else None
+        if field == "first_enemy":
+            return self.card_names.index(value) if value in self.card_names else None
+        return value
+
+    def find(self, limit=100, **criteria):
+        """
+        Seeds matching every criterion, in seed order. A criterion is a value (theme="Crypt", exit=8)
+        or an inclusive (low, high) range (difficulty=(200, 400)). Starts from the shortest posting
+        list and checks the other fields on the records themselves.
+        """
+        ranges = {}
+        for field, wanted in criteria.items():
+            if wanted is None:
+                continue
+            if field not in self._tables:
+                raise ValueError(f"Unknown field '{field}' (expected one of {', '.join(FIELDS)})")
+            low, high = wanted if isinstance(wanted, tuple) else (wanted, wanted)
+            low, high = self.value_id(field, low), self.value_id(field, high)
+            if low is None or high is None:
+                return []
+            ranges[field] = (low, high)
+        if not ranges:
+            return [self.start + index for index in range(min(limit, self.count))]
+
+        candidates = {field: self._posting(field, low, high) for field, (low, high) in ranges.items()}
+        driver = min(candidates, key=lambda field: len(candidates[field]))
+        indices = candidates[driver]
+        if ranges[driver][0] != ranges[driver][1]:
+            indices = sorted(indices) # A range spans several value-ordered lists
+        checks = [(FIELDS.index(field) + 1, low, high) for field, (low, high) in ranges.items() if field != driver]
+
+        seeds = []
+        for index in indices:
+            record = RECORD.unpack_from(self._map, self._records_offset + index * RECORD.size)
+            if all(low <= record[position] <= high for position, low, high in checks):
+                seeds.append(record[0])
+                if len(seeds) >= limit:
+                    break
+        return seeds
+
+    def histogram(self, field):
+        """{value: number of seeds} for one field."""
+        values, table = self._tables[field]
+        return {value: length for value, _, length in table}
+
+
+# --- Command Line ---
+def _range(text):
+    """'200' -> 200, '200:400' -> (200, 400), ':400' / '200:' are open ranges."""
+    if ":" not in text:
+        return int(text)
+    low, high = text.split(":", 1)
+    return (int(low) if low else 0, int(high) if high else 0xFFFF)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed catalog index for daily challenges and tournaments")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Summarize a seed range into an index file")
+    build.add_argument("path")
+    build.add_argument("--start", type=int, default=0, help="First seed")
+    build.add_argument("--count", type=int, default=1000000, help="Number of consecutive seeds")
+    build.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    build.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Seeds per worker task")
+    build.add_argument("--csv", default=CARDS_CSV_PATH, help="Card data to deal from")
+
+    query = commands.add_parser("query", help="Find seeds by theme, exit position, first enemy, level-ups or difficulty")
+    query.add_argument("path")
+    query.add_argument("--theme")
+    query.add_argument("--exit", type=_range, help="Exit position, N or LOW:HIGH")
+    query.add_argument("--first-enemy", help="Name of the first enemy dealt")
+    query.add_argument("--level-ups", type=_range, help="Level-up cards before the exit, N or LOW:HIGH")
+    query.add_argument("--enemies", type=_range, help="Enemies before the exit, N or LOW:HIGH")
+    query.add_argument("--difficulty", type=_range, help="Enemy XP before the exit, N or LOW:HIGH")
+    query.add_argument("--limit", type=int, default=20)
+    query.add_argument("--details", action="store_true", help="Print each seed's full summary as JSON")
+
+    info = commands.add_parser("info", help="Show the seed range and per-field value counts")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+    configure_tracing("off")
+
+    if args.command == "build":
+        started = time.perf_counter()
+        build_index(args.path, args.start, args.count, args.workers, args.chunk, args.csv)
+        elapsed = time.perf_counter() - started
+        print(f"Indexed seeds {args.start}..{args.start + args.count - 1} in {elapsed:.1f}s "
+              f"({os.path.getsize(args.path) / (1 << 20):.1f} MB) -> {args.path}")
+        return 0
+
+    with SeedIndex(args.path) as index:
+        if args.command == "info":
+            print(f"Seeds {index.start}..{index.start + index.count - 1} ({index.count} seeds)")
+            for field in FIELDS:
+                counts = index.histogram(field)
+                if field == "theme":
+                    counts = {index.themes[value]: n for value, n in counts.items()}
+                elif field == "first_enemy":
+                    counts = {index.card_names[value] if value != NO_ENEMY else None: n for value, n in counts.items()}
+                print(f"  {field}: {counts}")
+            return 0
+
+        started = time.perf_counter()
+        seeds = index.find(limit=args.limit, theme=args.theme, exit=args.exit, first_enemy=args.first_enemy,
+                           level_ups=args.level_ups, enemies=args.enemies, difficulty=args.difficulty)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for seed in seeds:
+            if args.details:
+                print(json.dumps(index.describe(index.record(seed - index.start))))
+            else:
+                print(seed)
+        print(f"{len(seeds)} seed(s) in {elapsed_ms:.2f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())